@@ -0,0 +1,238 @@
+"""
+Benchmark the daily time allocators on generated study plans.
+
+Builds an in-memory syllabus and student population shaped like production
+data (prerequisite chains, partly and fully mastered concepts, profiles with
+2-6 study hours a day) and runs the real StudyPlanGenerator with each
+allocator, so every day gets the generator's int(hours / 2) topics ranked by
+the decision engine. For each allocator it reports:
+
+- daily: share of the study hours (80% of available) the next-day plan fills
+- exam: empty days, stalled weeks and distinct topics in a 60-day
+  countdown plan
+- marks: expected marks gained over the countdown, replaying each plan's
+  hours through PlanSimulator (a model estimate, not a measured outcome)
+
+Run from the backend directory; with --check it exits non-zero if any exam
+plan has an empty day or a week that plans no new topic:
+
+    python allocation_benchmark.py [--concepts 3000] [--students 20] [--seed 7] [--check]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from concept_catalog import CatalogSnapshot, ConceptCatalog
+from decision_engine import DecisionEngine
+from plan_simulator import PlanSimulator
+from revision_calendar import RevisionCalendarStore
+from study_plan_generator import StudyPlanGenerator
+from time_allocation import get_allocator
+
+
+EXAM_HORIZON_DAYS = 60
+
+# Final days of an exam plan that only revisit high-priority topics
+EXAM_FOCUS_DAYS = 7
+
+
+class _MemoryTable:
+    """The subset of a DynamoDB table the generator reads, over a list of items."""
+
+    def __init__(self, key: str, items: List[Dict[str, Any]]):
+        self.key = key
+        self.items = items
+        self._by_user: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            self._by_user.setdefault(item.get("user_id"), []).append(item)
+
+    def get_item(self, Key: Dict[str, Any]) -> Dict[str, Any]:
+        for item in self._by_user.get(Key.get("user_id"), []):
+            if all(item.get(name) == value for name, value in Key.items()):
+                return {"Item": dict(item)}
+        return {}
+
+    def query(self, **kwargs) -> Dict[str, Any]:
+        values = kwargs["ExpressionAttributeValues"]
+        items = self._by_user.get(values[":uid"], [])
+        if ":cutoff" in values:
+            items = [item for item in items if item.get("last_updated", "") >= values[":cutoff"]]
+        return {"Items": [dict(item) for item in items]}
+
+
+def build_world(concepts: int, students: int, seed: int):
+    """
+    Build a catalog snapshot and progress/profile tables.
+
+    Args:
+        concepts: Number of syllabus concepts
+        students: Number of students
+        seed: Random seed
+
+    Returns:
+        Tuple of (catalog snapshot, progress table, profiles table, student IDs)
+    """
+    rng = random.Random(seed)
+    today = datetime.now()
+
+    items = []
+    for index in range(concepts):
+        prerequisites = (
+            [f"concept_{parent}" for parent in rng.sample(range(index), min(index, rng.randint(0, 2)))]
+            if index else []
+        )
+        items.append({
+            "concept_id": f"concept_{index}",
+            "topic": f"Concept {index}",
+            "exam_weight": rng.choice([1, 2, 3, 5, 8, 10, 15]),
+            "estimated_hours": rng.choice([0.5, 1.0, 1.5, 2.0, 3.0, 4.5]),
+            "prerequisites": prerequisites,
+        })
+    snapshot = CatalogSnapshot.from_items(items, "benchmark")
+
+    progress = []
+    profiles = []
+    student_ids = [f"student_{index}" for index in range(students)]
+    for student_id in student_ids:
+        profiles.append({
+            "user_id": student_id,
+            "available_hours_per_day": rng.choice([2.0, 3.2, 4.0, 6.0]),
+            "exam_date": None,
+        })
+        for item in items:
+            roll = rng.random()
+            if roll < 0.5:
+                continue
+            # A fifth of studied concepts are fully mastered
+            mastery = 100.0 if roll > 0.9 else round(rng.uniform(0, 95), 1)
+            studied = today - timedelta(days=rng.randint(0, 40))
+            progress.append({
+                "user_id": student_id,
+                "concept_id": item["concept_id"],
+                "mastery_score": mastery,
+                "last_updated": studied.isoformat(),
+            })
+
+    return snapshot, _MemoryTable("user_id", progress), _MemoryTable("user_id", profiles), student_ids
+
+
+def stalled_weeks(daily_plans: List[Any]) -> int:
+    """Count weeks before the final focus days that plan no topic not planned before."""
+    regular = daily_plans[:max(0, len(daily_plans) - EXAM_FOCUS_DAYS)]
+    seen = set()
+    stalled = 0
+    for start in range(0, len(regular), 7):
+        week = {alloc.topic_id for plan in regular[start:start + 7] for alloc in plan.topics}
+        if not week - seen:
+            stalled += 1
+        seen |= week
+    return stalled
+
+
+def _exam_marks(
+    snapshot: CatalogSnapshot,
+    engine: DecisionEngine,
+    student_id: str,
+    hours_per_day: float,
+    daily_plans: List[Any]
+) -> float:
+    """Expected marks gained by replaying an exam plan's hours through the simulator."""
+    simulator = PlanSimulator(snapshot, engine._get_mastery_snapshot(student_id), 1.0, hours_per_day)
+    start = simulator.mastery.copy()
+    for daily_plan in daily_plans:
+        simulator.study({alloc.topic_id: alloc.allocated_hours for alloc in daily_plan.topics})
+    return float(((simulator.mastery - start) * simulator.exam_weightage).sum() / 1000.0)
+
+
+def run(concepts: int, students: int, seed: int, allocators: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Generate daily and exam plans for every student with each allocator.
+
+    Args:
+        concepts: Number of syllabus concepts
+        students: Number of students
+        seed: Random seed
+        allocators: Allocator names (defaults to all of them)
+
+    Returns:
+        Dictionary mapping allocator name to its averages per student
+    """
+    snapshot, progress_table, profiles_table, student_ids = build_world(concepts, students, seed)
+    exam_date = datetime.now() + timedelta(days=EXAM_HORIZON_DAYS + 1)
+
+    results = {}
+    for name in allocators or ["proportional", "greedy", "knapsack"]:
+        engine = DecisionEngine(
+            concepts_table=None,
+            progress_table=progress_table,
+            student_profiles_table=profiles_table,
+            catalog=ConceptCatalog.from_snapshot(snapshot)
+        )
+        generator = StudyPlanGenerator(
+            decision_engine=engine,
+            progress_table=progress_table,
+            student_profiles_table=profiles_table,
+            allocator=get_allocator(name),
+            revision_calendars=RevisionCalendarStore()
+        )
+
+        fill = empty_days = stalled = topics = marks = 0.0
+        started = time.perf_counter()
+        for student_id in student_ids:
+            hours_per_day = float(generator._get_student_profile(student_id)["available_hours_per_day"])
+
+            daily_plan = generator.generate_daily_plan(student_id, datetime.now() + timedelta(days=1))
+            fill += sum(alloc.allocated_hours for alloc in daily_plan.topics) / (hours_per_day * 0.8)
+
+            exam_plan = generator.generate_exam_countdown_plan(student_id, exam_date)
+            empty_days += sum(1 for plan in exam_plan.daily_plans if not plan.topics)
+            stalled += stalled_weeks(exam_plan.daily_plans)
+            topics += len({alloc.topic_id for plan in exam_plan.daily_plans for alloc in plan.topics})
+            marks += _exam_marks(snapshot, engine, student_id, hours_per_day, exam_plan.daily_plans)
+        elapsed = time.perf_counter() - started
+
+        results[name] = {
+            "daily_fill": fill / len(student_ids),
+            "empty_days": empty_days / len(student_ids),
+            "stalled_weeks": stalled / len(student_ids),
+            "topics": topics / len(student_ids),
+            "marks": marks / len(student_ids),
+            "ms_per_student": elapsed * 1000.0 / len(student_ids),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concepts", type=int, default=3000, help="syllabus concepts")
+    parser.add_argument("--students", type=int, default=20, help="students to plan for")
+    parser.add_argument("--seed", type=int, default=7, help="random seed")
+    parser.add_argument("--check", action="store_true", help="fail if an exam plan stops moving forward")
+    args = parser.parse_args()
+
+    results = run(args.concepts, args.students, args.seed)
+    baseline = results["proportional"]["marks"]
+
+    print(f"{'allocator':<14}{'daily fill':>11}{'empty days':>11}{'stalled':>8}{'topics':>8}"
+          f"{'marks':>8}{'vs prop.':>10}{'ms/student':>12}")
+    for name, totals in results.items():
+        print(
+            f"{name:<14}{totals['daily_fill']:>10.0%} {totals['empty_days']:>10.1f} "
+            f"{totals['stalled_weeks']:>7.1f} {totals['topics']:>7.1f}{totals['marks']:>8.1f}"
+            f"{totals['marks'] / baseline if baseline else 0.0:>9.2f}x{totals['ms_per_student']:>12.1f}"
+        )
+
+    if args.check:
+        stuck = [
+            name for name, totals in results.items()
+            if totals["empty_days"] > 0 or totals["stalled_weeks"] > 0
+        ]
+        if stuck:
+            raise SystemExit(f"exam plans stop moving forward with: {', '.join(stuck)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,666 @@
+"""
+Compact read-only representation of the knowledge graph.
+
+The mutable KnowledgeGraphManager keeps dicts of lists keyed by topic ID,
+which is convenient for editing but costs a boxed int per edge and a tuple
+key per threshold. CompactGraph freezes one version of the graph into
+positional arrays: topics are numbered 0..n-1, prerequisite and dependent
+edges are stored in CSR form (an offsets array plus an indices array per
+direction), and per-edge mastery thresholds live in a float array parallel
+to the prerequisite indices.
+"""
+
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models import Topic
+
+
+# Threshold applied to an edge with no stored threshold, and mastery at which
+# a topic counts as already learned
+DEFAULT_THRESHOLD = 60.0
+
+
+class _SortedIdIndex:
+    """
+    Topic ID to position lookup by binary search over a sorted ID array.
+
+    Used instead of a dict when the arrays are memory-mapped from a snapshot,
+    so workers share the index through the page cache.
+    """
+
+    def __init__(self, sorted_ids: np.ndarray, positions: np.ndarray):
+        """
+        Args:
+            sorted_ids: Topic IDs in ascending order
+            positions: Position of each entry of sorted_ids
+        """
+        self.sorted_ids = sorted_ids
+        self.positions = positions
+
+    def get(self, topic_id: int, default: Optional[int] = None) -> Optional[int]:
+        if not isinstance(topic_id, (int, np.integer)):
+            return default
+        index = int(np.searchsorted(self.sorted_ids, topic_id))
+        if index < len(self.sorted_ids) and self.sorted_ids[index] == topic_id:
+            return int(self.positions[index])
+        return default
+
+    def __getitem__(self, topic_id: int) -> int:
+        position = self.get(topic_id)
+        if position is None:
+            raise KeyError(topic_id)
+        return position
+
+    def __contains__(self, topic_id: int) -> bool:
+        return self.get(topic_id) is not None
+
+
+class CompactGraph:
+    """
+    Frozen CSR snapshot of the knowledge graph at one version.
+
+    Attributes:
+        version: Manager graph version the snapshot was built from
+        topics: Topic records in positional order
+        topic_ids: Topic ID of each position (int64)
+        prereq_offsets: Position i's prerequisites are
+            prereq_indices[prereq_offsets[i]:prereq_offsets[i + 1]]
+        prereq_indices: Positions of prerequisite topics (int32)
+        prereq_thresholds: Mastery threshold of each prerequisite edge
+            (float64, NaN where none is stored)
+        dependent_offsets: CSR offsets for the reverse direction
+        dependent_indices: Positions of dependent topics (int32)
+    """
+
+    def __init__(
+        self,
+        version: int,
+        topics: Sequence[Topic],
+        prereq_offsets: np.ndarray,
+        prereq_indices: np.ndarray,
+        prereq_thresholds: np.ndarray,
+        dependent_offsets: np.ndarray,
+        dependent_indices: np.ndarray,
+        topological_order: Optional[np.ndarray] = None,
+        levels: Optional[np.ndarray] = None,
+        descendant_counts: Optional[np.ndarray] = None,
+        downstream_impact: Optional[np.ndarray] = None,
+        topic_ids: Optional[np.ndarray] = None,
+        id_index: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+        parent_positions: Optional[np.ndarray] = None,
+        exam_weightage: Optional[np.ndarray] = None,
+        estimated_hours: Optional[np.ndarray] = None
+    ):
+        """
+        Wrap prebuilt arrays. Use from_adjacency to build from manager state.
+
+        The optional per-topic arrays let a snapshot keep topics out of
+        memory: when topic_ids is given, topics may be a lazy sequence that
+        is only indexed for the topics a query returns.
+
+        Args:
+            version: Graph version
+            topics: Topic records in positional order
+            prereq_offsets: CSR offsets of prerequisite edges
+            prereq_indices: CSR indices of prerequisite edges
+            prereq_thresholds: Threshold per prerequisite edge
+            dependent_offsets: CSR offsets of dependent edges
+            dependent_indices: CSR indices of dependent edges
+            topological_order: Precomputed topological order (e.g. from a snapshot)
+            levels: Precomputed depth levels
+            descendant_counts: Precomputed transitive descendant counts
+            downstream_impact: Precomputed downstream weightage
+            topic_ids: Topic ID of each position
+            id_index: (topic IDs in ascending order, position of each) used
+                for ID lookups instead of a dict
+            parent_positions: Position of each topic's parent (-1 for none)
+            exam_weightage: Exam weightage of each topic
+            estimated_hours: Estimated hours of each topic
+        """
+        self.version = version
+        if topic_ids is not None:
+            self.topics: Sequence[Topic] = topics
+            self.topic_ids = topic_ids
+        else:
+            self.topics = tuple(topics)
+            self.topic_ids = np.fromiter(
+                (topic.id for topic in self.topics), dtype=np.int64, count=len(self.topics)
+            )
+        self.prereq_offsets = prereq_offsets
+        self.prereq_indices = prereq_indices
+        self.prereq_thresholds = prereq_thresholds
+        self.dependent_offsets = dependent_offsets
+        self.dependent_indices = dependent_indices
+
+        if id_index is not None:
+            self._position = _SortedIdIndex(*id_index)
+        else:
+            self._position = {topic_id: position for position, topic_id in enumerate(self.topic_ids.tolist())}
+        self._parent_positions = parent_positions
+        self._exam_weightage = exam_weightage
+        self._estimated_hours = estimated_hours
+        # Owning topic position of each prerequisite edge, computed on first use
+        self._prereq_owner: Optional[np.ndarray] = None
+
+        # Whole-graph metrics, computed on first use unless supplied
+        self._topological_order = topological_order
+        self._levels = levels
+        self._descendant_counts = descendant_counts
+        self._downstream_impact = downstream_impact
+
+        # Parent/child hierarchy index, computed on first use
+        self._topic_map: Optional[Mapping[int, Topic]] = None
+        self._hierarchy_ready = False
+
+    @classmethod
+    def from_adjacency(
+        cls,
+        version: int,
+        topics: Mapping[int, Topic],
+        prerequisites: Mapping[int, List[int]],
+        thresholds: Mapping[tuple, float]
+    ) -> "CompactGraph":
+        """
+        Build the arrays from the manager's dict-based adjacency.
+
+        Args:
+            version: Graph version
+            topics: Mapping of topic ID to Topic
+            prerequisites: Mapping of topic ID to prerequisite topic IDs
+            thresholds: Mapping of (topic_id, prereq_id) to mastery threshold
+
+        Returns:
+            CompactGraph instance
+        """
+        topic_list = list(topics.values())
+        position = {topic.id: index for index, topic in enumerate(topic_list)}
+        count = len(topic_list)
+
+        prereq_counts = np.zeros(count, dtype=np.int32)
+        prereq_ids: List[int] = []
+        threshold_values: List[float] = []
+        for index, topic in enumerate(topic_list):
+            topic_prereqs = prerequisites.get(topic.id, [])
+            prereq_counts[index] = len(topic_prereqs)
+            for prereq_id in topic_prereqs:
+                prereq_ids.append(position[prereq_id])
+                threshold_values.append(thresholds.get((topic.id, prereq_id), np.nan))
+
+        prereq_offsets = np.zeros(count + 1, dtype=np.int32)
+        np.cumsum(prereq_counts, out=prereq_offsets[1:])
+        prereq_indices = np.array(prereq_ids, dtype=np.int32)
+        prereq_thresholds = np.array(threshold_values, dtype=np.float64)
+
+        # Reverse direction: group edges by prerequisite, keeping dependent order
+        owners = np.repeat(np.arange(count, dtype=np.int32), prereq_counts)
+        order = np.argsort(prereq_indices, kind="stable")
+        dependent_indices = owners[order]
+        dependent_offsets = np.zeros(count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(prereq_indices, minlength=count), out=dependent_offsets[1:])
+
+        return cls(
+            version=version,
+            topics=topic_list,
+            prereq_offsets=prereq_offsets,
+            prereq_indices=prereq_indices,
+            prereq_thresholds=prereq_thresholds,
+            dependent_offsets=dependent_offsets,
+            dependent_indices=dependent_indices
+        )
+
+    def __len__(self) -> int:
+        return len(self.topics)
+
+    def __contains__(self, topic_id: int) -> bool:
+        return topic_id in self._position
+
+    def position_of(self, topic_id: int) -> Optional[int]:
+        """Get the array position of a topic, or None if unknown."""
+        return self._position.get(topic_id)
+
+    def get_topic(self, topic_id: int) -> Optional[Topic]:
+        """Get a topic by ID, or None if unknown."""
+        position = self._position.get(topic_id)
+        return self.topics[position] if position is not None else None
+
+    def prerequisite_positions(self, position: int) -> np.ndarray:
+        """Get the positions of a topic's prerequisites."""
+        return self.prereq_indices[self.prereq_offsets[position]:self.prereq_offsets[position + 1]]
+
+    def dependent_positions(self, position: int) -> np.ndarray:
+        """Get the positions of the topics that require a topic."""
+        return self.dependent_indices[self.dependent_offsets[position]:self.dependent_offsets[position + 1]]
+
+    def edge_thresholds(self, threshold: float = DEFAULT_THRESHOLD) -> np.ndarray:
+        """Get the threshold of every prerequisite edge, using threshold where none is stored."""
+        return np.where(np.isnan(self.prereq_thresholds), threshold, self.prereq_thresholds)
+
+    def get_prerequisites(self, topic_id: int) -> List[Topic]:
+        """
+        Get the prerequisite topics of a topic.
+
+        Args:
+            topic_id: Topic ID (must exist)
+
+        Returns:
+            List of prerequisite Topic objects
+        """
+        return [self.topics[index] for index in self.prerequisite_positions(self._position[topic_id])]
+
+    def get_dependents(self, topic_id: int) -> List[Topic]:
+        """
+        Get the topics that directly require a topic.
+
+        Args:
+            topic_id: Topic ID (must exist)
+
+        Returns:
+            List of dependent Topic objects
+        """
+        return [self.topics[index] for index in self.dependent_positions(self._position[topic_id])]
+
+    def prerequisites_met(
+        self,
+        topic_id: int,
+        mastery_lookup: Mapping[int, float],
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> bool:
+        """
+        Check whether every prerequisite of a topic meets its threshold.
+
+        Args:
+            topic_id: Topic ID (must exist)
+            mastery_lookup: Mapping of topic ID to mastery score
+            threshold: Threshold for edges without a stored one
+
+        Returns:
+            True if all prerequisites are met
+        """
+        position = self._position[topic_id]
+        start, end = self.prereq_offsets[position], self.prereq_offsets[position + 1]
+        for index, edge_threshold in zip(self.prereq_indices[start:end], self.prereq_thresholds[start:end]):
+            if np.isnan(edge_threshold):
+                edge_threshold = threshold
+            if mastery_lookup.get(int(self.topic_ids[index]), 0.0) < edge_threshold:
+                return False
+        return True
+
+    def mastery_vector(self, mastery_lookup: Mapping[int, float]) -> np.ndarray:
+        """
+        Arrange a student's mastery scores by topic position.
+
+        Args:
+            mastery_lookup: Mapping of topic ID to mastery score
+
+        Returns:
+            float64 array with 0.0 for topics without a score
+        """
+        return np.fromiter(
+            (float(mastery_lookup.get(topic_id, 0.0)) for topic_id in self.topic_ids.tolist()),
+            dtype=np.float64,
+            count=len(self.topics)
+        )
+
+    def unlockable_positions(
+        self,
+        mastery: np.ndarray,
+        threshold: float = DEFAULT_THRESHOLD
+    ) -> np.ndarray:
+        """
+        Find topics that are not yet learned and whose prerequisites are all met.
+
+        Args:
+            mastery: Mastery by topic position (see mastery_vector)
+            threshold: Threshold for edges without a stored one
+
+        Returns:
+            Sorted array of unlockable topic positions
+        """
+        return np.flatnonzero((mastery < DEFAULT_THRESHOLD) & (self.unmet_counts(mastery, threshold) == 0))
+
+    def mastery_matrix(self, mastery_lookups: Sequence[Mapping[int, float]]) -> np.ndarray:
+        """
+        Arrange many students' mastery scores as a students x topics matrix.
+
+        Args:
+            mastery_lookups: One mapping of topic ID to mastery score per student
+
+        Returns:
+            float64 matrix with 0.0 for topics without a score
+        """
+        matrix = np.zeros((len(mastery_lookups), len(self.topics)), dtype=np.float64)
+        position_of = self._position.get
+        for row, mastery_lookup in enumerate(mastery_lookups):
+            if not mastery_lookup:
+                continue
+            columns = np.fromiter(
+                (position_of(topic_id, -1) for topic_id in mastery_lookup),
+                dtype=np.int64,
+                count=len(mastery_lookup)
+            )
+            scores = np.fromiter(
+                (float(score) for score in mastery_lookup.values()),
+                dtype=np.float64,
+                count=len(mastery_lookup)
+            )
+            known = columns >= 0
+            matrix[row, columns[known]] = scores[known]
+        return matrix
+
+    def unlockable_matrix(
+        self,
+        mastery: np.ndarray,
+        threshold: float = DEFAULT_THRESHOLD,
+        chunk_rows: int = 512
+    ) -> np.ndarray:
+        """
+        Compute the unlockable flag of every topic for many students at once.
+
+        Each prerequisite edge is compared against its threshold for all
+        students together, and the per-edge results are OR-reduced over each
+        topic's CSR segment. Rows are processed in chunks so the students x
+        edges intermediate stays bounded.
+
+        Args:
+            mastery: Students x topics mastery matrix (see mastery_matrix)
+            threshold: Threshold for edges without a stored one
+            chunk_rows: Students processed per chunk
+
+        Returns:
+            Boolean students x topics matrix
+        """
+        edge_thresholds = self.edge_thresholds(threshold)
+        # reduceat needs strictly increasing starts, so only topics with prerequisites take part
+        prereq_columns = np.flatnonzero(np.diff(self.prereq_offsets) > 0)
+        segment_starts = self.prereq_offsets[prereq_columns]
+
+        unlockable = mastery < DEFAULT_THRESHOLD
+        if not len(prereq_columns):
+            return unlockable
+
+        for start in range(0, mastery.shape[0], chunk_rows):
+            rows = slice(start, start + chunk_rows)
+            edge_unmet = mastery[rows][:, self.prereq_indices] < edge_thresholds
+            any_unmet = np.logical_or.reduceat(edge_unmet, segment_starts, axis=1)
+            unlockable[rows, prereq_columns] &= ~any_unmet
+        return unlockable
+
+    def unmet_counts(self, mastery: np.ndarray, threshold: float = DEFAULT_THRESHOLD) -> np.ndarray:
+        """
+        Count each topic's prerequisites whose mastery is below the edge threshold.
+
+        Args:
+            mastery: Mastery by topic position (see mastery_vector)
+            threshold: Threshold for edges without a stored one
+
+        Returns:
+            int64 array of unmet prerequisite counts by topic position
+        """
+        unmet_edges = mastery[self.prereq_indices] < self.edge_thresholds(threshold)
+        return np.bincount(self.prereq_owner[unmet_edges], minlength=len(self.topics))
+
+    @property
+    def topological_order(self) -> np.ndarray:
+        """Topic positions ordered so every prerequisite comes before its dependents."""
+        if self._topological_order is None:
+            self._analyze()
+        return self._topological_order
+
+    @property
+    def levels(self) -> np.ndarray:
+        """Depth of each topic: 0 for topics without prerequisites, else 1 + deepest prerequisite."""
+        if self._levels is None:
+            self._analyze()
+        return self._levels
+
+    @property
+    def descendant_counts(self) -> np.ndarray:
+        """Number of topics downstream of each topic at any depth."""
+        if self._descendant_counts is None:
+            self._analyze()
+        return self._descendant_counts
+
+    @property
+    def downstream_impact(self) -> np.ndarray:
+        """Total exam weightage of the topics downstream of each topic."""
+        if self._downstream_impact is None:
+            self._analyze()
+        return self._downstream_impact
+
+    def _analyze(self) -> None:
+        """
+        Compute topological order, levels, descendant counts and downstream impact.
+
+        Descendant sets are integer bitsets merged in reverse topological order.
+        Bit i stands for the i-th topic visited, so each set only spans the
+        topics visited before it, and a topic's set is released once all its
+        prerequisites have absorbed it.
+        Weighted impact is summed with bit planes: weightage is scaled to
+        hundredths, and each binary digit k of the scaled weight gets a bitset
+        of the topics having that digit set, so the sum over a descendant set
+        is a few AND + popcount operations instead of a walk over its members.
+
+        Raises:
+            ValueError: If the graph contains a cycle
+        """
+        count = len(self.topics)
+
+        # Kahn's algorithm over the CSR arrays
+        in_degree = np.diff(self.prereq_offsets).astype(np.int64)
+        order: List[int] = np.flatnonzero(in_degree == 0).tolist()
+        for position in order:
+            for dependent in self.dependent_positions(position).tolist():
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    order.append(dependent)
+        if len(order) < count:
+            raise ValueError("Knowledge graph contains a cycle")
+
+        levels = np.zeros(count, dtype=np.int32)
+        for position in order:
+            prereqs = self.prerequisite_positions(position)
+            if len(prereqs):
+                levels[position] = levels[prereqs].max() + 1
+
+        visit_order = order[::-1]
+        visit_rank = [0] * count
+        for rank, position in enumerate(visit_order):
+            visit_rank[position] = rank
+
+        scaled_weights = np.rint(
+            self.exam_weightage_array[np.array(visit_order, dtype=np.int64)] * 100
+        ).astype(np.int64)
+        planes = []
+        for bit in range(int(scaled_weights.max()).bit_length() if count else 0):
+            has_bit = ((scaled_weights >> bit) & 1).astype(bool)
+            planes.append((bit, int.from_bytes(np.packbits(has_bit, bitorder="little").tobytes(), "little")))
+
+        descendant_counts = np.zeros(count, dtype=np.int64)
+        downstream_impact = np.zeros(count, dtype=np.float64)
+        pending_readers = np.diff(self.prereq_offsets).astype(np.int64)
+        descendants: Dict[int, int] = {}
+        for position in visit_order:
+            bits = 0
+            for dependent in self.dependent_positions(position).tolist():
+                bits |= (1 << visit_rank[dependent]) | descendants[dependent]
+                pending_readers[dependent] -= 1
+                if pending_readers[dependent] == 0:
+                    del descendants[dependent]
+            if pending_readers[position]:
+                descendants[position] = bits
+
+            descendant_counts[position] = bits.bit_count()
+            downstream_impact[position] = sum(
+                (bits & plane).bit_count() << bit for bit, plane in planes
+            ) / 100.0
+
+        self._topological_order = np.array(order, dtype=np.int32)
+        self._levels = levels
+        self._descendant_counts = descendant_counts
+        self._downstream_impact = downstream_impact
+
+    @property
+    def exam_weightage_array(self) -> np.ndarray:
+        """Exam weightage of each topic, by position."""
+        if self._exam_weightage is None:
+            self._exam_weightage = np.array([topic.exam_weightage for topic in self.topics], dtype=np.float64)
+        return self._exam_weightage
+
+    @property
+    def estimated_hours_array(self) -> np.ndarray:
+        """Estimated study hours of each topic, by position."""
+        if self._estimated_hours is None:
+            self._estimated_hours = np.array([topic.estimated_hours for topic in self.topics], dtype=np.float64)
+        return self._estimated_hours
+
+    @property
+    def parent_position_array(self) -> np.ndarray:
+        """Position of each topic's parent, -1 for root topics and unknown parents."""
+        if self._parent_positions is None:
+            self._parent_positions = np.fromiter(
+                (
+                    self._position.get(topic.parent_id, -1) if topic.parent_id is not None else -1
+                    for topic in self.topics
+                ),
+                dtype=np.int64,
+                count=len(self.topics)
+            )
+        return self._parent_positions
+
+    @property
+    def prereq_owner(self) -> np.ndarray:
+        """Owning topic position of each prerequisite edge, for per-topic reductions."""
+        if self._prereq_owner is None:
+            self._prereq_owner = np.repeat(
+                np.arange(len(self.topics), dtype=np.int32), np.diff(self.prereq_offsets)
+            )
+        return self._prereq_owner
+
+    @property
+    def topic_map(self) -> Mapping[int, Topic]:
+        """Read-only mapping of topic ID to Topic, shared by all callers."""
+        if self._topic_map is None:
+            self._topic_map = MappingProxyType({topic.id: topic for topic in self.topics})
+        return self._topic_map
+
+    def _ensure_hierarchy(self) -> None:
+        """
+        Build the parent/child index.
+
+        Topics are numbered in DFS preorder (entry time tin) with tout the
+        exclusive end of the subtree, so the subtree of a topic is the
+        contiguous preorder range [tin, tout). Subtree sums then come from
+        prefix sums over preorder, and "is x under y" is a range check.
+        """
+        if self._hierarchy_ready:
+            return
+
+        count = len(self.topics)
+        parent_positions = self.parent_position_array
+
+        # Children CSR, keeping graph order among siblings
+        has_parent = np.flatnonzero(parent_positions >= 0)
+        order = np.argsort(parent_positions[has_parent], kind="stable")
+        child_indices = has_parent[order].astype(np.int32)
+        child_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parent_positions[has_parent], minlength=count), out=child_offsets[1:])
+
+        # Iterative preorder DFS; topics cut off from every root start their own tree
+        tin = np.full(count, -1, dtype=np.int64)
+        tout = np.zeros(count, dtype=np.int64)
+        preorder: List[int] = []
+        offsets = child_offsets.tolist()
+        children = child_indices.tolist()
+        starts = np.flatnonzero(parent_positions < 0).tolist()
+        for start in starts + list(range(count)):
+            if tin[start] >= 0:
+                continue
+            tin[start] = len(preorder)
+            preorder.append(start)
+            stack = [(start, offsets[start])]
+            while stack:
+                node, next_child = stack[-1]
+                if next_child < offsets[node + 1]:
+                    stack[-1] = (node, next_child + 1)
+                    child = children[next_child]
+                    if tin[child] < 0:
+                        tin[child] = len(preorder)
+                        preorder.append(child)
+                        stack.append((child, offsets[child]))
+                else:
+                    tout[node] = len(preorder)
+                    stack.pop()
+
+        preorder_array = np.array(preorder, dtype=np.int64)
+        weightage = self.exam_weightage_array
+        hours = self.estimated_hours_array
+        weightage_prefix = np.concatenate(([0.0], np.cumsum(weightage[preorder_array])))
+        hours_prefix = np.concatenate(([0.0], np.cumsum(hours[preorder_array])))
+
+        self.parent_positions = parent_positions
+        self.child_offsets = child_offsets
+        self.child_indices = child_indices
+        self.root_positions = np.flatnonzero(parent_positions < 0)
+        self.tin = tin
+        self.tout = tout
+        self.subtree_sizes = tout - tin
+        self.subtree_weightage = weightage_prefix[tout] - weightage_prefix[tin]
+        self.subtree_hours = hours_prefix[tout] - hours_prefix[tin]
+        self._hierarchy_ready = True
+
+    def root_topics(self) -> List[Topic]:
+        """Get the topics without a parent, in graph order."""
+        self._ensure_hierarchy()
+        return [self.topics[position] for position in self.root_positions]
+
+    def get_children(self, topic_id: int) -> List[Topic]:
+        """
+        Get the direct children of a topic in the hierarchy.
+
+        Args:
+            topic_id: Topic ID (must exist)
+
+        Returns:
+            List of child Topic objects
+        """
+        self._ensure_hierarchy()
+        position = self._position[topic_id]
+        start, end = self.child_offsets[position], self.child_offsets[position + 1]
+        return [self.topics[index] for index in self.child_indices[start:end]]
+
+    def is_under(self, topic_id: int, ancestor_id: int) -> bool:
+        """
+        Check whether a topic lies in another topic's subtree (itself included).
+
+        Args:
+            topic_id: Topic ID (must exist)
+            ancestor_id: Candidate ancestor topic ID (must exist)
+
+        Returns:
+            True if topic_id is ancestor_id or one of its descendants
+        """
+        self._ensure_hierarchy()
+        position = self._position[topic_id]
+        ancestor = self._position[ancestor_id]
+        return bool(self.tin[ancestor] <= self.tin[position] < self.tout[ancestor])
+
+    def subtree_totals(self, topic_id: int) -> Dict[str, float]:
+        """
+        Get the size, exam weightage and study hours of a topic's subtree.
+
+        Args:
+            topic_id: Topic ID (must exist)
+
+        Returns:
+            Dictionary with topic_count, exam_weightage and estimated_hours
+        """
+        self._ensure_hierarchy()
+        position = self._position[topic_id]
+        return {
+            "topic_count": int(self.subtree_sizes[position]),
+            "exam_weightage": float(self.subtree_weightage[position]),
+            "estimated_hours": float(self.subtree_hours[position])
+        }
@@ -0,0 +1,366 @@
+"""
+Shared in-process concept catalog for the Adaptive Learning System.
+
+This module keeps one immutable snapshot of the SyllabusConcepts table per
+process, indexed by concept_id and topic_id, so API modules can read concept
+metadata on the hot path without a network call. A cheap version check lets
+warm processes reload only when the syllabus actually changes; syllabus edits
+go through put_concepts / delete_concepts, which bump that version.
+"""
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from threading import Lock
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from dependency_index import DependencyIndex
+from dynamo_scan import scan_all
+
+
+# Table with one item per concepts table (keyed by catalog_id, the concepts
+# table name) whose "version" attribute is bumped whenever the syllabus is
+# edited (see bump_catalog_version). It is kept out of the concepts table so
+# scans of the syllabus only ever return concepts
+CATALOG_VERSION_TABLE = os.environ.get("CATALOG_VERSION_TABLE", "CatalogVersions")
+
+CATALOG_CHECK_INTERVAL_SECONDS = float(os.environ.get("CONCEPT_CATALOG_CHECK_SECONDS", "60"))
+CATALOG_MAX_AGE_SECONDS = float(os.environ.get("CONCEPT_CATALOG_MAX_AGE_SECONDS", "3600"))
+CATALOG_SCAN_SEGMENTS = int(os.environ.get("CONCEPT_CATALOG_SCAN_SEGMENTS", "4"))
+
+_EMPTY_CONCEPT: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Immutable view of every concept in the syllabus at one version.
+
+    Attributes:
+        version: Catalog version the snapshot was built from
+        loaded_at: Timestamp when the snapshot was loaded
+        concepts: All concept items (read-only mappings)
+        by_id: Mapping of concept_id to concept item
+        by_topic: Mapping of topic_id to the concepts in that topic
+        prerequisites: Mapping of concept_id to its prerequisite concept IDs
+        dependency_index: Reverse-prerequisite index over the concepts
+    """
+    version: str
+    loaded_at: float
+    concepts: Tuple[Mapping[str, Any], ...]
+    by_id: Mapping[str, Mapping[str, Any]]
+    by_topic: Mapping[str, Tuple[Mapping[str, Any], ...]]
+    prerequisites: Mapping[str, Tuple[str, ...]]
+    dependency_index: DependencyIndex
+
+    @classmethod
+    def from_items(cls, items: List[Dict[str, Any]], version: str) -> "CatalogSnapshot":
+        """
+        Build a snapshot and its indexes from raw concept items.
+
+        Args:
+            items: Concept items as returned by DynamoDB
+            version: Catalog version string
+
+        Returns:
+            CatalogSnapshot instance
+        """
+        concepts = tuple(MappingProxyType(dict(item)) for item in items)
+
+        by_id: Dict[str, Mapping[str, Any]] = {}
+        by_topic: Dict[str, List[Mapping[str, Any]]] = {}
+        prerequisites: Dict[str, Tuple[str, ...]] = {}
+
+        for concept in concepts:
+            concept_id = concept.get("concept_id")
+            if not concept_id:
+                continue
+            by_id[concept_id] = concept
+            prerequisites[concept_id] = tuple(concept.get("prerequisites", []))
+
+            topic_id = concept.get("topic_id")
+            if topic_id:
+                by_topic.setdefault(topic_id, []).append(concept)
+
+        return cls(
+            version=version,
+            loaded_at=time.time(),
+            concepts=concepts,
+            by_id=MappingProxyType(by_id),
+            by_topic=MappingProxyType({
+                topic_id: tuple(topic_concepts)
+                for topic_id, topic_concepts in by_topic.items()
+            }),
+            prerequisites=MappingProxyType(prerequisites),
+            dependency_index=DependencyIndex(concepts)
+        )
+
+    def get(self, concept_id: str) -> Optional[Mapping[str, Any]]:
+        """Get a concept by ID, or None if it is not in the syllabus."""
+        return self.by_id.get(concept_id)
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+
+class ConceptCatalog:
+    """
+    Process-wide holder of the current CatalogSnapshot for a concepts table.
+
+    Readers call snapshot(), which returns the cached snapshot and at most once
+    per check interval reads the version item to see whether a reload is needed.
+    """
+
+    def __init__(
+        self,
+        concepts_table,
+        version_table=None,
+        check_interval: float = CATALOG_CHECK_INTERVAL_SECONDS,
+        max_age: float = CATALOG_MAX_AGE_SECONDS,
+        scan_segments: int = CATALOG_SCAN_SEGMENTS
+    ):
+        """
+        Initialize the catalog.
+
+        Args:
+            concepts_table: DynamoDB table for concept/topic data
+            version_table: DynamoDB table holding the catalog version item
+                (see CATALOG_VERSION_TABLE); without it snapshots are
+                reloaded every max_age seconds
+            check_interval: Seconds between version checks
+            max_age: Seconds after which a snapshot is reloaded when there is
+                no version item
+            scan_segments: Number of parallel scan segments used to load the table
+        """
+        self.concepts_table = concepts_table
+        self.version_table = version_table
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self.scan_segments = scan_segments
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._last_check = 0.0
+        self.lock = Lock()
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CatalogSnapshot, concepts_table=None) -> "ConceptCatalog":
+        """
+        Create a catalog that always serves one snapshot and never checks the table.
+
+        Used by batch jobs that load the catalog once and share it with workers.
+
+        Args:
+            snapshot: Snapshot to serve
+            concepts_table: Optional table, only used by an explicit refresh()
+
+        Returns:
+            ConceptCatalog pinned to the snapshot
+        """
+        catalog = cls(concepts_table, check_interval=float("inf"))
+        catalog._snapshot = snapshot
+        catalog._last_check = time.time()
+        return catalog
+
+    def snapshot(self) -> CatalogSnapshot:
+        """
+        Get the current catalog snapshot, reloading it if the syllabus changed.
+
+        Returns:
+            Current CatalogSnapshot
+
+        Raises:
+            Exception: If no snapshot has been loaded yet and the table cannot be read
+        """
+        current = self._snapshot
+        if current is not None and time.time() - self._last_check < self.check_interval:
+            return current
+
+        with self.lock:
+            current = self._snapshot
+            now = time.time()
+            if current is not None and now - self._last_check < self.check_interval:
+                return current
+
+            stored_version = self._read_version()
+            self._last_check = now
+
+            if current is not None:
+                if stored_version is not None and stored_version == current.version:
+                    return current
+                if stored_version is None and now - current.loaded_at < self.max_age:
+                    return current
+
+            try:
+                self._snapshot = self._load(stored_version)
+            except Exception:
+                # Keep serving the previous snapshot if a reload fails
+                if current is None:
+                    raise
+            return self._snapshot
+
+    def refresh(self) -> CatalogSnapshot:
+        """
+        Force a reload of the catalog regardless of version.
+
+        Returns:
+            Newly loaded CatalogSnapshot
+        """
+        with self.lock:
+            self._snapshot = self._load(self._read_version())
+            self._last_check = time.time()
+            return self._snapshot
+
+    def get_concept(self, concept_id: str) -> Mapping[str, Any]:
+        """
+        Get concept metadata from the current snapshot.
+
+        Args:
+            concept_id: Concept identifier
+
+        Returns:
+            Read-only concept item, or an empty mapping if unknown
+        """
+        return self.snapshot().get(concept_id) or _EMPTY_CONCEPT
+
+    def expire(self) -> None:
+        """Make the next snapshot() call check the version instead of waiting for the interval."""
+        self._last_check = 0.0
+
+    def _read_version(self) -> Optional[str]:
+        """Read the syllabus version item, or None if absent or unreadable."""
+        if self.version_table is None:
+            return None
+        try:
+            response = self.version_table.get_item(Key={"catalog_id": _catalog_id(self.concepts_table)})
+            version = response.get("Item", {}).get("version")
+            return str(version) if version is not None else None
+        except Exception:
+            return None
+
+    def _load(self, stored_version: Optional[str]) -> CatalogSnapshot:
+        """
+        Scan the concepts table and build a new snapshot.
+
+        Args:
+            stored_version: Version read from the version item, if any
+
+        Returns:
+            New CatalogSnapshot
+        """
+        # Parallel segments arrive in any order; sort so snapshots are deterministic
+        items = sorted(
+            scan_all(self.concepts_table, total_segments=self.scan_segments),
+            key=lambda item: str(item.get("concept_id", ""))
+        )
+
+        version = stored_version if stored_version is not None else _content_version(items)
+        return CatalogSnapshot.from_items(items, version)
+
+
+def _content_version(items: List[Dict[str, Any]]) -> str:
+    """Derive a version string from catalog contents when no version item exists."""
+    digest = hashlib.sha256()
+    for item in sorted(items, key=lambda item: str(item.get("concept_id", ""))):
+        digest.update(json.dumps(item, sort_keys=True, default=str).encode("utf-8"))
+    return f"content:{digest.hexdigest()[:16]}"
+
+
+def _catalog_id(concepts_table) -> str:
+    """Key of a concepts table's item in the version table."""
+    return str(getattr(concepts_table, "name", None) or os.environ.get("CONCEPTS_TABLE", "SyllabusConcepts"))
+
+
+def bump_catalog_version(concepts_table, version_table) -> str:
+    """
+    Mark the syllabus as changed so warm processes reload their catalog.
+
+    Called by put_concepts and delete_concepts; call it directly after any
+    other write to the concepts table. This process's shared catalog checks
+    the new version on its next read; others do within their check interval.
+
+    Args:
+        concepts_table: DynamoDB table for concept/topic data
+        version_table: DynamoDB table holding the catalog version item
+
+    Returns:
+        The new version string
+    """
+    version = datetime.utcnow().isoformat() + "Z"
+    version_table.put_item(Item={"catalog_id": _catalog_id(concepts_table), "version": version})
+
+    with _shared_lock:
+        catalog = _shared_catalogs.get(_shared_key(concepts_table))
+    if catalog is not None:
+        catalog.expire()
+    return version
+
+
+def put_concepts(concepts_table, version_table, items: List[Dict[str, Any]]) -> str:
+    """
+    Write syllabus concepts and bump the catalog version.
+
+    Args:
+        concepts_table: DynamoDB table for concept/topic data
+        version_table: DynamoDB table holding the catalog version item
+        items: Concept items to create or replace
+
+    Returns:
+        The new catalog version
+    """
+    with concepts_table.batch_writer(overwrite_by_pkeys=["concept_id"]) as batch:
+        for item in items:
+            batch.put_item(Item=item)
+    return bump_catalog_version(concepts_table, version_table)
+
+
+def delete_concepts(concepts_table, version_table, concept_ids: List[str]) -> str:
+    """
+    Delete syllabus concepts and bump the catalog version.
+
+    Args:
+        concepts_table: DynamoDB table for concept/topic data
+        version_table: DynamoDB table holding the catalog version item
+        concept_ids: IDs of the concepts to delete
+
+    Returns:
+        The new catalog version
+    """
+    with concepts_table.batch_writer(overwrite_by_pkeys=["concept_id"]) as batch:
+        for concept_id in concept_ids:
+            batch.delete_item(Key={"concept_id": concept_id})
+    return bump_catalog_version(concepts_table, version_table)
+
+
+_shared_catalogs: Dict[Any, ConceptCatalog] = {}
+_shared_lock = Lock()
+
+
+def _shared_key(concepts_table) -> Any:
+    return getattr(concepts_table, "name", None) or id(concepts_table)
+
+
+def get_shared_catalog(concepts_table, version_table=None) -> ConceptCatalog:
+    """
+    Get the process-wide catalog for a concepts table.
+
+    All modules that pass the same table share one snapshot.
+
+    Args:
+        concepts_table: DynamoDB table for concept/topic data
+        version_table: DynamoDB table holding the catalog version item; set
+            on the shared catalog if it does not have one yet
+
+    Returns:
+        Shared ConceptCatalog instance
+    """
+    key = _shared_key(concepts_table)
+    with _shared_lock:
+        if key not in _shared_catalogs:
+            _shared_catalogs[key] = ConceptCatalog(concepts_table, version_table)
+        catalog = _shared_catalogs[key]
+        if catalog.version_table is None and version_table is not None:
+            catalog.version_table = version_table
+        return catalog
@@ -6,12 +6,100 @@ the optimal next topic for a student to study based on exam weightage,
 student weakness, dependency unlocking potential, and time cost.
 """
 
-from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from functools import lru_cache
+import os
 import time
 
+import numpy as np
+
+from concept_catalog import CatalogSnapshot, ConceptCatalog, get_shared_catalog
+from lru_ttl_cache import LRUTTLCache
+
+
+# Cache configuration
+CACHE_TTL_MINUTES = float(os.environ.get("DECISION_ENGINE_CACHE_TTL_MINUTES", "5"))
+CACHE_MAX_ENTRIES = int(os.environ.get("DECISION_ENGINE_CACHE_MAX_ENTRIES", "10000"))
+CACHE_MAX_BYTES = int(os.environ.get("DECISION_ENGINE_CACHE_MAX_BYTES", "0"))
+MASTERY_CACHE_TTL_SECONDS = os.environ.get("DECISION_ENGINE_MASTERY_CACHE_TTL_SECONDS")
+PROFILE_CACHE_TTL_SECONDS = os.environ.get("DECISION_ENGINE_PROFILE_CACHE_TTL_SECONDS")
+
+# Default latency budget for budgeted recommendation requests
+DECISION_ENGINE_TIMEOUT_MS = float(os.environ.get("DECISION_ENGINE_TIMEOUT_MS", "200"))
+
+# Parallel DynamoDB reads when loading data for many students at once
+BATCH_FETCH_WORKERS = int(os.environ.get("DECISION_ENGINE_BATCH_FETCH_WORKERS", "16"))
+
+# Runs budgeted mastery queries, so a request can stop waiting on a slow one
+_mastery_query_executor = ThreadPoolExecutor(
+    max_workers=BATCH_FETCH_WORKERS, thread_name_prefix="mastery-query"
+)
+
+
+def create_engine_cache() -> LRUTTLCache:
+    """
+    Create the decision engine cache from environment settings.
+    
+    DECISION_ENGINE_CACHE_TTL_MINUTES sets the default TTL; mastery and
+    profile entries use the same TTL unless overridden in seconds. Concept
+    metadata is served by the shared ConceptCatalog rather than this cache.
+    
+    Returns:
+        Configured LRUTTLCache instance
+    """
+    base_ttl = CACHE_TTL_MINUTES * 60.0
+    namespace_ttls = {
+        "mastery": float(MASTERY_CACHE_TTL_SECONDS) if MASTERY_CACHE_TTL_SECONDS else base_ttl,
+        "profile": float(PROFILE_CACHE_TTL_SECONDS) if PROFILE_CACHE_TTL_SECONDS else base_ttl,
+    }
+    return LRUTTLCache(
+        max_entries=CACHE_MAX_ENTRIES,
+        max_bytes=CACHE_MAX_BYTES or None,
+        default_ttl=base_ttl,
+        namespace_ttls=namespace_ttls
+    )
+
+
+def compute_priority_scores(
+    exam_weightage: np.ndarray,
+    estimated_hours: np.ndarray,
+    mastery: np.ndarray,
+    unlocks: np.ndarray,
+    importance_factor,
+    available_hours_per_day
+) -> np.ndarray:
+    """
+    Evaluate the priority formula elementwise over NumPy arrays.
+    
+    Inputs broadcast, so per-concept vectors can be combined with per-student
+    columns to score a students x concepts matrix. The operation order matches
+    DecisionEngine.compute_priority_score so results are bit-for-bit identical
+    before rounding.
+    
+    Args:
+        exam_weightage: Exam weightage per concept (0-100)
+        estimated_hours: Estimated study hours per concept
+        mastery: Mastery scores (0-100)
+        unlocks: Number of topics unlocked per concept
+        importance_factor: Exam proximity factor (scalar or per-student column)
+        available_hours_per_day: Daily study hours (scalar or per-student column)
+        
+    Returns:
+        Unrounded priority scores
+    """
+    weakness_score = np.maximum(0.1, 1.0 - (mastery / 100.0))
+    dependency_factor = 1.0 / (1.0 + unlocks)
+    mastery_level = np.maximum(0.1, mastery / 100.0)
+    time_cost = estimated_hours / np.maximum(0.1, available_hours_per_day)
+    
+    numerator = exam_weightage * importance_factor
+    denominator = weakness_score * dependency_factor * mastery_level * time_cost
+    
+    return numerator / np.maximum(0.001, denominator)
+
 
 @dataclass
 class Recommendation:
@@ -43,7 +131,7 @@ class Explanation:
         exam_weightage: Percentage of exam from this topic
         current_accuracy: Student's current accuracy percentage
         mastery_score: Student's mastery score (0-100)
-        dependencies_unlocked: Number of topics unlocked by mastering this
+        dependencies_unlocked: Number of future concepts (at any depth) that build on this
         weakness_score: Computed weakness score
         reasoning_text: Human-readable explanation
     """
@@ -55,6 +143,85 @@ class Explanation:
     reasoning_text: str
 
 
+@dataclass
+class RecommendationResult:
+    """
+    Recommendations computed under a latency budget.
+    
+    Attributes:
+        recommendations: Recommendations ranked by priority (descending)
+        partial: True if any stage was cut short by the deadline or failed
+        degraded_stages: Names of the stages that were cut short, skipped or failed
+        elapsed_ms: Wall-clock time spent computing the result
+    """
+    recommendations: List[Recommendation]
+    partial: bool = False
+    degraded_stages: List[str] = field(default_factory=list)
+    elapsed_ms: float = 0.0
+
+
+@dataclass(frozen=True)
+class CatalogArrays:
+    """
+    Per-concept arrays for vectorized eligibility and scoring.
+    
+    Built once per catalog snapshot and shared by every request against it.
+    
+    Attributes:
+        concepts: Concepts that have an ID, in catalog order
+        concept_ids: IDs of those concepts
+        column_of: Mastery matrix column of each concept ID; the catalog's
+            concepts come first, then prerequisites missing from the catalog
+        edge_child: Concept position of each prerequisite edge
+        edge_parent: Mastery column of each edge's prerequisite
+        exam_weightage: Exam weightage per concept
+        estimated_hours: Estimated study hours per concept
+        unlocks: Number of direct dependents per concept
+    """
+    concepts: List[Dict[str, Any]]
+    concept_ids: List[str]
+    column_of: Dict[str, int]
+    edge_child: np.ndarray
+    edge_parent: np.ndarray
+    exam_weightage: np.ndarray
+    estimated_hours: np.ndarray
+    unlocks: np.ndarray
+
+
+class Deadline:
+    """
+    Latency budget propagated through the recommendation stages.
+    
+    A deadline without a budget never expires.
+    """
+    
+    def __init__(self, budget_ms: Optional[float] = None):
+        """
+        Start the budget clock.
+        
+        Args:
+            budget_ms: Budget in milliseconds, or None for no limit
+        """
+        self.started_at = time.monotonic()
+        self.expires_at = (
+            self.started_at + budget_ms / 1000.0 if budget_ms is not None else None
+        )
+    
+    def expired(self) -> bool:
+        """Check whether the budget has run out."""
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+    
+    def remaining_ms(self) -> float:
+        """Get the remaining budget in milliseconds (infinite if unbounded)."""
+        if self.expires_at is None:
+            return float("inf")
+        return max(0.0, (self.expires_at - time.monotonic()) * 1000.0)
+    
+    def elapsed_ms(self) -> float:
+        """Get the time elapsed since the deadline was created in milliseconds."""
+        return (time.monotonic() - self.started_at) * 1000.0
+
+
 class DecisionEngine:
     """
     Core decision engine that computes study recommendations.
@@ -64,7 +231,9 @@ class DecisionEngine:
                      (Weakness_Score × Dependency_Factor × Mastery_Level × Time_Cost)
     """
     
-    def __init__(self, concepts_table, progress_table, student_profiles_table=None):
+    def __init__(self, concepts_table, progress_table, student_profiles_table=None,
+                 cache: Optional[LRUTTLCache] = None,
+                 catalog: Optional[ConceptCatalog] = None):
         """
         Initialize the decision engine.
         
@@ -72,26 +241,32 @@ class DecisionEngine:
             concepts_table: DynamoDB table for concept/topic data
             progress_table: DynamoDB table for student progress
             student_profiles_table: Optional DynamoDB table for student profiles
+            cache: Optional cache instance (defaults to one built from env settings)
+            catalog: Optional concept catalog (defaults to the process-wide one)
         """
         self.concepts_table = concepts_table
+        self.catalog = catalog if catalog is not None else get_shared_catalog(concepts_table)
         self.progress_table = progress_table
         self.student_profiles_table = student_profiles_table
-        self._cache = {}
-        self._cache_ttl = 300  # 5 minutes in seconds
+        self._cache = cache if cache is not None else create_engine_cache()
+        self._catalog_arrays: Optional[Tuple[CatalogSnapshot, CatalogArrays]] = None
     
     def _get_cached(self, key: str) -> Optional[Any]:
         """Get cached value if not expired."""
-        if key in self._cache:
-            value, timestamp = self._cache[key]
-            if time.time() - timestamp < self._cache_ttl:
-                return value
-            else:
-                del self._cache[key]
-        return None
+        return self._cache.get(key)
     
     def _set_cached(self, key: str, value: Any) -> None:
-        """Set cached value with current timestamp."""
-        self._cache[key] = (value, time.time())
+        """Set cached value; TTL is chosen by the key's namespace."""
+        self._cache.set(key, value)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss/eviction counters for monitoring.
+        
+        Returns:
+            Dictionary of cache statistics
+        """
+        return self._cache.get_stats()
     
     def _get_student_mastery(self, student_id: str, concept_id: str) -> float:
         """
@@ -120,26 +295,123 @@ class DecisionEngine:
         except Exception:
             return 0.0
     
+    def _get_mastery_snapshot(self, student_id: str) -> Dict[str, float]:
+        """
+        Load all mastery scores for a student with a single paginated query.
+        
+        The snapshot is meant to be built once per request and shared by the
+        eligibility filter, scoring and explanation stages.
+        
+        Args:
+            student_id: Student identifier
+            
+        Returns:
+            Dictionary mapping concept ID to mastery score (0-100);
+            untracked concepts are absent and count as 0
+        """
+        mastery_lookup, _ = self._query_mastery_snapshot(student_id)
+        return mastery_lookup
+    
+    def _query_mastery_snapshot(
+        self, student_id: str, deadline: Optional[Deadline] = None
+    ) -> Tuple[Dict[str, float], bool]:
+        """
+        Page through all of a student's progress items.
+        
+        With a bounded deadline the query runs on a worker thread and is
+        abandoned once the budget runs out. A concept missing from the lookup
+        counts as unstudied, so callers must not rank from an incomplete
+        lookup: it would rank mastered topics as if they were new.
+        
+        Args:
+            student_id: Student identifier
+            deadline: Optional latency budget for the query
+            
+        Returns:
+            Tuple of (mastery lookup, True if every page was read without
+            error before the deadline)
+        """
+        if deadline is None or deadline.expires_at is None:
+            return self._read_mastery_pages(student_id)
+        
+        future = _mastery_query_executor.submit(self._read_mastery_pages, student_id, deadline)
+        try:
+            return future.result(timeout=deadline.remaining_ms() / 1000.0)
+        except FutureTimeoutError:
+            return {}, False
+    
+    def _read_mastery_pages(
+        self, student_id: str, deadline: Optional[Deadline] = None
+    ) -> Tuple[Dict[str, float], bool]:
+        """
+        Run the paginated progress query for _query_mastery_snapshot.
+        
+        Args:
+            student_id: Student identifier
+            deadline: Optional latency budget, checked between pages
+            
+        Returns:
+            Tuple of (mastery lookup, True if every page was read)
+        """
+        mastery_lookup: Dict[str, float] = {}
+        query_kwargs = {
+            "KeyConditionExpression": "user_id = :uid",
+            "ExpressionAttributeValues": {":uid": student_id},
+            "ProjectionExpression": "concept_id, mastery_score",
+        }
+        
+        try:
+            while True:
+                response = self.progress_table.query(**query_kwargs)
+                for item in response.get("Items", []):
+                    concept_id = item.get("concept_id")
+                    if concept_id:
+                        mastery_lookup[concept_id] = float(item.get("mastery_score", 0))
+                
+                last_evaluated_key = response.get("LastEvaluatedKey")
+                if not last_evaluated_key:
+                    break
+                if deadline is not None and deadline.expired():
+                    return mastery_lookup, False
+                query_kwargs["ExclusiveStartKey"] = last_evaluated_key
+        except Exception:
+            return mastery_lookup, False
+        
+        return mastery_lookup, True
+    
+    def _lookup_mastery(
+        self,
+        student_id: str,
+        concept_id: str,
+        mastery_lookup: Optional[Dict[str, float]] = None
+    ) -> float:
+        """
+        Read mastery from a request snapshot, falling back to a single lookup.
+        
+        Args:
+            student_id: Student identifier
+            concept_id: Concept/topic identifier
+            mastery_lookup: Optional snapshot from _get_mastery_snapshot
+            
+        Returns:
+            Mastery score (0-100)
+        """
+        if mastery_lookup is not None:
+            return mastery_lookup.get(concept_id, 0.0)
+        return self._get_student_mastery(student_id, concept_id)
+    
     def _get_concept_data(self, concept_id: str) -> Dict[str, Any]:
         """
-        Get concept/topic data with caching.
+        Get concept/topic data from the shared catalog snapshot.
         
         Args:
             concept_id: Concept identifier
             
         Returns:
-            Dictionary with concept data
+            Dictionary with concept data (empty if unknown)
         """
-        cache_key = f"concept:{concept_id}"
-        cached = self._get_cached(cache_key)
-        if cached is not None:
-            return cached
-        
         try:
-            response = self.concepts_table.get_item(Key={"concept_id": concept_id})
-            item = response.get("Item", {})
-            self._set_cached(cache_key, item)
-            return item
+            return self._get_catalog().get(concept_id) or {}
         except Exception:
             return {}
     
@@ -170,7 +442,11 @@ class DecisionEngine:
             return {"available_hours_per_day": 4.0, "exam_date": None}
     
     def _check_prerequisites_met(
-        self, student_id: str, prerequisites: List[str], threshold: float = 60.0
+        self,
+        student_id: str,
+        prerequisites: List[str],
+        threshold: float = 60.0,
+        mastery_lookup: Optional[Dict[str, float]] = None
     ) -> bool:
         """
         Check if all prerequisites meet the mastery threshold.
@@ -179,6 +455,7 @@ class DecisionEngine:
             student_id: Student identifier
             prerequisites: List of prerequisite concept IDs
             threshold: Minimum mastery score required (default 60%)
+            mastery_lookup: Optional mastery snapshot for the student
             
         Returns:
             True if all prerequisites are met, False otherwise
@@ -187,28 +464,25 @@ class DecisionEngine:
             return True
         
         for prereq_id in prerequisites:
-            mastery = self._get_student_mastery(student_id, prereq_id)
+            mastery = self._lookup_mastery(student_id, prereq_id, mastery_lookup)
             if mastery < threshold:
                 return False
         return True
     
-    def _count_dependencies(self, concept_id: str, all_concepts: List[Dict]) -> int:
+    def _get_catalog(self) -> CatalogSnapshot:
         """
-        Count how many topics would be unlocked by mastering this concept.
+        Get the current concept catalog snapshot.
+        
+        The snapshot carries every concept plus its reverse-dependency index,
+        so unlock counts never require walking the concept list per topic.
         
-        Args:
-            concept_id: Concept identifier
-            all_concepts: List of all concept data
-            
         Returns:
-            Number of dependent topics
+            CatalogSnapshot from the shared ConceptCatalog
+            
+        Raises:
+            Exception: If the catalog has never been loaded and the table cannot be read
         """
-        count = 0
-        for concept in all_concepts:
-            prerequisites = concept.get("prerequisites", [])
-            if concept_id in prerequisites:
-                count += 1
-        return count
+        return self.catalog.snapshot()
     
     def _get_days_until_exam(self, student_id: str) -> Optional[int]:
         """
@@ -233,7 +507,27 @@ class DecisionEngine:
         except (ValueError, AttributeError):
             return None
     
-    def compute_priority_score(self, student_id: str, topic_id: str) -> float:
+    def _get_importance_factor(self, student_id: str) -> float:
+        """
+        Get the exam proximity importance factor for a student.
+        
+        Args:
+            student_id: Student identifier
+            
+        Returns:
+            1.5 if the exam is less than 30 days away, otherwise 1.0
+        """
+        days_until_exam = self._get_days_until_exam(student_id)
+        if days_until_exam is not None and days_until_exam < 30:
+            return 1.5
+        return 1.0
+    
+    def compute_priority_score(
+        self,
+        student_id: str,
+        topic_id: str,
+        mastery_lookup: Optional[Dict[str, float]] = None
+    ) -> float:
         """
         Compute priority score for a topic using the decision engine formula.
         
@@ -252,6 +546,7 @@ class DecisionEngine:
         Args:
             student_id: Student identifier
             topic_id: Topic identifier
+            mastery_lookup: Optional mastery snapshot for the student
             
         Returns:
             Priority score (higher is better)
@@ -262,29 +557,23 @@ class DecisionEngine:
             return 0.0
         
         # Get mastery score
-        mastery_score = self._get_student_mastery(student_id, topic_id)
+        mastery_score = self._lookup_mastery(student_id, topic_id, mastery_lookup)
         
         # Get exam weightage (0-100)
         exam_weightage = float(concept.get("exam_weight", 5))
         
         # Calculate importance factor based on exam proximity
-        days_until_exam = self._get_days_until_exam(student_id)
-        importance_factor = 1.0
-        if days_until_exam is not None and days_until_exam < 30:
-            importance_factor = 1.5
+        importance_factor = self._get_importance_factor(student_id)
         
         # Calculate weakness score: max(0.1, 1.0 - mastery_score/100)
         weakness_score = max(0.1, 1.0 - (mastery_score / 100.0))
         
-        # Calculate dependency factor
-        # First, get all concepts to count dependencies
+        # Calculate dependency factor from the precomputed dependency index
         try:
-            all_concepts_response = self.concepts_table.scan()
-            all_concepts = all_concepts_response.get("Items", [])
+            dependency_index = self._get_catalog().dependency_index
+            num_topics_unlocked = dependency_index.direct_unlock_count(topic_id)
         except Exception:
-            all_concepts = []
-        
-        num_topics_unlocked = self._count_dependencies(topic_id, all_concepts)
+            num_topics_unlocked = 0
         dependency_factor = 1.0 / (1.0 + num_topics_unlocked)
         
         # Calculate mastery level: max(0.1, mastery_score/100)
@@ -304,6 +593,147 @@ class DecisionEngine:
         
         return round(priority_score, 2)
     
+    def _get_catalog_arrays(self, catalog: CatalogSnapshot) -> CatalogArrays:
+        """
+        Get the scoring arrays for a catalog snapshot, building them on first use.
+        
+        Args:
+            catalog: Current catalog snapshot
+            
+        Returns:
+            CatalogArrays for the snapshot
+        """
+        cached = self._catalog_arrays
+        if cached is not None and cached[0] is catalog:
+            return cached[1]
+        
+        concepts = [concept for concept in catalog.concepts if concept.get("concept_id")]
+        concept_ids = [concept["concept_id"] for concept in concepts]
+        
+        # Columns cover every concept plus prerequisites missing from the catalog
+        column_of: Dict[str, int] = {}
+        for concept_id in concept_ids:
+            column_of.setdefault(concept_id, len(column_of))
+        edge_child: List[int] = []
+        edge_parent: List[int] = []
+        for position, concept in enumerate(concepts):
+            for prereq_id in concept.get("prerequisites", []):
+                edge_child.append(position)
+                edge_parent.append(column_of.setdefault(prereq_id, len(column_of)))
+        
+        unlock_counts = catalog.dependency_index.direct_counts
+        arrays = CatalogArrays(
+            concepts=concepts,
+            concept_ids=concept_ids,
+            column_of=column_of,
+            edge_child=np.array(edge_child, dtype=np.intp),
+            edge_parent=np.array(edge_parent, dtype=np.intp),
+            exam_weightage=np.array(
+                [float(concept.get("exam_weight", 5)) for concept in concepts], dtype=np.float64
+            ),
+            estimated_hours=np.array(
+                [float(concept.get("estimated_hours", 2.0)) for concept in concepts], dtype=np.float64
+            ),
+            unlocks=np.array(
+                [unlock_counts.get(concept_id, 0) for concept_id in concept_ids], dtype=np.float64
+            ),
+        )
+        self._catalog_arrays = (catalog, arrays)
+        return arrays
+    
+    @staticmethod
+    def _mastery_matrix(
+        arrays: CatalogArrays, mastery_lookups: List[Dict[str, float]]
+    ) -> np.ndarray:
+        """
+        Lay out mastery as a students x columns matrix (untracked concepts are 0).
+        
+        Args:
+            arrays: Catalog arrays defining the columns
+            mastery_lookups: One mastery lookup per student
+            
+        Returns:
+            Mastery matrix
+        """
+        mastery = np.zeros((len(mastery_lookups), len(arrays.column_of)), dtype=np.float64)
+        for row, mastery_lookup in enumerate(mastery_lookups):
+            for concept_id, score in mastery_lookup.items():
+                column = arrays.column_of.get(concept_id)
+                if column is not None:
+                    mastery[row, column] = score
+        return mastery
+    
+    @staticmethod
+    def _score_matrix(
+        arrays: CatalogArrays,
+        mastery: np.ndarray,
+        importance_factor: np.ndarray,
+        available_hours_per_day: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Filter and score every concept for every student in one pass.
+        
+        Args:
+            arrays: Catalog arrays
+            mastery: Students x columns mastery matrix
+            importance_factor: Per-student column of exam proximity factors
+            available_hours_per_day: Per-student column of daily study hours
+            
+        Returns:
+            Tuple of (unrounded scores, -inf where ineligible; eligibility mask)
+        """
+        concept_count = len(arrays.concepts)
+        
+        # A concept is eligible when none of its prerequisite edges is unmet
+        unmet = np.zeros((mastery.shape[0], concept_count), dtype=np.int32)
+        if len(arrays.edge_child):
+            edge_unmet = mastery[:, arrays.edge_parent] < 60.0
+            np.add.at(unmet.T, arrays.edge_child, edge_unmet.T)
+        eligible = unmet == 0
+        
+        scores = compute_priority_scores(
+            arrays.exam_weightage, arrays.estimated_hours, mastery[:, :concept_count],
+            arrays.unlocks, importance_factor, available_hours_per_day
+        )
+        scores[~eligible] = -np.inf
+        return scores, eligible
+    
+    @staticmethod
+    def _rank_scores(
+        row_scores: np.ndarray, eligible_row: np.ndarray, n: int
+    ) -> List[Tuple[int, float]]:
+        """
+        Select one student's top N concepts without sorting every score.
+        
+        Only concepts that can survive rounding into the top N are ranked
+        exactly. Scores are rounded as in compute_priority_score, non-positive
+        scores are dropped, and ties keep catalog order.
+        
+        Args:
+            row_scores: Unrounded scores, -inf where ineligible
+            eligible_row: Eligibility mask
+            n: Number of concepts to return
+            
+        Returns:
+            (concept position, rounded score) pairs, best first
+        """
+        k = min(n, len(row_scores))
+        if k <= 0:
+            return []
+        kth_score = np.partition(row_scores, len(row_scores) - k)[len(row_scores) - k]
+        candidates = np.flatnonzero(row_scores >= kth_score - 0.01)
+        
+        ranked = []
+        for position in candidates.tolist():
+            if not eligible_row[position]:
+                continue
+            # Python round() keeps parity with the scalar path (np.round differs on ties)
+            priority_score = round(float(row_scores[position]), 2)
+            if priority_score > 0:
+                ranked.append((position, priority_score))
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        return ranked[:n]
+    
     def get_next_recommendation(self, student_id: str) -> Optional[Recommendation]:
         """
         Get the highest priority topic recommendation for a student.
@@ -318,7 +748,7 @@ class DecisionEngine:
         return recommendations[0] if recommendations else None
     
     def get_top_n_recommendations(
-        self, student_id: str, n: int = 5
+        self, student_id: str, n: int = 5, include_explanations: bool = True
     ) -> List[Recommendation]:
         """
         Get top N topic recommendations sorted by priority score.
@@ -326,72 +756,268 @@ class DecisionEngine:
         Args:
             student_id: Student identifier
             n: Number of recommendations to return
+            include_explanations: Set False when only IDs and scores are needed
             
         Returns:
             List of Recommendation objects sorted by priority (descending)
         """
-        # Get all concepts
-        try:
-            response = self.concepts_table.scan()
-            all_concepts = response.get("Items", [])
-        except Exception:
-            return []
+        return self._compute_recommendations(
+            student_id, n, Deadline(), include_explanations
+        ).recommendations
+    
+    def get_top_n_recommendations_within_budget(
+        self,
+        student_id: str,
+        n: int = 5,
+        budget_ms: Optional[float] = None,
+        include_explanations: bool = True
+    ) -> RecommendationResult:
+        """
+        Get top N recommendations while honoring a latency budget.
         
-        # Filter to eligible topics (prerequisites met)
-        eligible_topics = []
-        for concept in all_concepts:
-            concept_id = concept.get("concept_id")
-            if not concept_id:
-                continue
+        The mastery query gets whatever budget the catalog load left. If the
+        budget runs out first, or the query fails, no recommendations are
+        returned, since ranking from missing scores would treat mastered
+        topics as new. Eligibility and scoring cover the whole catalog in one
+        vectorized pass; once the budget is gone, explanations are skipped.
+        Any degraded result is flagged as partial.
+        
+        Args:
+            student_id: Student identifier
+            n: Number of recommendations to return
+            budget_ms: Budget in milliseconds (defaults to DECISION_ENGINE_TIMEOUT_MS)
+            include_explanations: Set False when only IDs and scores are needed
             
-            prerequisites = concept.get("prerequisites", [])
-            if self._check_prerequisites_met(student_id, prerequisites):
-                eligible_topics.append(concept)
+        Returns:
+            RecommendationResult with recommendations and partial flag
+        """
+        if budget_ms is None:
+            budget_ms = DECISION_ENGINE_TIMEOUT_MS
+        return self._compute_recommendations(
+            student_id, n, Deadline(budget_ms), include_explanations
+        )
+    
+    def _compute_recommendations(
+        self,
+        student_id: str,
+        n: int,
+        deadline: Deadline,
+        include_explanations: bool = True
+    ) -> RecommendationResult:
+        """
+        Run the catalog, mastery, filter, scoring and explanation stages.
         
-        # Compute priority scores
-        scored_topics = []
-        for concept in eligible_topics:
-            concept_id = concept.get("concept_id")
-            priority_score = self.compute_priority_score(student_id, concept_id)
+        Args:
+            student_id: Student identifier
+            n: Number of recommendations to return
+            deadline: Latency budget shared by all stages
+            include_explanations: Whether to attach explanations
             
-            if priority_score > 0:
-                scored_topics.append((concept, priority_score))
+        Returns:
+            RecommendationResult with recommendations and degraded stages
+        """
+        degraded_stages: List[str] = []
         
-        # Sort by priority score (descending)
-        scored_topics.sort(key=lambda x: x[1], reverse=True)
+        # Get all concepts (normally served from the in-memory snapshot)
+        try:
+            catalog = self._get_catalog()
+        except Exception:
+            return RecommendationResult(recommendations=[], elapsed_ms=deadline.elapsed_ms())
+        
+        # A cold catalog load can use up the budget; stop before reading mastery
+        if deadline.expired():
+            return RecommendationResult(
+                recommendations=[],
+                partial=True,
+                degraded_stages=["catalog"],
+                elapsed_ms=round(deadline.elapsed_ms(), 2)
+            )
+        
+        # Load the student's mastery once for the whole request; ranking from
+        # an incomplete read would treat unread concepts as unstudied
+        mastery_lookup, mastery_complete = self._query_mastery_snapshot(student_id, deadline)
+        if not mastery_complete:
+            return RecommendationResult(
+                recommendations=[],
+                partial=True,
+                degraded_stages=["mastery"],
+                elapsed_ms=round(deadline.elapsed_ms(), 2)
+            )
+        
+        # Filter and score the whole catalog in one vectorized pass
+        arrays = self._get_catalog_arrays(catalog)
+        profile = self._get_student_profile(student_id)
+        scores, eligible = self._score_matrix(
+            arrays,
+            self._mastery_matrix(arrays, [mastery_lookup]),
+            np.array([[self._get_importance_factor(student_id)]], dtype=np.float64),
+            np.array([[float(profile.get("available_hours_per_day", 4.0))]], dtype=np.float64)
+        )
+        top_topics = [
+            (arrays.concepts[position], priority_score)
+            for position, priority_score in self._rank_scores(scores[0], eligible[0], n)
+        ]
         
-        # Build recommendations
+        # Build recommendations, explaining them from the scoring components
         recommendations = []
-        for concept, priority_score in scored_topics[:n]:
-            concept_id = concept.get("concept_id")
-            concept_name = concept.get("topic", concept_id)
+        for concept, priority_score in top_topics:
+            include_explanation = include_explanations
+            if include_explanations and deadline.expired():
+                include_explanation = False
+                if "explanation" not in degraded_stages:
+                    degraded_stages.append("explanation")
             
-            # Calculate expected marks gain
-            exam_weightage = float(concept.get("exam_weight", 5))
-            mastery_score = self._get_student_mastery(student_id, concept_id)
-            # Assume 10% improvement potential, scaled by current weakness
-            improvement_potential = (100 - mastery_score) * 0.1
-            expected_marks_gain = (exam_weightage / 100.0) * improvement_potential
-            
-            estimated_hours = float(concept.get("estimated_hours", 2.0))
+            concept_id = concept.get("concept_id")
+            recommendations.append(self._build_recommendation(
+                concept,
+                priority_score,
+                mastery_lookup.get(concept_id, 0.0),
+                catalog.dependency_index.transitive_unlock_count(concept_id),
+                include_explanation
+            ))
+        
+        return RecommendationResult(
+            recommendations=recommendations,
+            partial=bool(degraded_stages),
+            degraded_stages=degraded_stages,
+            elapsed_ms=round(deadline.elapsed_ms(), 2)
+        )
+    
+    def _build_recommendation(
+        self,
+        concept: Dict[str, Any],
+        priority_score: float,
+        mastery_score: float,
+        dependencies_unlocked: int,
+        include_explanation: bool = True
+    ) -> Recommendation:
+        """
+        Build a Recommendation from the components computed during scoring.
+        
+        Args:
+            concept: Concept item
+            priority_score: Rounded priority score
+            mastery_score: Student's mastery score for the concept (0-100)
+            dependencies_unlocked: Number of concepts downstream of the concept
+            include_explanation: Whether to attach the explanation
             
-            # Generate explanation
-            explanation = self.explain_recommendation(student_id, concept_id)
+        Returns:
+            Recommendation object
+        """
+        concept_id = concept.get("concept_id")
+        concept_name = concept.get("topic", concept_id)
+        
+        # Calculate expected marks gain
+        exam_weightage = float(concept.get("exam_weight", 5))
+        # Assume 10% improvement potential, scaled by current weakness
+        improvement_potential = (100 - mastery_score) * 0.1
+        expected_marks_gain = (exam_weightage / 100.0) * improvement_potential
+        
+        estimated_hours = float(concept.get("estimated_hours", 2.0))
+        
+        explanation = None
+        if include_explanation:
+            explanation = self._build_explanation(concept, mastery_score, dependencies_unlocked)
+        
+        return Recommendation(
+            topic_id=concept_id,
+            topic_name=concept_name,
+            priority_score=priority_score,
+            expected_marks_gain=round(expected_marks_gain, 2),
+            estimated_study_hours=estimated_hours,
+            explanation=explanation.__dict__ if explanation else {}
+        )
+    
+    def get_top_n_recommendations_batch(
+        self, student_ids: List[str], n: int = 5, include_explanations: bool = True
+    ) -> Dict[str, RecommendationResult]:
+        """
+        Get top N recommendations for many students in one job.
+        
+        The catalog is loaded once, mastery and profiles for all students are
+        fetched in parallel, and a students x concepts matrix is filtered and
+        scored in one vectorized computation. Each student's list is identical
+        to what get_top_n_recommendations would return. A student whose
+        mastery could not be read in full gets no recommendations and a
+        partial result with "mastery" degraded, as in the single-student path.
+        
+        Args:
+            student_ids: Student identifiers
+            n: Number of recommendations per student
+            include_explanations: Set False when only IDs and scores are needed
             
-            recommendation = Recommendation(
-                topic_id=concept_id,
-                topic_name=concept_name,
-                priority_score=priority_score,
-                expected_marks_gain=round(expected_marks_gain, 2),
-                estimated_study_hours=estimated_hours,
-                explanation=explanation.__dict__ if explanation else {}
+        Returns:
+            Dictionary mapping student ID to a RecommendationResult
+        """
+        deadline = Deadline()
+        student_ids = list(dict.fromkeys(student_ids))
+        if not student_ids:
+            return {}
+        
+        try:
+            catalog = self._get_catalog()
+        except Exception:
+            return {
+                student_id: RecommendationResult(recommendations=[], elapsed_ms=deadline.elapsed_ms())
+                for student_id in student_ids
+            }
+        
+        # Fetch mastery and warm profile cache for all students in parallel
+        workers = max(1, min(BATCH_FETCH_WORKERS, len(student_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            mastery_reads = list(executor.map(self._query_mastery_snapshot, student_ids))
+            profiles = list(executor.map(self._get_student_profile, student_ids))
+        
+        # Only students whose mastery was read in full are ranked
+        results: Dict[str, RecommendationResult] = {}
+        ranked_rows = []
+        for student_id, (mastery_lookup, mastery_complete), profile in zip(
+            student_ids, mastery_reads, profiles
+        ):
+            if mastery_complete:
+                ranked_rows.append((student_id, mastery_lookup, profile))
+            else:
+                results[student_id] = RecommendationResult(
+                    recommendations=[], partial=True, degraded_stages=["mastery"]
+                )
+        
+        if ranked_rows:
+            arrays = self._get_catalog_arrays(catalog)
+            mastery = self._mastery_matrix(arrays, [row[1] for row in ranked_rows])
+            importance_factor = np.array(
+                [self._get_importance_factor(row[0]) for row in ranked_rows],
+                dtype=np.float64
+            )[:, None]
+            available_hours_per_day = np.array(
+                [float(row[2].get("available_hours_per_day", 4.0)) for row in ranked_rows],
+                dtype=np.float64
+            )[:, None]
+            scores, eligible = self._score_matrix(
+                arrays, mastery, importance_factor, available_hours_per_day
             )
-            recommendations.append(recommendation)
+            
+            for row, (student_id, _, _) in enumerate(ranked_rows):
+                results[student_id] = RecommendationResult(recommendations=[
+                    self._build_recommendation(
+                        arrays.concepts[position],
+                        priority_score,
+                        float(mastery[row, position]),
+                        catalog.dependency_index.transitive_unlock_count(arrays.concept_ids[position]),
+                        include_explanations
+                    )
+                    for position, priority_score in self._rank_scores(scores[row], eligible[row], n)
+                ])
         
-        return recommendations
+        elapsed_ms = round(deadline.elapsed_ms(), 2)
+        for result in results.values():
+            result.elapsed_ms = elapsed_ms
+        return {student_id: results[student_id] for student_id in student_ids}
     
     def explain_recommendation(
-        self, student_id: str, topic_id: str
+        self,
+        student_id: str,
+        topic_id: str,
+        mastery_lookup: Optional[Dict[str, float]] = None
     ) -> Optional[Explanation]:
         """
         Generate detailed explanation for why a topic is recommended.
@@ -399,6 +1025,7 @@ class DecisionEngine:
         Args:
             student_id: Student identifier
             topic_id: Topic identifier
+            mastery_lookup: Optional mastery snapshot for the student
             
         Returns:
             Explanation object with all formula components
@@ -408,20 +1035,40 @@ class DecisionEngine:
             return None
         
         # Get all data needed for explanation
-        mastery_score = self._get_student_mastery(student_id, topic_id)
-        exam_weightage = float(concept.get("exam_weight", 5))
-        
-        # Calculate current accuracy (simplified as mastery score)
-        current_accuracy = mastery_score
+        mastery_score = self._lookup_mastery(student_id, topic_id, mastery_lookup)
         
         # Count dependencies
         try:
-            all_concepts_response = self.concepts_table.scan()
-            all_concepts = all_concepts_response.get("Items", [])
+            dependency_index = self._get_catalog().dependency_index
+            dependencies_unlocked = dependency_index.transitive_unlock_count(topic_id)
         except Exception:
-            all_concepts = []
+            dependencies_unlocked = 0
+        
+        return self._build_explanation(concept, mastery_score, dependencies_unlocked)
+    
+    @staticmethod
+    def _build_explanation(
+        concept: Dict[str, Any], mastery_score: float, dependencies_unlocked: int
+    ) -> Explanation:
+        """
+        Assemble an Explanation from formula components that are already known.
+        
+        Does no I/O, so recommendations can be explained straight from the
+        values computed while scoring.
         
-        dependencies_unlocked = self._count_dependencies(topic_id, all_concepts)
+        Args:
+            concept: Concept item
+            mastery_score: Student's mastery score for the concept (0-100)
+            dependencies_unlocked: Number of concepts downstream of the concept
+            
+        Returns:
+            Explanation object with all formula components
+        """
+        topic_id = concept.get("concept_id")
+        exam_weightage = float(concept.get("exam_weight", 5))
+        
+        # Calculate current accuracy (simplified as mastery score)
+        current_accuracy = mastery_score
         
         # Calculate weakness score
         weakness_score = max(0.1, 1.0 - (mastery_score / 100.0))
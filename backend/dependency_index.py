@@ -0,0 +1,147 @@
+"""
+Reverse-prerequisite index for the Adaptive Learning Decision Engine.
+
+This module precomputes which concepts depend on each concept so that
+unlock counts can be answered in constant time instead of walking the
+whole syllabus for every topic.
+"""
+
+from typing import List, Dict, Any, Iterable
+
+
+class DependencyIndex:
+    """
+    Maps each concept to the concepts that list it as a prerequisite.
+
+    The index is built once from a catalog snapshot and is read-only afterwards.
+    Both direct dependents and the full transitive closure are counted up front.
+    """
+
+    def __init__(self, all_concepts: Iterable[Dict[str, Any]]):
+        """
+        Build the index from concept items.
+
+        Args:
+            all_concepts: Concept items with concept_id and prerequisites
+        """
+        self._dependents: Dict[str, List[str]] = {}
+
+        for concept in all_concepts:
+            concept_id = concept.get("concept_id")
+            for prereq_id in set(concept.get("prerequisites", [])):
+                self._dependents.setdefault(prereq_id, []).append(concept_id)
+
+        self._direct_counts: Dict[str, int] = {
+            concept_id: len(dependents)
+            for concept_id, dependents in self._dependents.items()
+        }
+        self._transitive_counts = self._compute_transitive_counts()
+
+    def _compute_transitive_counts(self) -> Dict[str, int]:
+        """
+        Count all downstream concepts reachable from each concept.
+
+        Descendant sets are kept as integer bitsets and merged in reverse
+        topological order, so every edge is visited once.
+
+        Returns:
+            Dictionary mapping concept ID to number of transitive dependents
+        """
+        nodes = set(self._dependents)
+        for dependents in self._dependents.values():
+            nodes.update(dependent for dependent in dependents if dependent is not None)
+
+        bit_of = {node: 1 << position for position, node in enumerate(nodes)}
+
+        # Kahn's algorithm over prerequisite -> dependent edges
+        in_degree = {node: 0 for node in nodes}
+        for dependents in self._dependents.values():
+            for dependent in dependents:
+                if dependent is not None:
+                    in_degree[dependent] += 1
+
+        order = [node for node, degree in in_degree.items() if degree == 0]
+        for node in order:
+            for dependent in self._dependents.get(node, []):
+                if dependent is None:
+                    continue
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    order.append(dependent)
+
+        descendants: Dict[str, int] = {}
+        for node in reversed(order):
+            bits = 0
+            for dependent in self._dependents.get(node, []):
+                if dependent is not None:
+                    bits |= bit_of[dependent] | descendants[dependent]
+            descendants[node] = bits
+
+        # Nodes on a cycle are never released by Kahn; fall back to a plain walk
+        for node in nodes:
+            if node not in descendants:
+                descendants[node] = self._reachable_bits(node, bit_of)
+
+        return {
+            node: bin(bits).count("1")
+            for node, bits in descendants.items()
+            if bits
+        }
+
+    def _reachable_bits(self, start_id: str, bit_of: Dict[str, int]) -> int:
+        """Collect the bitset of concepts reachable from start_id by DFS."""
+        bits = 0
+        stack = [start_id]
+        visited = {start_id}
+
+        while stack:
+            current = stack.pop()
+            for dependent in self._dependents.get(current, []):
+                if dependent is None or dependent in visited:
+                    continue
+                visited.add(dependent)
+                bits |= bit_of[dependent]
+                stack.append(dependent)
+
+        return bits
+
+    def get_dependents(self, concept_id: str) -> List[str]:
+        """
+        Get the concepts that directly require this concept.
+
+        Args:
+            concept_id: Concept identifier
+
+        Returns:
+            List of dependent concept IDs
+        """
+        return list(self._dependents.get(concept_id, []))
+
+    def direct_unlock_count(self, concept_id: str) -> int:
+        """
+        Get the number of concepts that directly require this concept.
+
+        Args:
+            concept_id: Concept identifier
+
+        Returns:
+            Number of direct dependents
+        """
+        return self._direct_counts.get(concept_id, 0)
+
+    def transitive_unlock_count(self, concept_id: str) -> int:
+        """
+        Get the number of concepts downstream of this concept at any depth.
+
+        Args:
+            concept_id: Concept identifier
+
+        Returns:
+            Number of transitive dependents
+        """
+        return self._transitive_counts.get(concept_id, 0)
+
+    @property
+    def direct_counts(self) -> Dict[str, int]:
+        """Dictionary mapping concept ID to number of direct dependents."""
+        return self._direct_counts
@@ -0,0 +1,108 @@
+"""
+Paginated and parallel DynamoDB scans.
+
+A single Table.scan() call returns at most 1 MB of data, so callers must
+follow LastEvaluatedKey to read a whole table. This module wraps that loop,
+optionally splits the table into parallel scan segments (Segment /
+TotalSegments) on a thread pool, and streams items to the caller as pages
+arrive.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def scan_pages(
+    table,
+    segment: Optional[int] = None,
+    total_segments: Optional[int] = None,
+    **scan_kwargs
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield pages of items from one scan (or one scan segment) until exhausted.
+
+    Args:
+        table: DynamoDB table resource
+        segment: Segment number for a parallel scan
+        total_segments: Total number of segments for a parallel scan
+        **scan_kwargs: Extra arguments passed to Table.scan
+
+    Yields:
+        Lists of items, one per scan page
+    """
+    kwargs = dict(scan_kwargs)
+    if total_segments is not None and total_segments > 1:
+        kwargs["Segment"] = segment
+        kwargs["TotalSegments"] = total_segments
+
+    while True:
+        response = table.scan(**kwargs)
+        yield response.get("Items", [])
+
+        last_evaluated_key = response.get("LastEvaluatedKey")
+        if not last_evaluated_key:
+            return
+        kwargs["ExclusiveStartKey"] = last_evaluated_key
+
+
+def scan_all(
+    table,
+    total_segments: int = 1,
+    max_workers: Optional[int] = None,
+    **scan_kwargs
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every item in a table, following pagination.
+
+    With total_segments > 1 the segments are scanned concurrently and items
+    are yielded in arrival order, so the overall order is not deterministic.
+    If any segment fails, the exception is raised in the consumer.
+
+    Args:
+        table: DynamoDB table resource
+        total_segments: Number of parallel scan segments (1 for a sequential scan)
+        max_workers: Thread pool size (defaults to total_segments)
+        **scan_kwargs: Extra arguments passed to Table.scan (e.g. ProjectionExpression)
+
+    Yields:
+        Table items
+    """
+    if total_segments <= 1:
+        for page in scan_pages(table, **scan_kwargs):
+            yield from page
+        return
+
+    pages: "queue.Queue" = queue.Queue()
+    stop = threading.Event()
+
+    def scan_segment(segment: int) -> None:
+        try:
+            for page in scan_pages(table, segment, total_segments, **scan_kwargs):
+                if stop.is_set():
+                    return
+                pages.put(("page", page))
+        except Exception as exc:
+            pages.put(("error", exc))
+        finally:
+            pages.put(("done", None))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers or total_segments)
+    try:
+        for segment in range(total_segments):
+            executor.submit(scan_segment, segment)
+
+        remaining = total_segments
+        while remaining:
+            kind, payload = pages.get()
+            if kind == "page":
+                yield from payload
+            elif kind == "error":
+                raise payload
+            else:
+                remaining -= 1
+    finally:
+        # Let outstanding segments stop after their current page
+        stop.set()
+        executor.shutdown(wait=False)
@@ -0,0 +1,264 @@
+"""
+Binary snapshot files for the compact knowledge graph.
+
+Rebuilding the graph from storage row by row dominates worker cold start.
+A snapshot stores one CompactGraph version in a flat file: an 8-byte magic,
+a length-prefixed JSON header describing each array (dtype, shape, byte
+offset), then the arrays themselves, each 64-byte aligned. Loading maps the
+file with np.memmap and views the arrays in place, so workers on one host
+share the page cache instead of each holding a private copy.
+
+Topic names and descriptions are stored as UTF-8 blobs with offset arrays.
+Loading builds no per-topic Python objects: ID lookups binary-search a sorted
+ID array, whole-graph queries read the weightage, hours and parent arrays,
+and a Topic record is only built when a query returns that topic.
+"""
+
+import json
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from compact_graph import CompactGraph
+from models import Topic
+
+
+SNAPSHOT_MAGIC = b"KGSNAP01"
+SNAPSHOT_FORMAT_VERSION = 3
+ARRAY_ALIGNMENT = 64
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a file is not a readable graph snapshot."""
+    pass
+
+
+def _encode_strings(values) -> Tuple[np.ndarray, np.ndarray]:
+    """Pack strings into a UTF-8 byte blob plus an offsets array."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+class MappedTopics(Sequence[Topic]):
+    """
+    Read-only sequence of a snapshot's topics, built from the mapped arrays on access.
+
+    Each Topic is created the first time its position is read and reused
+    afterwards, so a worker only holds the topics its queries have returned.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+            arrays: Mapped snapshot arrays (see save_snapshot)
+        """
+        self._arrays = arrays
+        self._count = len(arrays["topic_ids"])
+        self._built: Dict[int, Topic] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: Union[int, slice]) -> Union[Topic, List[Topic]]:
+        if isinstance(position, slice):
+            return [self[index] for index in range(*position.indices(self._count))]
+        position = int(position)
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError("topic position out of range")
+        topic = self._built.get(position)
+        if topic is None:
+            topic = self._built[position] = self._build(position)
+        return topic
+
+    def __iter__(self) -> Iterator[Topic]:
+        for position in range(self._count):
+            yield self[position]
+
+    def _text(self, name: str, position: int) -> str:
+        offsets = self._arrays[f"{name}_offsets"]
+        return self._arrays[f"{name}_blob"][offsets[position]:offsets[position + 1]].tobytes().decode("utf-8")
+
+    def _build(self, position: int) -> Topic:
+        arrays = self._arrays
+        return Topic(
+            id=int(arrays["topic_ids"][position]),
+            name=self._text("name", position),
+            parent_id=int(arrays["parent_ids"][position]) if arrays["has_parent"][position] else None,
+            exam_weightage=float(arrays["exam_weightage"][position]),
+            estimated_hours=float(arrays["estimated_hours"][position]),
+            description=self._text("description", position),
+            created_at=_EPOCH + timedelta(microseconds=int(arrays["created_at_us"][position]))
+        )
+
+
+def save_snapshot(
+    graph: CompactGraph,
+    path: str,
+    storage_version: Optional[Any] = None
+) -> None:
+    """
+    Write a graph snapshot, including its precomputed metrics.
+
+    The file is written next to the target and renamed into place, so readers
+    never map a partially written snapshot.
+
+    Args:
+        graph: Compact graph to save
+        path: Destination file path
+        storage_version: Storage-side graph version the graph was built from,
+            used by readers to detect a stale snapshot
+    """
+    topics = graph.topics
+    name_blob, name_offsets = _encode_strings(topic.name for topic in topics)
+    description_blob, description_offsets = _encode_strings(topic.description for topic in topics)
+
+    id_positions = np.argsort(graph.topic_ids, kind="stable").astype(np.int32)
+
+    arrays: Dict[str, np.ndarray] = {
+        "topic_ids": graph.topic_ids,
+        "sorted_topic_ids": graph.topic_ids[id_positions],
+        "id_positions": id_positions,
+        "parent_positions": graph.parent_position_array,
+        "parent_ids": np.array(
+            [topic.parent_id if topic.parent_id is not None else 0 for topic in topics], dtype=np.int64
+        ),
+        "has_parent": np.array([topic.parent_id is not None for topic in topics], dtype=np.bool_),
+        "exam_weightage": np.array([topic.exam_weightage for topic in topics], dtype=np.float64),
+        "estimated_hours": np.array([topic.estimated_hours for topic in topics], dtype=np.float64),
+        "created_at_us": np.array(
+            [(topic.created_at - _EPOCH) // timedelta(microseconds=1) for topic in topics], dtype=np.int64
+        ),
+        "name_blob": name_blob,
+        "name_offsets": name_offsets,
+        "description_blob": description_blob,
+        "description_offsets": description_offsets,
+        "prereq_offsets": graph.prereq_offsets,
+        "prereq_indices": graph.prereq_indices,
+        "prereq_thresholds": graph.prereq_thresholds,
+        "dependent_offsets": graph.dependent_offsets,
+        "dependent_indices": graph.dependent_indices,
+        "topological_order": graph.topological_order,
+        "levels": graph.levels,
+        "descendant_counts": graph.descendant_counts,
+        "downstream_impact": graph.downstream_impact,
+    }
+
+    # Lay out arrays after the header; offsets are relative to the data section
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        layout[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+        offset += -(-array.nbytes // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+    header = json.dumps({
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "graph_version": graph.version,
+        "storage_version": storage_version,
+        "topic_count": len(topics),
+        "edge_count": int(len(graph.prereq_indices)),
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "arrays": layout,
+    }, default=str).encode("utf-8")
+    prefix_length = len(SNAPSHOT_MAGIC) + 4 + len(header)
+    data_start = -(-prefix_length // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+
+    temp_path = f"{path}.tmp.{os.getpid()}"
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.write(SNAPSHOT_MAGIC)
+        snapshot_file.write(struct.pack("<I", len(header)))
+        snapshot_file.write(header)
+        snapshot_file.write(b"\0" * (data_start - prefix_length))
+        for name, array in arrays.items():
+            snapshot_file.seek(data_start + layout[name]["offset"])
+            snapshot_file.write(array.tobytes())
+        snapshot_file.truncate(data_start + offset)
+    os.replace(temp_path, path)
+
+
+def read_snapshot_header(path: str) -> Dict[str, Any]:
+    """
+    Read a snapshot's header without mapping its arrays.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        Header dictionary, including graph_version and storage_version
+
+    Raises:
+        SnapshotFormatError: If the file is not a supported snapshot
+    """
+    with open(path, "rb") as snapshot_file:
+        magic = snapshot_file.read(len(SNAPSHOT_MAGIC))
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotFormatError(f"{path} is not a graph snapshot")
+        (header_length,) = struct.unpack("<I", snapshot_file.read(4))
+        header = json.loads(snapshot_file.read(header_length).decode("utf-8"))
+
+    if header.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotFormatError(
+            f"Unsupported snapshot format version {header.get('format_version')}"
+        )
+    prefix_length = len(SNAPSHOT_MAGIC) + 4 + header_length
+    header["data_start"] = -(-prefix_length // ARRAY_ALIGNMENT) * ARRAY_ALIGNMENT
+    return header
+
+
+def load_snapshot(path: str) -> Tuple[CompactGraph, Dict[str, Any]]:
+    """
+    Map a snapshot file and build a CompactGraph over it.
+
+    Every array, including the per-topic fields and the ID index, is a
+    read-only view into the mapped file; topics are built lazily (see
+    MappedTopics).
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        Tuple of (CompactGraph, header dictionary)
+
+    Raises:
+        SnapshotFormatError: If the file is not a supported snapshot
+    """
+    header = read_snapshot_header(path)
+    mapped = np.memmap(path, dtype=np.uint8, mode="r")
+    data_start = header["data_start"]
+
+    arrays: Dict[str, np.ndarray] = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        start = data_start + spec["offset"]
+        arrays[name] = mapped[start:start + count * dtype.itemsize].view(dtype).reshape(spec["shape"])
+
+    graph = CompactGraph(
+        version=header["graph_version"],
+        topics=MappedTopics(arrays),
+        prereq_offsets=arrays["prereq_offsets"],
+        prereq_indices=arrays["prereq_indices"],
+        prereq_thresholds=arrays["prereq_thresholds"],
+        dependent_offsets=arrays["dependent_offsets"],
+        dependent_indices=arrays["dependent_indices"],
+        topological_order=arrays["topological_order"],
+        levels=arrays["levels"],
+        descendant_counts=arrays["descendant_counts"],
+        downstream_impact=arrays["downstream_impact"],
+        topic_ids=arrays["topic_ids"],
+        id_index=(arrays["sorted_topic_ids"], arrays["id_positions"]),
+        parent_positions=arrays["parent_positions"],
+        exam_weightage=arrays["exam_weightage"],
+        estimated_hours=arrays["estimated_hours"]
+    )
+    return graph, header
@@ -0,0 +1,229 @@
+"""
+Incremental recommendation ranking for the progress-update path.
+
+A quiz submission changes one concept's mastery. Instead of refetching and
+rescoring every tracked concept, the per-student state below keeps the ranked
+scores and unmet-prerequisite counters, recomputes only the changed concept
+and its direct dependents, and patches the ranking in place.
+
+Another container may write the same student's progress in between, so each
+state carries the per-student progress version it was built at. Every mastery
+write bumps that version once; an update whose version is not the next one
+means the state missed a write and must be rebuilt.
+"""
+
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from concept_catalog import CatalogSnapshot
+
+
+# Prerequisite mastery below this blocks a concept; below URGENCY_THRESHOLD adds urgency
+BLOCKING_THRESHOLD = 50
+URGENCY_THRESHOLD = 70
+
+
+class IncrementalRecommendationState:
+    """
+    Ranked recommendation state for one student.
+
+    Only concepts the student has progress on are ranked, matching the full
+    recompute in lambda_function.generate_recommendations. Ties keep the
+    progress table's concept_id order.
+    """
+
+    def __init__(
+        self,
+        mastery_lookup: Dict[str, int],
+        catalog: CatalogSnapshot,
+        score_fn: Callable[[int, int, int], Any],
+        progress_version: Optional[int] = None
+    ):
+        """
+        Build the state with one full pass over the tracked concepts.
+
+        Args:
+            mastery_lookup: Dictionary mapping concept ID to mastery score
+            catalog: Catalog snapshot providing weights, prerequisites and dependents
+            score_fn: Priority function taking (mastery, exam_weight, dependency_urgency)
+            progress_version: Student's progress version, read before mastery_lookup
+        """
+        self.catalog = catalog
+        self.score_fn = score_fn
+        self.progress_version = progress_version
+        self.mastery: Dict[str, int] = dict(mastery_lookup)
+        self.created_at = time.time()
+
+        self.unmet_prerequisites: Dict[str, int] = {}
+        self.dependency_urgency: Dict[str, int] = {}
+        self.scores: Dict[str, Any] = {}
+        self._ranking: List[Tuple[Any, str]] = []
+
+        for concept_id in self.mastery:
+            self._recompute(concept_id)
+        self._ranking = sorted(
+            entry for entry in map(self._rank_entry, self.mastery) if entry is not None
+        )
+
+    def _recompute(self, concept_id: str) -> None:
+        """Recompute unmet-prerequisite counter, urgency and score for one concept."""
+        concept = self.catalog.get(concept_id) or {}
+        exam_weight = int(concept.get("exam_weight", 5))
+
+        unmet = 0
+        urgency = 0
+        for prereq in concept.get("prerequisites", []):
+            prereq_mastery = self.mastery.get(prereq, 0)
+            if prereq_mastery < BLOCKING_THRESHOLD:
+                unmet += 1
+            if prereq_mastery < URGENCY_THRESHOLD:
+                urgency += URGENCY_THRESHOLD - prereq_mastery
+
+        self.unmet_prerequisites[concept_id] = unmet
+        self.dependency_urgency[concept_id] = urgency
+        self.scores[concept_id] = self.score_fn(self.mastery[concept_id], exam_weight, urgency)
+
+    def _rank_entry(self, concept_id: str) -> Optional[Tuple[Any, str]]:
+        """Get the ranking entry for a concept, or None if it is blocked or unscored."""
+        if concept_id not in self.scores or self.unmet_prerequisites[concept_id]:
+            return None
+        return (-self.scores[concept_id], concept_id)
+
+    def _rerank(self, concept_id: str) -> None:
+        """Recompute one concept and move it to its new position in the ranking."""
+        old_entry = self._rank_entry(concept_id)
+        if old_entry is not None:
+            position = bisect_left(self._ranking, old_entry)
+            if position < len(self._ranking) and self._ranking[position] == old_entry:
+                del self._ranking[position]
+
+        self._recompute(concept_id)
+
+        new_entry = self._rank_entry(concept_id)
+        if new_entry is not None:
+            insort(self._ranking, new_entry)
+
+    def apply_mastery_update(
+        self,
+        concept_id: str,
+        new_mastery: int,
+        previous_mastery: Optional[int] = None,
+        progress_version: Optional[int] = None
+    ) -> bool:
+        """
+        Apply one concept's new mastery and patch the ranking.
+
+        Args:
+            concept_id: Concept whose mastery changed
+            new_mastery: New mastery score
+            previous_mastery: Mastery stored before the update
+            progress_version: Student's progress version after this write
+
+        Returns:
+            True if the update was applied, False if the state is stale and
+            must be rebuilt
+        """
+        if previous_mastery is not None and self.mastery.get(concept_id, 0) != previous_mastery:
+            return False
+        if self.progress_version is not None or progress_version is not None:
+            # A gap means another process wrote progress this state never saw,
+            # possibly for other concepts; a missing version cannot be trusted
+            if self.progress_version is None or progress_version != self.progress_version + 1:
+                return False
+            self.progress_version = progress_version
+
+        self.mastery[concept_id] = new_mastery
+        self._rerank(concept_id)
+
+        # Direct dependents see a different prerequisite mastery
+        for dependent_id in self.catalog.dependency_index.get_dependents(concept_id):
+            if dependent_id in self.mastery:
+                self._rerank(dependent_id)
+
+        return True
+
+    def ranked(self) -> List[Dict[str, Any]]:
+        """
+        Get the current ranking as recommendation dicts.
+
+        Returns:
+            List of recommendations sorted by priority (descending)
+        """
+        recommendations = []
+        for _, concept_id in self._ranking:
+            concept = self.catalog.get(concept_id) or {}
+            exam_weight = int(concept.get("exam_weight", 5))
+            recommendations.append({
+                "concept_id": concept_id,
+                "priority_score": self.scores[concept_id],
+                "reason": f"Mastery {self.mastery[concept_id]}, Weight {exam_weight}",
+            })
+        return recommendations
+
+
+class RecommendationStateStore:
+    """
+    Bounded per-process store of incremental states keyed by student.
+
+    States expire after a TTL and whenever the catalog version changes, which
+    bounds how long a warm container can serve a state built from old data.
+    """
+
+    def __init__(self, max_students: int = 1000, ttl_seconds: float = 300.0):
+        """
+        Initialize the store.
+
+        Args:
+            max_students: Maximum number of states kept (LRU eviction)
+            ttl_seconds: Maximum age of a state in seconds
+        """
+        self.max_students = max_students
+        self.ttl_seconds = ttl_seconds
+        self._states: "OrderedDict[str, IncrementalRecommendationState]" = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, student_id: str, catalog_version: str) -> Optional[IncrementalRecommendationState]:
+        """
+        Get a fresh state for a student.
+
+        Args:
+            student_id: Student identifier
+            catalog_version: Current catalog version
+
+        Returns:
+            The state, or None if missing, expired or built on another catalog version
+        """
+        with self.lock:
+            state = self._states.get(student_id)
+            if state is None:
+                return None
+            if (
+                time.time() - state.created_at >= self.ttl_seconds
+                or state.catalog.version != catalog_version
+            ):
+                del self._states[student_id]
+                return None
+            self._states.move_to_end(student_id)
+            return state
+
+    def put(self, student_id: str, state: IncrementalRecommendationState) -> None:
+        """
+        Store a state, evicting the least recently used one if full.
+
+        Args:
+            student_id: Student identifier
+            state: State to store
+        """
+        with self.lock:
+            self._states[student_id] = state
+            self._states.move_to_end(student_id)
+            while len(self._states) > self.max_students:
+                self._states.popitem(last=False)
+
+    def discard(self, student_id: str) -> None:
+        """Drop a student's state."""
+        with self.lock:
+            self._states.pop(student_id, None)
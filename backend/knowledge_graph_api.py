@@ -6,6 +6,7 @@ and the knowledge graph structure.
 """
 
 import json
+import os
 from typing import Dict, Any, Optional
 from knowledge_graph_manager import (
     KnowledgeGraphManager,
@@ -13,6 +14,15 @@ from knowledge_graph_manager import (
     InvalidWeightageError,
     InvalidStudyTimeError
 )
+from snapshot_builder import SnapshotBuilder
+from write_behind_storage import WriteBehindStorage
+
+
+# Graph snapshot shared by the workers on a host (unset disables snapshots)
+KNOWLEDGE_GRAPH_SNAPSHOT_PATH = os.environ.get("KNOWLEDGE_GRAPH_SNAPSHOT_PATH")
+
+# Set on the one process that keeps the snapshot current
+KNOWLEDGE_GRAPH_SNAPSHOT_BUILDER = os.environ.get("KNOWLEDGE_GRAPH_SNAPSHOT_BUILDER", "").lower() in ("1", "true", "yes")
 
 
 class KnowledgeGraphAPI:
@@ -232,6 +242,95 @@ class KnowledgeGraphAPI:
         except Exception as e:
             return self._error_response(500, f"Failed to retrieve unlockable topics: {str(e)}")
     
+    def handle_get_unlockable_topics_batch(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST /api/topics/unlockable - Get unlockable topics for many students.
+        
+        The body is {"student_ids": [...]}.
+        
+        Args:
+            event: API Gateway event with student IDs in body
+        
+        Returns:
+            Response with unlockable topic IDs per student
+        """
+        try:
+            # Parse request body
+            body = event.get("body", "{}")
+            if isinstance(body, str):
+                body = json.loads(body)
+            
+            student_ids = body.get("student_ids")
+            if not isinstance(student_ids, list) or not student_ids:
+                return self._error_response(400, "student_ids must be a non-empty list")
+            
+            try:
+                student_ids = [int(student_id) for student_id in student_ids]
+            except (TypeError, ValueError):
+                return self._error_response(400, "student_ids must be integers")
+            
+            unlockable = self.manager.get_unlockable_topics_batch(student_ids)
+            
+            students_data = {
+                str(student_id): {
+                    "unlockable_topic_ids": [topic.id for topic in topics],
+                    "count": len(topics)
+                }
+                for student_id, topics in unlockable.items()
+            }
+            
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Content-Type": "application/json",
+                    "Access-Control-Allow-Origin": "*"
+                },
+                "body": json.dumps({
+                    "students": students_data,
+                    "count": len(students_data)
+                })
+            }
+        except json.JSONDecodeError:
+            return self._error_response(400, "Invalid JSON in request body")
+        except Exception as e:
+            return self._error_response(500, f"Failed to retrieve unlockable topics: {str(e)}")
+    
+    def handle_get_changes(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        GET /api/topics/changes?since={version}&epoch={epoch} - Get graph changes for client sync.
+        
+        Clients send back both the version and the epoch from their last sync.
+        
+        Args:
+            event: API Gateway event with optional "since" and "epoch" query parameters
+        
+        Returns:
+            Response with the collapsed changes since the version, or the full
+            graph when the version is missing, too old or from another epoch
+        """
+        try:
+            query_params = event.get("queryStringParameters") or {}
+            since = query_params.get("since")
+            
+            if since is not None:
+                try:
+                    since = int(since)
+                except ValueError:
+                    return self._error_response(400, "since must be an integer")
+            
+            changes = self.manager.get_changes_since(since, query_params.get("epoch"))
+            
+            return {
+                "statusCode": 200,
+                "headers": {
+                    "Content-Type": "application/json",
+                    "Access-Control-Allow-Origin": "*"
+                },
+                "body": json.dumps(changes)
+            }
+        except Exception as e:
+            return self._error_response(500, f"Failed to retrieve changes: {str(e)}")
+    
     def handle_create_topic(self, event: Dict[str, Any]) -> Dict[str, Any]:
         """
         POST /api/topics - Create a new topic.
@@ -304,6 +403,74 @@ class KnowledgeGraphAPI:
         except Exception as e:
             return self._error_response(500, f"Failed to create topic: {str(e)}")
     
+    def handle_bulk_import_topics(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST /api/topics/bulk - Import many topics in one request.
+        
+        The body is {"topics": [...]} with records in any order; records can
+        reference each other through an optional "key" field.
+        
+        Args:
+            event: API Gateway event with topic records in body
+        
+        Returns:
+            Response with created topics in request order
+        """
+        try:
+            # Parse request body
+            body = event.get("body", "{}")
+            if isinstance(body, str):
+                body = json.loads(body)
+            
+            records = body.get("topics")
+            if not isinstance(records, list) or not records:
+                return self._error_response(400, "topics must be a non-empty list")
+            
+            topics = self.manager.import_topics_bulk(records)
+            
+            topics_data = [
+                {
+                    "key": record.get("key"),
+                    "id": topic.id,
+                    "name": topic.name,
+                    "parent_id": topic.parent_id,
+                    "exam_weightage": topic.exam_weightage,
+                    "estimated_hours": topic.estimated_hours,
+                    "description": topic.description,
+                    "created_at": topic.created_at.isoformat()
+                }
+                for record, topic in zip(records, topics)
+            ]
+            
+            return {
+                "statusCode": 201,
+                "headers": {
+                    "Content-Type": "application/json",
+                    "Access-Control-Allow-Origin": "*"
+                },
+                "body": json.dumps({
+                    "topics": topics_data,
+                    "count": len(topics_data)
+                })
+            }
+        except InvalidWeightageError as e:
+            return self._error_response(400, str(e))
+        except InvalidStudyTimeError as e:
+            return self._error_response(400, str(e))
+        except CircularDependencyError as e:
+            response = self._error_response(400, str(e))
+            response["body"] = json.dumps({
+                "error": str(e),
+                "edges": [list(edge) for edge in e.edges]
+            })
+            return response
+        except json.JSONDecodeError:
+            return self._error_response(400, "Invalid JSON in request body")
+        except (ValueError, TypeError) as e:
+            return self._error_response(400, str(e))
+        except Exception as e:
+            return self._error_response(500, f"Failed to import topics: {str(e)}")
+    
     def _error_response(self, status_code: int, message: str) -> Dict[str, Any]:
         """
         Create an error response.
@@ -327,24 +494,71 @@ class KnowledgeGraphAPI:
         }
 
 
-def create_knowledge_graph_handler(manager: KnowledgeGraphManager):
+def create_knowledge_graph_handler(
+    manager: KnowledgeGraphManager,
+    write_behind: bool = True,
+    snapshot_path: Optional[str] = KNOWLEDGE_GRAPH_SNAPSHOT_PATH,
+    build_snapshot: bool = KNOWLEDGE_GRAPH_SNAPSHOT_BUILDER
+):
     """
     Create a handler function for knowledge graph API endpoints.
     
+    With write_behind, the manager's storage is wrapped in WriteBehindStorage
+    so an invocation's topic and edge writes are coalesced and sent in
+    batches. The buffer is flushed before every response, since a frozen
+    Lambda container never runs the background timer; a failed flush turns
+    the response into a 500 and the rows are retried on the next invocation.
+    
+    With a snapshot_path, a worker whose manager is still empty maps the
+    snapshot at startup instead of rebuilding the graph, provided it matches
+    the storage graph version. With build_snapshot as well, this process
+    keeps the snapshot current: a request that changes the graph schedules a
+    background rebuild (see snapshot_builder.SnapshotBuilder). Enable it on
+    one long-running process that applies the edits, not on every worker.
+    
     Args:
         manager: KnowledgeGraphManager instance
+        write_behind: Buffer storage writes within each invocation
+        snapshot_path: Snapshot file to load at startup
+        build_snapshot: Rebuild the snapshot in the background after changes
     
     Returns:
         Handler function for API Gateway events
     """
+    if write_behind and manager.storage is not None and not isinstance(manager.storage, WriteBehindStorage):
+        manager.storage = WriteBehindStorage(manager.storage, flush_interval=0)
+    if snapshot_path and manager.version == 0:
+        manager.load_snapshot(snapshot_path)
+    builder = SnapshotBuilder(manager, snapshot_path) if snapshot_path and build_snapshot else None
     api = KnowledgeGraphAPI(manager)
     
     def handler(event, context):
         """
         Main handler for knowledge graph API endpoints.
         
-        Routes requests to appropriate handlers based on path and method.
+        Routes the request, then flushes buffered storage writes.
         """
+        if builder is None:
+            return handle(event)
+        
+        with builder.lock:
+            version = manager.version
+            response = handle(event)
+        if manager.version != version:
+            builder.request()
+        return response
+    
+    def handle(event):
+        """Route the request and flush its buffered storage writes."""
+        response = route(event)
+        try:
+            manager.flush()
+        except Exception as e:
+            return api._error_response(500, f"Failed to persist changes: {str(e)}")
+        return response
+    
+    def route(event):
+        """Route a request to the appropriate handler based on path and method."""
         path = event.get("rawPath", event.get("path", ""))
         method = event.get("requestContext", {}).get("http", {}).get("method", 
                  event.get("httpMethod", "GET"))
@@ -354,8 +568,14 @@ def create_knowledge_graph_handler(manager: KnowledgeGraphManager):
             return api.handle_get_topics(event)
         elif path == "/api/topics" and method == "POST":
             return api.handle_create_topic(event)
+        elif path == "/api/topics/bulk" and method == "POST":
+            return api.handle_bulk_import_topics(event)
         elif path.startswith("/api/topics/") and "/prerequisites" in path and method == "GET":
             return api.handle_get_prerequisites(event)
+        elif path == "/api/topics/changes" and method == "GET":
+            return api.handle_get_changes(event)
+        elif path == "/api/topics/unlockable" and method == "POST":
+            return api.handle_get_unlockable_topics_batch(event)
         elif path.startswith("/api/topics/unlockable/") and method == "GET":
             return api.handle_get_unlockable_topics(event)
         elif path.startswith("/api/topics/") and method == "GET":
@@ -6,14 +6,27 @@ It ensures the knowledge graph maintains a Directed Acyclic Graph (DAG) structur
 to prevent circular dependencies.
 """
 
-from typing import List, Optional, Dict, Set
+import uuid
+from collections import deque
+from typing import Any, List, Optional, Dict, Set, Tuple
 from datetime import datetime
+import numpy as np
 from models import Topic, TopicPrerequisite, TopicTree
+from compact_graph import CompactGraph
+from graph_snapshot import SnapshotFormatError, load_snapshot, read_snapshot_header, save_snapshot
 
 
 class CircularDependencyError(Exception):
-    """Raised when a circular dependency is detected in the knowledge graph."""
-    pass
+    """
+    Raised when a circular dependency is detected in the knowledge graph.
+    
+    Attributes:
+        edges: Offending (from, to) edges, when known
+    """
+    
+    def __init__(self, message: str, edges: Optional[List[Tuple[Any, Any]]] = None):
+        super().__init__(message)
+        self.edges = edges or []
 
 
 class InvalidWeightageError(Exception):
@@ -36,18 +49,49 @@ class KnowledgeGraphManager:
     - Multiple levels of hierarchy are supported (Subject → Chapter → Topic → Concept)
     """
     
-    def __init__(self, storage_backend=None):
+    def __init__(
+        self,
+        storage_backend=None,
+        change_log_size: int = 10000
+    ):
         """
         Initialize the Knowledge Graph Manager.
         
         Args:
             storage_backend: Optional storage backend for persistence (DynamoDB, PostgreSQL, etc.)
+            change_log_size: Number of topic/edge changes kept for incremental client sync
         """
         self.storage = storage_backend
         self._topics: Dict[int, Topic] = {}
         self._prerequisites: Dict[int, List[int]] = {}  # topic_id -> list of prerequisite topic_ids
         self._dependents: Dict[int, List[int]] = {}  # topic_id -> list of dependent topic_ids
         self._prerequisite_thresholds: Dict[tuple, float] = {}  # (topic_id, prereq_id) -> threshold
+        
+        # Reachability index: each topic gets a bit, and _ancestors[topic_id] is the
+        # bitset of every topic it transitively depends on
+        self._topic_bits: Dict[int, int] = {}  # topic_id -> single-bit mask
+        self._ancestors: Dict[int, int] = {}  # topic_id -> bitset of transitive prerequisites
+        
+        # Bumped on every change. Point reads use the dicts above; whole-graph
+        # queries use a CompactGraph built lazily for the current version and
+        # dropped on the next change, so the two copies only coexist between
+        # a whole-graph read and the following write
+        self._version = 0
+        self._compact: Optional[CompactGraph] = None
+        
+        # Versions count from 0 per process and restart after a restart or
+        # snapshot load, so a version only identifies a graph together with
+        # the epoch it was issued under
+        self._epoch = uuid.uuid4().hex
+        
+        # True after load_snapshot until the dict-based state is rebuilt for a write
+        self._frozen = False
+        
+        # Bounded log of (version, kind, payload) changes; every change after
+        # _change_log_floor is still in the log
+        self.change_log_size = max(1, change_log_size)
+        self._change_log: deque = deque()
+        self._change_log_floor = 0
     
     def create_topic(
         self,
@@ -77,9 +121,13 @@ class KnowledgeGraphManager:
         Raises:
             InvalidWeightageError: If weightage is not between 0 and 100
             InvalidStudyTimeError: If estimated_hours is not positive
-            CircularDependencyError: If adding prerequisites would create a cycle
-            ValueError: If parent_id or prerequisite IDs don't exist
+            CircularDependencyError: If adding prerequisites would create a cycle,
+                or if redefining a topic would make it its own ancestor
+            ValueError: If parent_id or prerequisite IDs don't exist, or if a
+                redefinition drops edges the storage backend cannot delete
         """
+        self._ensure_mutable()
+        
         # Validate weightage
         if not (0 <= weightage <= 100):
             raise InvalidWeightageError(
@@ -109,6 +157,21 @@ class KnowledgeGraphManager:
         if prerequisites:
             self._validate_no_cycles(topic_id, prerequisites)
         
+        redefined = topic_id in self._topics
+        if redefined:
+            self._validate_parent_chain(topic_id, parent_id)
+            removed_prereq_ids = [
+                old_prereq_id for old_prereq_id in self._prerequisites.get(topic_id, [])
+                if old_prereq_id not in prerequisites
+            ]
+            if removed_prereq_ids and self.storage:
+                if not hasattr(self.storage, "delete_prerequisite"):
+                    raise ValueError(
+                        f"Cannot redefine topic {topic_id}: the storage backend cannot delete prerequisites"
+                    )
+                for old_prereq_id in removed_prereq_ids:
+                    self.storage.delete_prerequisite(topic_id, old_prereq_id)
+        
         # Create the topic
         topic = Topic(
             id=topic_id,
@@ -120,6 +183,16 @@ class KnowledgeGraphManager:
             created_at=datetime.utcnow()
         )
         
+        # Redefining a topic drops its old prerequisite edges
+        if redefined:
+            for old_prereq_id in self._prerequisites.get(topic_id, []):
+                dependents = self._dependents.get(old_prereq_id, [])
+                if topic_id in dependents:
+                    dependents.remove(topic_id)
+                self._prerequisite_thresholds.pop((topic_id, old_prereq_id), None)
+            for old_prereq_id in removed_prereq_ids:
+                self._log_change("edge_removed", (topic_id, old_prereq_id))
+        
         # Store the topic
         self._topics[topic_id] = topic
         self._prerequisites[topic_id] = prerequisites.copy()
@@ -134,6 +207,16 @@ class KnowledgeGraphManager:
         for prereq_id in prerequisites:
             self._prerequisite_thresholds[(topic_id, prereq_id)] = 60.0
         
+        # Update reachability index
+        if redefined:
+            self._reindex_descendants(topic_id)
+        else:
+            self._index_topic(topic_id)
+        self._log_change("topic", topic)
+        for prereq_id in prerequisites:
+            self._log_change("edge_added", (topic_id, prereq_id, 60.0))
+        self._advance_version()
+        
         # Persist to storage if available
         if self.storage:
             self.storage.save_topic(topic)
@@ -142,11 +225,278 @@ class KnowledgeGraphManager:
         
         return topic
     
+    def import_topics_bulk(self, records: List[Dict[str, Any]]) -> List[Topic]:
+        """
+        Create many topics in one call.
+        
+        Records may arrive in any order. Each record has the same fields as the
+        create topic API (name, parent_id, prerequisites, exam_weightage,
+        estimated_hours, description, optional topic_id) plus an optional "key".
+        parent_id and prerequisites may refer to existing topic IDs or to the
+        key (or topic_id) of another record in the batch; batch references
+        take precedence.
+        
+        The whole batch is validated before anything is stored: weightage and
+        hours are checked for every record at once, and a single topological
+        sort finds all edges that take part in a cycle.
+        
+        Args:
+            records: Topic records to import
+        
+        Returns:
+            Created Topic objects, in the same order as records
+        
+        Raises:
+            InvalidWeightageError: If any weightage is not between 0 and 100
+            InvalidStudyTimeError: If any estimated_hours is not positive
+            CircularDependencyError: If the batch contains cycles (see .edges)
+            ValueError: If a record is incomplete, a key or ID is duplicated,
+                or a reference cannot be resolved
+        """
+        if not records:
+            return []
+        self._ensure_mutable()
+        
+        # Required fields
+        for index, record in enumerate(records):
+            missing = [
+                field for field in ("name", "exam_weightage", "estimated_hours")
+                if record.get(field) is None
+            ]
+            if missing:
+                raise ValueError(f"Record {index} is missing {', '.join(missing)}")
+        
+        # Validate weightage and study time for the whole batch
+        weightages = np.array([float(record["exam_weightage"]) for record in records])
+        hours = np.array([float(record["estimated_hours"]) for record in records])
+        
+        invalid = np.flatnonzero(~((weightages >= 0) & (weightages <= 100)))
+        if invalid.size:
+            raise InvalidWeightageError(
+                "Exam weightage must be between 0 and 100, got "
+                + ", ".join(f"{weightages[i]} (record {i})" for i in invalid)
+            )
+        
+        invalid = np.flatnonzero(~(hours > 0))
+        if invalid.size:
+            raise InvalidStudyTimeError(
+                "Estimated study time must be positive, got "
+                + ", ".join(f"{hours[i]} (record {i})" for i in invalid)
+            )
+        
+        # Assign IDs: explicit topic_id, otherwise the next free integer
+        explicit_ids = [record.get("topic_id") for record in records]
+        taken = set(self._topics)
+        for index, topic_id in enumerate(explicit_ids):
+            if topic_id is None:
+                continue
+            if topic_id in taken:
+                raise ValueError(f"Topic with ID {topic_id} already exists (record {index})")
+            taken.add(topic_id)
+        
+        next_id = max(taken, default=0) + 1
+        topic_ids: List[int] = []
+        for topic_id in explicit_ids:
+            if topic_id is None:
+                topic_id = next_id
+                next_id += 1
+            topic_ids.append(topic_id)
+        
+        # Batch references: record key, or its explicit topic_id
+        key_to_index: Dict[Any, int] = {}
+        for index, record in enumerate(records):
+            for ref in {record.get("key"), record.get("topic_id")} - {None}:
+                if ref in key_to_index:
+                    raise ValueError(f"Duplicate key {ref} in batch (record {index})")
+                key_to_index[ref] = index
+        
+        def resolve(ref: Any, index: int, role: str) -> Tuple[Optional[int], int]:
+            """Resolve a reference to (batch index or None, topic ID)."""
+            if ref in key_to_index:
+                return key_to_index[ref], topic_ids[key_to_index[ref]]
+            if ref in self._topics:
+                return None, ref
+            raise ValueError(f"{role} topic with ID {ref} does not exist (record {index})")
+        
+        parent_ids: List[Optional[int]] = []
+        prereq_ids: List[List[int]] = []
+        # Edges between batch records: (from index, to index); parents come before children
+        edges: List[Tuple[int, int]] = []
+        for index, record in enumerate(records):
+            parent_id = None
+            if record.get("parent_id") is not None:
+                parent_index, parent_id = resolve(record["parent_id"], index, "Parent")
+                if parent_index is not None:
+                    edges.append((parent_index, index))
+            parent_ids.append(parent_id)
+            
+            resolved = []
+            for ref in record.get("prerequisites", []):
+                prereq_index, prereq_id = resolve(ref, index, "Prerequisite")
+                if prereq_index is not None:
+                    edges.append((prereq_index, index))
+                resolved.append(prereq_id)
+            prereq_ids.append(resolved)
+        
+        order = self._topological_order(len(records), edges)
+        if len(order) < len(records):
+            cycle_edges = [
+                (topic_ids[source], topic_ids[target])
+                for source, target in self._cycle_edges(len(records), edges, set(order))
+            ]
+            raise CircularDependencyError(
+                "Import would create cycles through edges "
+                + ", ".join(f"{source} -> {target}" for source, target in cycle_edges),
+                edges=cycle_edges
+            )
+        
+        # Apply to the in-memory graph in dependency order
+        created_at = datetime.utcnow()
+        topics: List[Optional[Topic]] = [None] * len(records)
+        for index in order:
+            record = records[index]
+            topic_id = topic_ids[index]
+            topic = Topic(
+                id=topic_id,
+                name=record["name"],
+                parent_id=parent_ids[index],
+                exam_weightage=float(weightages[index]),
+                estimated_hours=float(hours[index]),
+                description=record.get("description", ""),
+                created_at=created_at
+            )
+            topics[index] = topic
+            
+            self._topics[topic_id] = topic
+            self._prerequisites[topic_id] = prereq_ids[index]
+            for prereq_id in prereq_ids[index]:
+                self._dependents.setdefault(prereq_id, []).append(topic_id)
+                self._prerequisite_thresholds[(topic_id, prereq_id)] = 60.0
+            self._index_topic(topic_id)
+            self._log_change("topic", topic)
+            for prereq_id in prereq_ids[index]:
+                self._log_change("edge_added", (topic_id, prereq_id, 60.0))
+        self._advance_version()
+        
+        # Persist with batched writes when the storage backend supports them
+        if self.storage:
+            ordered_topics = [topics[index] for index in order]
+            prerequisite_rows = [
+                (topic_ids[index], prereq_id, 60.0)
+                for index in order
+                for prereq_id in prereq_ids[index]
+            ]
+            if hasattr(self.storage, "save_topics"):
+                self.storage.save_topics(ordered_topics)
+            else:
+                for topic in ordered_topics:
+                    self.storage.save_topic(topic)
+            if hasattr(self.storage, "save_prerequisites"):
+                self.storage.save_prerequisites(prerequisite_rows)
+            else:
+                for topic_id, prereq_id, threshold in prerequisite_rows:
+                    self.storage.save_prerequisite(topic_id, prereq_id, threshold)
+        
+        return topics
+    
+    @staticmethod
+    def _topological_order(node_count: int, edges: List[Tuple[int, int]]) -> List[int]:
+        """
+        Order nodes so every edge points forward (Kahn's algorithm).
+        
+        Args:
+            node_count: Number of nodes, labelled 0..node_count-1
+            edges: (from, to) edges
+        
+        Returns:
+            Topological order; shorter than node_count if the graph has cycles
+        """
+        successors: List[List[int]] = [[] for _ in range(node_count)]
+        in_degree = [0] * node_count
+        for source, target in edges:
+            successors[source].append(target)
+            in_degree[target] += 1
+        
+        order = [node for node in range(node_count) if in_degree[node] == 0]
+        for node in order:
+            for successor in successors[node]:
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    order.append(successor)
+        return order
+    
+    @staticmethod
+    def _cycle_edges(
+        node_count: int,
+        edges: List[Tuple[int, int]],
+        acyclic: Set[int]
+    ) -> List[Tuple[int, int]]:
+        """
+        Find the edges that lie on a cycle.
+        
+        Only nodes Kahn's algorithm could not order are examined. An edge is on
+        a cycle when both ends are in the same strongly connected component.
+        
+        Args:
+            node_count: Number of nodes, labelled 0..node_count-1
+            edges: (from, to) edges
+            acyclic: Nodes already placed in topological order
+        
+        Returns:
+            Edges on a cycle, in input order
+        """
+        remaining = [node for node in range(node_count) if node not in acyclic]
+        remaining_set = set(remaining)
+        successors: Dict[int, List[int]] = {node: [] for node in remaining}
+        predecessors: Dict[int, List[int]] = {node: [] for node in remaining}
+        for source, target in edges:
+            if source in remaining_set and target in remaining_set:
+                successors[source].append(target)
+                predecessors[target].append(source)
+        
+        # Kosaraju: record finish order on the graph, then label components on its reverse
+        finished: List[int] = []
+        visited: Set[int] = set()
+        for start in remaining:
+            if start in visited:
+                continue
+            visited.add(start)
+            stack = [(start, iter(successors[start]))]
+            while stack:
+                node, successors_iter = stack[-1]
+                for successor in successors_iter:
+                    if successor not in visited:
+                        visited.add(successor)
+                        stack.append((successor, iter(successors[successor])))
+                        break
+                else:
+                    finished.append(node)
+                    stack.pop()
+        
+        component: Dict[int, int] = {}
+        for start in reversed(finished):
+            if start in component:
+                continue
+            component[start] = start
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                for predecessor in predecessors[node]:
+                    if predecessor not in component:
+                        component[predecessor] = start
+                        stack.append(predecessor)
+        
+        return [
+            (source, target) for source, target in edges
+            if source in component and component.get(target) == component[source]
+        ]
+    
     def _validate_no_cycles(self, topic_id: int, prerequisites: List[int]) -> None:
         """
         Validate that adding prerequisites won't create a cycle.
         
-        Uses depth-first search to detect cycles.
+        Uses the reachability index, so each prerequisite is checked with a
+        single bitset test instead of a graph walk.
         
         Args:
             topic_id: The topic that will have prerequisites
@@ -157,14 +507,37 @@ class KnowledgeGraphManager:
         """
         # For each prerequisite, check if topic_id is reachable from it
         for prereq_id in prerequisites:
-            if self._is_reachable(prereq_id, topic_id):
+            if prereq_id == topic_id or self._is_reachable(topic_id, prereq_id):
                 raise CircularDependencyError(
                     f"Adding prerequisite {prereq_id} to topic {topic_id} would create a cycle"
                 )
     
+    def _validate_parent_chain(self, topic_id: int, parent_id: Optional[int]) -> None:
+        """
+        Validate that giving an existing topic a new parent won't create a cycle.
+        
+        Args:
+            topic_id: The topic being redefined
+            parent_id: Its new parent ID
+        
+        Raises:
+            CircularDependencyError: If topic_id is parent_id or one of its ancestors
+        """
+        ancestor_id = parent_id
+        while ancestor_id is not None:
+            if ancestor_id == topic_id:
+                raise CircularDependencyError(
+                    f"Making {parent_id} the parent of topic {topic_id} would create a cycle",
+                    [(parent_id, topic_id)]
+                )
+            ancestor_id = self._topics[ancestor_id].parent_id
+    
     def _is_reachable(self, start_id: int, target_id: int) -> bool:
         """
-        Check if target_id is reachable from start_id following prerequisite edges.
+        Check if target_id is reachable from start_id following dependent edges.
+        
+        Equivalent to asking whether start_id is a transitive prerequisite of
+        target_id, which is one lookup in the ancestor bitsets.
         
         Args:
             start_id: Starting topic ID
@@ -173,49 +546,467 @@ class KnowledgeGraphManager:
         Returns:
             True if target_id is reachable from start_id, False otherwise
         """
-        # Don't consider a node reachable from itself at the start
-        # We want to check if there's a path through dependencies
-        if start_id == target_id:
-            # Check if there's a cycle back to itself
-            # by looking at dependents
-            pass
+        start_bit = self._topic_bits.get(start_id)
+        if start_bit is None:
+            return False
+        return bool(self._ancestors.get(target_id, 0) & start_bit)
+    
+    def _index_topic(self, topic_id: int) -> None:
+        """
+        Add a topic to the reachability index.
         
-        visited: Set[int] = set()
-        stack = [start_id]
+        A new topic has no dependents yet, so only its own ancestor set is computed.
+        
+        Args:
+            topic_id: ID of the topic whose prerequisites are already stored
+        """
+        if topic_id not in self._topic_bits:
+            self._topic_bits[topic_id] = 1 << len(self._topic_bits)
         
+        ancestors = 0
+        for prereq_id in self._prerequisites.get(topic_id, []):
+            ancestors |= self._topic_bits[prereq_id] | self._ancestors.get(prereq_id, 0)
+        self._ancestors[topic_id] = ancestors
+    
+    def _reindex_descendants(self, topic_id: int) -> None:
+        """
+        Recompute the ancestor bitsets of a redefined topic and its descendants.
+        
+        Only these sets can change when a topic's prerequisites change; they
+        are recomputed in topological order within the affected subgraph.
+        
+        Args:
+            topic_id: ID of the redefined topic
+        """
+        affected = {topic_id}
+        stack = [topic_id]
         while stack:
-            current = stack.pop()
-            if current in visited:
+            for dependent_id in self._dependents.get(stack.pop(), []):
+                if dependent_id not in affected:
+                    affected.add(dependent_id)
+                    stack.append(dependent_id)
+        
+        in_degree = {
+            affected_id: sum(1 for prereq_id in self._prerequisites.get(affected_id, []) if prereq_id in affected)
+            for affected_id in affected
+        }
+        order = [affected_id for affected_id, degree in in_degree.items() if degree == 0]
+        for affected_id in order:
+            self._index_topic(affected_id)
+            for dependent_id in self._dependents.get(affected_id, []):
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    order.append(dependent_id)
+    
+    def _rebuild_reachability(self) -> None:
+        """
+        Recompute every ancestor bitset in topological order.
+        
+        Used when the dict-based state is rebuilt from a loaded snapshot.
+        """
+        in_degree = {topic_id: 0 for topic_id in self._topics}
+        for topic_id, prereq_ids in self._prerequisites.items():
+            in_degree[topic_id] = len(prereq_ids)
+        
+        order = [topic_id for topic_id, degree in in_degree.items() if degree == 0]
+        for topic_id in order:
+            for dependent_id in self._dependents.get(topic_id, []):
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    order.append(dependent_id)
+        
+        self._ancestors = {}
+        for topic_id in order:
+            self._index_topic(topic_id)
+    
+    @property
+    def version(self) -> int:
+        """Graph version, incremented on every change."""
+        return self._version
+    
+    @property
+    def epoch(self) -> str:
+        """Identifier of the version sequence the current version belongs to."""
+        return self._epoch
+    
+    def _advance_version(self) -> None:
+        """Finish an edit: bump the version and release the now-stale compact graph."""
+        self._version += 1
+        self._compact = None
+    
+    def compact_graph(self) -> CompactGraph:
+        """
+        Get the read-only compact form of the current graph.
+        
+        The arrays are rebuilt lazily after a change and shared by every read
+        query until the next change.
+        
+        Returns:
+            CompactGraph for the current version
+        """
+        if self._compact is None or self._compact.version != self._version:
+            self._compact = CompactGraph.from_adjacency(
+                self._version,
+                self._topics,
+                self._prerequisites,
+                self._prerequisite_thresholds
+            )
+        return self._compact
+    
+    def flush(self) -> None:
+        """
+        Push any buffered writes to storage.
+        
+        Only needed when the storage backend buffers writes (see
+        write_behind_storage.WriteBehindStorage); otherwise a no-op.
+        """
+        if self.storage and hasattr(self.storage, "flush"):
+            self.storage.flush()
+    
+    def _log_change(self, kind: str, payload: Any) -> None:
+        """
+        Record a change made by the edit in progress (logged under the next version).
+        
+        Args:
+            kind: "topic", "edge_added" or "edge_removed"
+            payload: Topic, (topic_id, prereq_id, threshold) or (topic_id, prereq_id)
+        """
+        self._change_log.append((self._version + 1, kind, payload))
+        while len(self._change_log) > self.change_log_size:
+            evicted_version, _, _ = self._change_log.popleft()
+            self._change_log_floor = evicted_version
+    
+    def get_changes_since(
+        self,
+        since_version: Optional[int] = None,
+        epoch: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get what changed in the graph after a client's version.
+        
+        Repeated changes are collapsed: each topic appears once with its latest
+        data, and each edge once with its latest state. When the client's
+        version is older than the retained log, unknown, or from another
+        epoch (e.g. issued before a restart or by another worker), the full
+        graph is returned instead, marked with "full": true.
+        
+        Args:
+            since_version: Graph version the client last synced, or None
+            epoch: Epoch returned with that version, or None
+        
+        Returns:
+            JSON-ready dict with epoch, version, full, topics, edges_added
+            and edges_removed
+        """
+        if (
+            since_version is None
+            or epoch != self._epoch
+            or since_version < self._change_log_floor
+            or since_version > self._version
+        ):
+            return self._full_sync()
+        
+        topics: Dict[int, Topic] = {}
+        edges: Dict[Tuple[int, int], Optional[float]] = {}  # None marks a removal
+        for version, kind, payload in self._change_log:
+            if version <= since_version:
                 continue
-            visited.add(current)
-            
-            # Follow prerequisite edges (dependencies)
-            if current in self._dependents:
-                for dependent in self._dependents[current]:
-                    if dependent == target_id:
-                        return True
-                    if dependent not in visited:
-                        stack.append(dependent)
+            if kind == "topic":
+                topics.pop(payload.id, None)
+                topics[payload.id] = payload
+            elif kind == "edge_added":
+                topic_id, prereq_id, threshold = payload
+                edges.pop((topic_id, prereq_id), None)
+                edges[(topic_id, prereq_id)] = threshold
+            else:
+                edges.pop(payload, None)
+                edges[payload] = None
+        
+        return {
+            "epoch": self._epoch,
+            "version": self._version,
+            "full": False,
+            "topics": [self._topic_to_dict(topic) for topic in topics.values()],
+            "edges_added": [
+                [topic_id, prereq_id, threshold]
+                for (topic_id, prereq_id), threshold in edges.items()
+                if threshold is not None
+            ],
+            "edges_removed": [
+                [topic_id, prereq_id]
+                for (topic_id, prereq_id), threshold in edges.items()
+                if threshold is None
+            ]
+        }
+    
+    def _full_sync(self) -> Dict[str, Any]:
+        """Build a sync payload containing the whole graph."""
+        graph = self.compact_graph()
+        topic_ids = graph.topic_ids.tolist()
+        prereq_offsets = graph.prereq_offsets.tolist()
+        prereq_indices = graph.prereq_indices.tolist()
+        thresholds = graph.edge_thresholds().tolist()
+        
+        return {
+            "epoch": self._epoch,
+            "version": self._version,
+            "full": True,
+            "topics": [self._topic_to_dict(topic) for topic in graph.topics],
+            "edges_added": [
+                [topic_ids[position], topic_ids[prereq_indices[edge]], thresholds[edge]]
+                for position in range(len(topic_ids))
+                for edge in range(prereq_offsets[position], prereq_offsets[position + 1])
+            ],
+            "edges_removed": []
+        }
+    
+    @staticmethod
+    def _topic_to_dict(topic: Topic) -> Dict[str, Any]:
+        """Serialize a topic for sync payloads."""
+        return {
+            "id": topic.id,
+            "name": topic.name,
+            "parent_id": topic.parent_id,
+            "exam_weightage": topic.exam_weightage,
+            "estimated_hours": topic.estimated_hours,
+            "description": topic.description,
+            "created_at": topic.created_at.isoformat()
+        }
+    
+    def save_snapshot(self, path: str) -> None:
+        """
+        Write the current graph to a binary snapshot file.
+        
+        Buffered writes are flushed first, and the storage backend's graph
+        version is recorded so readers can tell whether the snapshot is stale.
+        The graph must be current with storage; snapshot_builder.SnapshotBuilder
+        does this off the request path in the one process that applies edits.
+        
+        Args:
+            path: Destination file path
+        
+        Raises:
+            ValueError: If the storage backend does not report a graph version
+        """
+        self.flush()
+        storage_version = self._storage_graph_version()
+        if storage_version is None:
+            raise ValueError("Storage backend does not report a graph version")
+        save_snapshot(self.compact_graph(), path, storage_version=storage_version)
+    
+    def load_snapshot(self, path: str) -> bool:
+        """
+        Replace the in-memory graph with a memory-mapped snapshot.
+        
+        Read queries run straight off the mapped arrays. The dict-based state
+        used for edits is only rebuilt if the graph is modified afterwards.
+        
+        Args:
+            path: Snapshot file path
+        
+        Returns:
+            True if loaded, False if the file is missing or in an older format,
+            or if storage has no graph version or a different one
+        """
+        storage_version = self._storage_graph_version()
+        if storage_version is None:
+            return False
+        
+        try:
+            header = read_snapshot_header(path)
+        except (FileNotFoundError, SnapshotFormatError):
+            return False
+        
+        if str(header.get("storage_version")) != str(storage_version):
+            return False
+        
+        graph, _ = load_snapshot(path)
+        self._topics = {}
+        self._prerequisites = {}
+        self._dependents = {}
+        self._prerequisite_thresholds = {}
+        self._topic_bits = {}
+        self._ancestors = {}
+        self._compact = graph
+        self._version = graph.version
+        self._frozen = True
+        
+        # Changes before the snapshot are unknown; every client gets a full sync
+        self._epoch = uuid.uuid4().hex
+        self._change_log.clear()
+        self._change_log_floor = graph.version
+        return True
+    
+    def _storage_graph_version(self) -> Optional[Any]:
+        """Get the storage backend's graph version, or None if it doesn't track one."""
+        if self.storage and hasattr(self.storage, "get_graph_version"):
+            return self.storage.get_graph_version()
+        return None
+    
+    def _ensure_mutable(self) -> None:
+        """Rebuild the dict-based graph state from a loaded snapshot before an edit."""
+        if not self._frozen:
+            return
+        
+        graph = self._compact
+        topic_ids = graph.topic_ids.tolist()
+        prereq_offsets = graph.prereq_offsets.tolist()
+        prereq_indices = graph.prereq_indices.tolist()
+        thresholds = graph.prereq_thresholds.tolist()
+        
+        for position, topic in enumerate(graph.topics):
+            self._topics[topic.id] = topic
+            prereq_ids = []
+            for edge in range(prereq_offsets[position], prereq_offsets[position + 1]):
+                prereq_id = topic_ids[prereq_indices[edge]]
+                prereq_ids.append(prereq_id)
+                self._dependents.setdefault(prereq_id, []).append(topic.id)
+                if thresholds[edge] == thresholds[edge]:  # skip NaN (no stored threshold)
+                    self._prerequisite_thresholds[(topic.id, prereq_id)] = thresholds[edge]
+            self._prerequisites[topic.id] = prereq_ids
+        
+        self._rebuild_reachability()
+        self._frozen = False
+    
+    def get_topological_order(self) -> List[int]:
+        """
+        Get all topic IDs ordered so prerequisites come before their dependents.
         
-        return False
+        Returns:
+            List of topic IDs
+        """
+        graph = self.compact_graph()
+        return graph.topic_ids[graph.topological_order].tolist()
+    
+    def get_topic_level(self, topic_id: int) -> int:
+        """
+        Get the depth of a topic in the prerequisite graph.
+        
+        Args:
+            topic_id: ID of the topic
+        
+        Returns:
+            0 for topics without prerequisites, else 1 + the deepest prerequisite's level
+        
+        Raises:
+            ValueError: If topic_id doesn't exist
+        """
+        graph = self.compact_graph()
+        return int(graph.levels[self._require_position(graph, topic_id)])
+    
+    def get_descendant_count(self, topic_id: int) -> int:
+        """
+        Get the number of topics that depend on a topic directly or transitively.
+        
+        Args:
+            topic_id: ID of the topic
+        
+        Returns:
+            Number of downstream topics
+        
+        Raises:
+            ValueError: If topic_id doesn't exist
+        """
+        graph = self.compact_graph()
+        return int(graph.descendant_counts[self._require_position(graph, topic_id)])
+    
+    def get_downstream_impact(self, topic_id: int) -> float:
+        """
+        Get the total exam weightage of all topics downstream of a topic.
+        
+        Args:
+            topic_id: ID of the topic
+        
+        Returns:
+            Sum of downstream exam weightage (percentage points)
+        
+        Raises:
+            ValueError: If topic_id doesn't exist
+        """
+        graph = self.compact_graph()
+        return float(graph.downstream_impact[self._require_position(graph, topic_id)])
+    
+    @staticmethod
+    def _require_position(graph: CompactGraph, topic_id: int) -> int:
+        """Get a topic's position in the compact graph, raising ValueError if unknown."""
+        position = graph.position_of(topic_id)
+        if position is None:
+            raise ValueError(f"Topic with ID {topic_id} does not exist")
+        return position
     
     def get_topic_hierarchy(self) -> TopicTree:
         """
         Get the complete topic hierarchy as a tree structure.
         
+        The topic map is a read-only view shared by every caller until the
+        graph changes, so no copy is made per call.
+        
         Returns:
             TopicTree object containing root topics and topic map
         """
-        root_topics = [
-            topic for topic in self._topics.values()
-            if topic.parent_id is None
-        ]
+        graph = self.compact_graph()
         
         return TopicTree(
-            root_topics=root_topics,
-            topic_map=self._topics.copy()
+            root_topics=graph.root_topics(),
+            topic_map=graph.topic_map
         )
     
+    def get_children(self, topic_id: int) -> List[Topic]:
+        """
+        Get the direct children of a topic in the hierarchy.
+        
+        Args:
+            topic_id: ID of the topic
+        
+        Returns:
+            List of child Topic objects
+        
+        Raises:
+            ValueError: If topic_id doesn't exist
+        """
+        graph = self.compact_graph()
+        self._require_position(graph, topic_id)
+        return graph.get_children(topic_id)
+    
+    def is_under(self, topic_id: int, ancestor_id: int) -> bool:
+        """
+        Check whether a topic is in the hierarchy subtree of another topic.
+        
+        A topic counts as being under itself.
+        
+        Args:
+            topic_id: ID of the topic
+            ancestor_id: ID of the candidate ancestor (e.g. a subject or chapter)
+        
+        Returns:
+            True if topic_id is ancestor_id or one of its descendants
+        
+        Raises:
+            ValueError: If either topic doesn't exist
+        """
+        graph = self.compact_graph()
+        self._require_position(graph, topic_id)
+        self._require_position(graph, ancestor_id)
+        return graph.is_under(topic_id, ancestor_id)
+    
+    def get_subtree_totals(self, topic_id: int) -> Dict[str, float]:
+        """
+        Get exam weightage and study time rolled up over a topic's subtree.
+        
+        Args:
+            topic_id: ID of the topic (e.g. a chapter)
+        
+        Returns:
+            Dictionary with topic_count, exam_weightage and estimated_hours,
+            each including the topic itself
+        
+        Raises:
+            ValueError: If topic_id doesn't exist
+        """
+        graph = self.compact_graph()
+        self._require_position(graph, topic_id)
+        return graph.subtree_totals(topic_id)
+    
     def get_prerequisites(self, topic_id: int) -> List[Topic]:
         """
         Get all prerequisite topics for a given topic.
@@ -229,6 +1020,12 @@ class KnowledgeGraphManager:
         Raises:
             ValueError: If topic_id doesn't exist
         """
+        if self._frozen:
+            graph = self._compact
+            if topic_id not in graph:
+                raise ValueError(f"Topic with ID {topic_id} does not exist")
+            return graph.get_prerequisites(topic_id)
+        
         if topic_id not in self._topics:
             raise ValueError(f"Topic with ID {topic_id} does not exist")
         
@@ -248,6 +1045,12 @@ class KnowledgeGraphManager:
         Raises:
             ValueError: If topic_id doesn't exist
         """
+        if self._frozen:
+            graph = self._compact
+            if topic_id not in graph:
+                raise ValueError(f"Topic with ID {topic_id} does not exist")
+            return graph.get_dependents(topic_id)
+        
         if topic_id not in self._topics:
             raise ValueError(f"Topic with ID {topic_id} does not exist")
         
@@ -276,13 +1079,18 @@ class KnowledgeGraphManager:
         Raises:
             ValueError: If topic_id doesn't exist
         """
-        if topic_id not in self._topics:
-            raise ValueError(f"Topic with ID {topic_id} does not exist")
-        
-        prereq_ids = self._prerequisites.get(topic_id, [])
+        graph = self._compact if self._frozen else None
+        if graph is not None:
+            if topic_id not in graph:
+                raise ValueError(f"Topic with ID {topic_id} does not exist")
+            has_prerequisites = len(graph.prerequisite_positions(graph.position_of(topic_id))) > 0
+        else:
+            if topic_id not in self._topics:
+                raise ValueError(f"Topic with ID {topic_id} does not exist")
+            has_prerequisites = bool(self._prerequisites.get(topic_id))
         
         # If no prerequisites, they're automatically met
-        if not prereq_ids:
+        if not has_prerequisites:
             return True
         
         # Get mastery scores
@@ -293,8 +1101,11 @@ class KnowledgeGraphManager:
                 # No storage and no mastery lookup provided
                 return False
         
-        # Check each prerequisite
-        for prereq_id in prereq_ids:
+        # Check each prerequisite against its edge threshold
+        if graph is not None:
+            return graph.prerequisites_met(topic_id, mastery_lookup, threshold)
+        
+        for prereq_id in self._prerequisites[topic_id]:
             mastery = mastery_lookup.get(prereq_id, 0.0)
             prereq_threshold = self._prerequisite_thresholds.get(
                 (topic_id, prereq_id), threshold
@@ -330,18 +1141,60 @@ class KnowledgeGraphManager:
             else:
                 mastery_lookup = {}
         
-        unlockable = []
+        # Not yet mastered (< 60%) and every prerequisite edge met, in one pass over the arrays
+        graph = self.compact_graph()
+        positions = graph.unlockable_positions(graph.mastery_vector(mastery_lookup))
+        return [graph.topics[position] for position in positions]
+    
+    def get_unlockable_topics_batch(
+        self,
+        student_ids: List[int],
+        mastery_lookups: Optional[Dict[int, Dict[int, float]]] = None
+    ) -> Dict[int, List[Topic]]:
+        """
+        Get the unlockable topics of many students in one pass.
+        
+        Builds a students x topics mastery matrix and evaluates every
+        prerequisite edge for all students at once.
         
-        for topic_id, topic in self._topics.items():
-            # Skip if already mastered (>= 60%)
-            if mastery_lookup.get(topic_id, 0.0) >= 60.0:
-                continue
-            
-            # Check if prerequisites are met
-            if self.check_prerequisites_met(student_id, topic_id, mastery_lookup=mastery_lookup):
-                unlockable.append(topic)
+        Args:
+            student_ids: IDs of the students
+            mastery_lookups: Optional dict mapping student_id to a mastery dict;
+                fetched from storage when omitted
+        
+        Returns:
+            Dictionary mapping student_id to unlockable Topic objects
+        """
+        if mastery_lookups is None:
+            mastery_lookups = self._get_students_mastery(student_ids)
         
-        return unlockable
+        graph = self.compact_graph()
+        mastery = graph.mastery_matrix([mastery_lookups.get(student_id, {}) for student_id in student_ids])
+        unlockable = graph.unlockable_matrix(mastery)
+        
+        return {
+            student_id: [graph.topics[position] for position in np.flatnonzero(unlockable[row])]
+            for row, student_id in enumerate(student_ids)
+        }
+    
+    def _get_students_mastery(self, student_ids: List[int]) -> Dict[int, Dict[int, float]]:
+        """
+        Read mastery for many students, in one call if the storage backend supports it.
+        
+        Args:
+            student_ids: IDs of the students
+        
+        Returns:
+            Dictionary mapping student_id to mastery dict
+        """
+        if not self.storage:
+            return {}
+        if hasattr(self.storage, "get_students_mastery"):
+            return self.storage.get_students_mastery(student_ids)
+        return {
+            student_id: self.storage.get_student_mastery(student_id)
+            for student_id in student_ids
+        }
     
     def get_topic(self, topic_id: int) -> Optional[Topic]:
         """
@@ -353,6 +1206,8 @@ class KnowledgeGraphManager:
         Returns:
             Topic object or None if not found
         """
+        if self._frozen:
+            return self._compact.get_topic(topic_id)
         return self._topics.get(topic_id)
     
     def get_all_topics(self) -> List[Topic]:
@@ -362,4 +1217,6 @@ class KnowledgeGraphManager:
         Returns:
             List of all Topic objects
         """
+        if self._frozen:
+            return list(self._compact.topics)
         return list(self._topics.values())
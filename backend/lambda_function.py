@@ -11,6 +11,10 @@ from decimal import Decimal
 import boto3
 from boto3.dynamodb.conditions import Key
 
+from concept_catalog import CATALOG_VERSION_TABLE, get_shared_catalog
+from incremental_ranking import IncrementalRecommendationState, RecommendationStateStore
+from revision_calendar import get_shared_revision_calendars
+
 # Password hashing functions (inline for Lambda)
 def hash_password(password: str) -> str:
     """Hash password using PBKDF2-HMAC-SHA256"""
@@ -64,6 +68,16 @@ mistake_logs_table = dynamodb.Table(MISTAKE_LOGS_TABLE)
 memory_table = dynamodb.Table(MEMORY_TABLE)
 cache_table = dynamodb.Table(AI_CACHE_TABLE)
 usage_table = dynamodb.Table(USAGE_TABLE)
+catalog_version_table = dynamodb.Table(CATALOG_VERSION_TABLE)
+
+# Concept metadata is read from an in-process snapshot, not per-item get_item calls
+concept_catalog = get_shared_catalog(concepts_table, catalog_version_table)
+
+# Warm-container ranking state so progress updates can patch instead of recompute
+recommendation_states = RecommendationStateStore()
+
+# Revision calendars shared with study plan generation in the same process
+revision_calendars = get_shared_revision_calendars()
 
 MISTAKE_CATEGORIES = {
     "conceptual",
@@ -346,39 +360,56 @@ def save_study_plan(user_id, recommendations):
     return today, top_recommendations
 
 
-def generate_recommendations(user_id):
+def get_progress_version(user_id):
+    # None when unreadable, so states built now never take incremental updates
+    try:
+        user = users_table.get_item(
+            Key={"user_id": user_id}, ProjectionExpression="progress_version"
+        ).get("Item", {})
+        return int(user.get("progress_version", 0))
+    except Exception:
+        return None
+
+
+def bump_progress_version(user_id):
+    # Called after every mastery write; returns the new version, or None on failure
+    try:
+        response = users_table.update_item(
+            Key={"user_id": user_id},
+            UpdateExpression="ADD progress_version :one",
+            ConditionExpression="attribute_exists(user_id)",
+            ExpressionAttributeValues={":one": 1},
+            ReturnValues="UPDATED_NEW",
+        )
+        return int(response["Attributes"]["progress_version"])
+    except Exception:
+        return None
+
+
+def build_recommendation_state(user_id):
+    # Read the version first: a write racing with the progress query then
+    # shows up as a version gap on this container's next update
+    progress_version = get_progress_version(user_id)
     progress_items = get_user_progress(user_id)
     mastery_lookup = get_mastery_lookup(progress_items)
+    state = IncrementalRecommendationState(
+        mastery_lookup, concept_catalog.snapshot(), calculate_priority, progress_version
+    )
+    recommendation_states.put(user_id, state)
+    return state
 
-    recommendations = []
-    for concept_id, mastery in mastery_lookup.items():
-        concept_data = concepts_table.get_item(Key={"concept_id": concept_id}).get("Item", {})
-        exam_weight = int(concept_data.get("exam_weight", 5))
-        prerequisites = concept_data.get("prerequisites", [])
-
-        dependency_urgency = 0
-        blocked = False
-        for prereq in prerequisites:
-            prereq_mastery = mastery_lookup.get(prereq, 0)
-            if prereq_mastery < 50:
-                blocked = True
-            if prereq_mastery < 70:
-                dependency_urgency += 70 - prereq_mastery
-
-        if blocked:
-            continue
-
-        score = calculate_priority(mastery, exam_weight, dependency_urgency)
-        recommendations.append(
-            {
-                "concept_id": concept_id,
-                "priority_score": score,
-                "reason": f"Mastery {mastery}, Weight {exam_weight}",
-            }
-        )
 
-    recommendations.sort(key=lambda x: x["priority_score"], reverse=True)
-    return recommendations
+def generate_recommendations(user_id):
+    return build_recommendation_state(user_id).ranked()
+
+
+def refresh_recommendations(user_id, concept_id, new_mastery, previous_mastery, progress_version):
+    state = recommendation_states.get(user_id, concept_catalog.snapshot().version)
+    if state is not None and state.apply_mastery_update(
+        concept_id, new_mastery, previous_mastery, progress_version
+    ):
+        return state.ranked()
+    return generate_recommendations(user_id)
 
 
 def update_mastery(user_id, concept_id, quiz_score):
@@ -409,7 +440,9 @@ def update_mastery(user_id, concept_id, quiz_score):
             "last_updated": datetime.utcnow().strftime("%Y-%m-%d"),
         }
     )
-    return safe_quiz_score
+    progress_version = bump_progress_version(user_id)
+    revision_calendars.record_progress(user_id, concept_id, safe_quiz_score, datetime.utcnow())
+    return safe_quiz_score, previous_mastery, progress_version
 
 
 def classify_mistake(user_id, question, student_answer, correct_answer, subscription_tier="free"):
@@ -509,6 +542,9 @@ def update_progress_after_mistake(
             ":last_updated": datetime.utcnow().strftime("%Y-%m-%d"),
         },
     )
+    revision_calendars.record_progress(
+        user_id, concept_id, float(progress.get("mastery_score", 0)), datetime.utcnow()
+    )
 
 
 def calculate_trend(user_id):
@@ -562,7 +598,7 @@ def fallback_summary(concept_id, notes, mistakes, mastery, weak_prereqs):
 
 
 def generate_ai_summary(user_id, concept_id, notes, mistakes, subscription_tier="free"):
-    concept = concepts_table.get_item(Key={"concept_id": concept_id}).get("Item", {})
+    concept = concept_catalog.get_concept(concept_id)
     mastery_item = progress_table.get_item(
         Key={"user_id": user_id, "concept_id": concept_id}
     ).get("Item", {})
@@ -608,7 +644,7 @@ def generate_ai_summary(user_id, concept_id, notes, mistakes, subscription_tier=
 
 
 def build_ai_context(user_id, concept_id):
-    concept_data = concepts_table.get_item(Key={"concept_id": concept_id}).get("Item", {})
+    concept_data = concept_catalog.get_concept(concept_id)
     topic = concept_data.get("topic", concept_id)
     prerequisites = concept_data.get("prerequisites", [])
     exam_weight = int(concept_data.get("exam_weight", 5))
@@ -835,7 +871,7 @@ def analyze_performance(user_id):
         total_mastery += mastery
         average_confidence += float(item.get("confidence_score", 0))
 
-        concept_data = concepts_table.get_item(Key={"concept_id": item.get("concept_id")}).get("Item", {})
+        concept_data = concept_catalog.get_concept(item.get("concept_id"))
         exam_weight = int(concept_data.get("exam_weight", 5))
 
         if exam_weight >= 8:
@@ -1195,7 +1231,9 @@ def lambda_handler(event, context):
             return json_response(400, {"error": "quiz_score is required"})
 
         try:
-            new_mastery = update_mastery(user_id, concept_id, quiz_score)
+            new_mastery, previous_mastery, progress_version = update_mastery(
+                user_id, concept_id, quiz_score
+            )
         except (TypeError, ValueError):
             return json_response(400, {"error": "quiz_score must be a number"})
 
@@ -1235,7 +1273,9 @@ def lambda_handler(event, context):
                 except Exception:
                     logged_mistake = None
 
-        recommendations = generate_recommendations(user_id)
+        recommendations = refresh_recommendations(
+            user_id, concept_id, new_mastery, previous_mastery, progress_version
+        )
         date, top_recommendations = save_study_plan(user_id, recommendations)
         return json_response(
             200,
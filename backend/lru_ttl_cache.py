@@ -0,0 +1,230 @@
+"""
+Bounded in-process cache with LRU eviction and per-namespace TTLs.
+
+Keys are namespaced by the text before the first colon (for example
+"mastery:<student>:<concept>"), and each namespace can have its own TTL.
+The cache is bounded by entry count and, optionally, by an approximate byte
+budget, so long-running workers cannot grow it without limit.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Containers are walked a few levels deep; this is an approximation meant
+    for budgeting, not an exact accounting.
+
+    Args:
+        value: Value to measure
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key, _depth + 1) + estimate_size(item, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+
+    return size
+
+
+class LRUTTLCache:
+    """
+    Thread-safe LRU cache with namespace-specific expiry and usage counters.
+
+    Attributes:
+        max_entries: Maximum number of entries kept
+        max_bytes: Optional approximate byte budget (None disables it)
+        default_ttl: TTL in seconds for namespaces without an explicit TTL
+        namespace_ttls: Mapping of namespace to TTL in seconds
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: Optional[int] = None,
+        default_ttl: float = 300.0,
+        namespace_ttls: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Optional approximate byte budget
+            default_ttl: TTL in seconds for namespaces without an explicit TTL
+            namespace_ttls: Mapping of namespace to TTL in seconds
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes if max_bytes else None
+        self.default_ttl = default_ttl
+        self.namespace_ttls = dict(namespace_ttls or {})
+
+        # key -> (value, expires_at, size_bytes); ordered from least to most recently used
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._total_bytes = 0
+        self._last_sweep = time.time()
+        self.lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _namespace(key: str) -> str:
+        """Get the namespace of a cache key."""
+        return key.split(":", 1)[0]
+
+    def _ttl_for(self, key: str) -> float:
+        """Get the TTL in seconds that applies to a key."""
+        return self.namespace_ttls.get(self._namespace(key), self.default_ttl)
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and release its byte accounting. Caller holds the lock."""
+        _, _, size = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _sweep_expired(self, now: float) -> None:
+        """
+        Drop all expired entries. Caller holds the lock.
+
+        Namespaces expire at different rates, so LRU order says nothing about
+        expiry; a periodic full sweep keeps dead entries from holding memory.
+        """
+        expired = [key for key, (_, expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        self._last_sweep = now
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value if present and not expired.
+
+        Args:
+            key: Namespaced cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, _ = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value, evicting least recently used entries if over budget.
+
+        Args:
+            key: Namespaced cache key
+            value: Value to cache
+        """
+        now = time.time()
+        size = estimate_size(value) if self.max_bytes else 0
+
+        with self.lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (value, now + self._ttl_for(key), size)
+            self._total_bytes += size
+
+            if now - self._last_sweep >= self._min_ttl():
+                self._sweep_expired(now)
+
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None
+                and self._total_bytes > self.max_bytes
+                and len(self._entries) > 1
+            ):
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _min_ttl(self) -> float:
+        """Get the shortest TTL across namespaces, used as the sweep interval."""
+        return min([self.default_ttl] + list(self.namespace_ttls.values()))
+
+    def delete(self, key: str) -> None:
+        """
+        Remove a key if present.
+
+        Args:
+            key: Namespaced cache key
+        """
+        with self.lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Remove every key starting with a prefix.
+
+        Args:
+            prefix: Key prefix, e.g. "mastery:student-1:"
+
+        Returns:
+            Number of entries removed
+        """
+        with self.lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries. Counters are kept."""
+        with self.lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache usage counters for monitoring.
+
+        Returns:
+            Dictionary with size, hit/miss/eviction counts and hit rate
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "approx_bytes": self._total_bytes if self.max_bytes else None,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -8,7 +8,7 @@ from typing import List, Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Topic:
     """
     Represents a topic in the knowledge graph.
@@ -0,0 +1,285 @@
+"""
+Nightly precomputation of next-day study plans.
+
+Daily plans are expensive enough that the on-demand endpoint is rate limited.
+This job generates the next day's plan for every active student ahead of time
+and stores it under a deterministic plan ID, so study_plan_api can serve the
+morning's requests with a single get_item.
+
+Students are sharded across a process pool. The parent loads the catalog
+snapshot once; workers are forked, so they inherit that read-only snapshot
+instead of each scanning the concepts table, and each worker creates its own
+DynamoDB resource. Plans are written with batch_write_item in chunks of 25,
+retrying unprocessed items with backoff.
+
+Run as a scheduled task from the backend directory (process pools need
+/dev/shm, which Lambda does not provide):
+
+    python nightly_plan_job.py [--date 2026-01-15] [--workers 4]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from itertools import repeat
+from typing import Any, Dict, List, Optional, Tuple
+
+import boto3
+
+from concept_catalog import CATALOG_VERSION_TABLE, CatalogSnapshot, ConceptCatalog
+from decision_engine import DecisionEngine
+from dynamo_scan import scan_all
+from study_plan_generator import StudyPlanGenerator, daily_plan_to_dict, precomputed_plan_id
+
+
+CONCEPTS_TABLE = os.environ.get("CONCEPTS_TABLE", "SyllabusConcepts")
+PROGRESS_TABLE = os.environ.get("PROGRESS_TABLE", "UserConceptProgress")
+STUDENT_PROFILES_TABLE = os.environ.get("STUDENT_PROFILES_TABLE", "StudentProfiles")
+STUDY_PLANS_TABLE = os.environ.get("STUDY_PLANS_TABLE", "StudyPlans")
+
+PLAN_JOB_WORKERS = int(os.environ.get("PLAN_JOB_WORKERS", str(os.cpu_count() or 2)))
+PLAN_JOB_SHARD_SIZE = int(os.environ.get("PLAN_JOB_SHARD_SIZE", "100"))
+
+# DynamoDB accepts at most 25 put requests per batch_write_item call
+BATCH_WRITE_CHUNK = 25
+BATCH_WRITE_MAX_ATTEMPTS = int(os.environ.get("PLAN_JOB_BATCH_WRITE_ATTEMPTS", "8"))
+BATCH_WRITE_BASE_DELAY = 0.05
+
+# Set in the parent before the pool forks; read-only in workers
+_catalog_snapshot: Optional[CatalogSnapshot] = None
+
+# Per-worker state created by _init_worker
+_worker_dynamodb = None
+_worker_generator: Optional[StudyPlanGenerator] = None
+
+
+def log_event(level: str, event_name: str, **context: Any) -> None:
+    """Print a structured JSON log line."""
+    payload = {
+        "ts": datetime.utcnow().isoformat() + "Z",
+        "level": level,
+        "event": event_name,
+        **context,
+    }
+    print(json.dumps(payload, default=str))
+
+
+def build_plan_item(student_id: str, plan_date: datetime, plan_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build a StudyPlans item for a precomputed daily plan.
+
+    Args:
+        student_id: Student identifier
+        plan_date: Day the plan is for
+        plan_data: Plan dictionary (see daily_plan_to_dict)
+
+    Returns:
+        Item in the same shape the API saves, plus plan_date and precomputed
+    """
+    return {
+        "plan_id": precomputed_plan_id(student_id, plan_date),
+        "student_id": student_id,
+        "plan_type": "daily",
+        "plan_data": json.dumps(plan_data),
+        "plan_date": f"{plan_date:%Y-%m-%d}",
+        "created_at": datetime.now().isoformat(),
+        "is_active": True,
+        "precomputed": True,
+    }
+
+
+def batch_write_items(
+    dynamodb,
+    table_name: str,
+    items: List[Dict[str, Any]],
+    max_attempts: int = BATCH_WRITE_MAX_ATTEMPTS
+) -> int:
+    """
+    Put items with batch_write_item, retrying unprocessed items.
+
+    Args:
+        dynamodb: boto3 DynamoDB resource
+        table_name: Table to write to
+        items: Items to put (keys must be unique)
+        max_attempts: Calls per chunk before giving up on what is left
+
+    Returns:
+        Number of items that could not be written. A chunk whose call raises
+        counts only the items it had not written yet; later chunks still run.
+    """
+    unwritten = 0
+    for start in range(0, len(items), BATCH_WRITE_CHUNK):
+        request_items = {
+            table_name: [
+                {"PutRequest": {"Item": item}} for item in items[start:start + BATCH_WRITE_CHUNK]
+            ]
+        }
+        try:
+            for attempt in range(max_attempts):
+                response = dynamodb.batch_write_item(RequestItems=request_items)
+                request_items = response.get("UnprocessedItems") or {}
+                if not request_items:
+                    break
+                if attempt + 1 < max_attempts:
+                    # Unprocessed items mean throttling; back off with jitter
+                    delay = min(2.0, BATCH_WRITE_BASE_DELAY * (2 ** attempt))
+                    time.sleep(delay * random.uniform(0.5, 1.0))
+        except Exception as e:
+            # request_items still holds what this chunk has not written
+            log_event(
+                "ERROR", "plan_batch_write_failed",
+                table=table_name,
+                chunk_start=start,
+                unwritten_keys=[
+                    request["PutRequest"]["Item"].get("plan_id")
+                    for requests in request_items.values() for request in requests
+                ],
+                error=str(e),
+            )
+        unwritten += sum(len(requests) for requests in request_items.values())
+    return unwritten
+
+
+def list_active_students(student_profiles_table) -> List[str]:
+    """
+    List students to plan for.
+
+    Args:
+        student_profiles_table: DynamoDB table for student profiles
+
+    Returns:
+        Student IDs whose profile is not marked inactive, sorted
+    """
+    return sorted({
+        item["user_id"]
+        for item in scan_all(student_profiles_table, total_segments=4)
+        if item.get("user_id") and item.get("is_active", True)
+    })
+
+
+def _init_worker() -> None:
+    """Create the worker's DynamoDB resource and a generator over the inherited catalog."""
+    global _worker_dynamodb, _worker_generator
+    _worker_dynamodb = boto3.resource("dynamodb")
+    concepts_table = _worker_dynamodb.Table(CONCEPTS_TABLE)
+    progress_table = _worker_dynamodb.Table(PROGRESS_TABLE)
+    student_profiles_table = _worker_dynamodb.Table(STUDENT_PROFILES_TABLE)
+
+    decision_engine = DecisionEngine(
+        concepts_table=concepts_table,
+        progress_table=progress_table,
+        student_profiles_table=student_profiles_table,
+        catalog=ConceptCatalog.from_snapshot(_catalog_snapshot, concepts_table)
+    )
+    _worker_generator = StudyPlanGenerator(
+        decision_engine=decision_engine,
+        progress_table=progress_table,
+        student_profiles_table=student_profiles_table
+    )
+
+
+def _plan_shard(student_ids: List[str], plan_date_iso: str) -> Tuple[int, int, int]:
+    """
+    Generate and store plans for one shard of students.
+
+    Args:
+        student_ids: Students in the shard
+        plan_date_iso: Day the plans are for, ISO format
+
+    Returns:
+        Tuple of (plans generated, plans written, students failed)
+    """
+    plan_date = datetime.fromisoformat(plan_date_iso)
+    items = []
+    failed = 0
+    for student_id in student_ids:
+        try:
+            daily_plan = _worker_generator.generate_daily_plan(student_id, plan_date)
+        except Exception as e:
+            log_event(
+                "ERROR", "plan_generation_failed",
+                student_id=student_id,
+                plan_date=plan_date_iso,
+                error=str(e),
+            )
+            failed += 1
+            continue
+        items.append(build_plan_item(student_id, plan_date, daily_plan_to_dict(daily_plan)))
+
+    unwritten = batch_write_items(_worker_dynamodb, STUDY_PLANS_TABLE, items)
+    return len(items), len(items) - unwritten, failed + unwritten
+
+
+def run_nightly_job(
+    plan_date: Optional[datetime] = None,
+    workers: int = PLAN_JOB_WORKERS,
+    shard_size: int = PLAN_JOB_SHARD_SIZE
+) -> Dict[str, Any]:
+    """
+    Precompute daily plans for every active student.
+
+    Args:
+        plan_date: Day to plan for (defaults to tomorrow)
+        workers: Worker processes
+        shard_size: Students per task sent to a worker
+
+    Returns:
+        Summary with student, generated, written and failed counts
+    """
+    global _catalog_snapshot
+    started = time.time()
+    if plan_date is None:
+        plan_date = datetime.combine(date.today() + timedelta(days=1), datetime.min.time())
+
+    dynamodb = boto3.resource("dynamodb")
+    _catalog_snapshot = ConceptCatalog(
+        dynamodb.Table(CONCEPTS_TABLE), dynamodb.Table(CATALOG_VERSION_TABLE)
+    ).snapshot()
+    student_ids = list_active_students(dynamodb.Table(STUDENT_PROFILES_TABLE))
+
+    shard_size = max(1, shard_size)
+    shards = [student_ids[start:start + shard_size] for start in range(0, len(student_ids), shard_size)]
+
+    generated = written = failed = 0
+    if shards:
+        with ProcessPoolExecutor(
+            max_workers=max(1, min(workers, len(shards))),
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_worker
+        ) as executor:
+            for shard_generated, shard_written, shard_failed in executor.map(
+                _plan_shard, shards, repeat(plan_date.isoformat())
+            ):
+                generated += shard_generated
+                written += shard_written
+                failed += shard_failed
+
+    return {
+        "plan_date": f"{plan_date:%Y-%m-%d}",
+        "catalog_version": _catalog_snapshot.version,
+        "students": len(student_ids),
+        "generated": generated,
+        "written": written,
+        "failed": failed,
+        "elapsed_seconds": round(time.time() - started, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute next-day study plans")
+    parser.add_argument("--date", help="day to plan for (YYYY-MM-DD, default tomorrow)")
+    parser.add_argument("--workers", type=int, default=PLAN_JOB_WORKERS, help="worker processes")
+    parser.add_argument("--shard-size", type=int, default=PLAN_JOB_SHARD_SIZE, help="students per task")
+    args = parser.parse_args()
+
+    plan_date = datetime.fromisoformat(args.date) if args.date else None
+    print(json.dumps(run_nightly_job(plan_date, args.workers, args.shard_size)))
+
+
+if __name__ == "__main__":
+    main()
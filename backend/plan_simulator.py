@@ -0,0 +1,249 @@
+"""
+Forward simulation of a multi-day study plan.
+
+Ranking the same mastery snapshot every day recommends the same topics every
+day, because nothing in the ranking models the effect of studying.
+PlanSimulator holds one student's mastery over the whole catalog as a NumPy
+vector and steps through the plan one day at a time: the hours allocated to a
+concept raise its expected mastery, dependents whose prerequisite crosses the
+threshold become eligible, and only the concepts that changed are rescored
+before the next day is ranked.
+"""
+
+import os
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+import numpy as np
+
+from concept_catalog import CatalogSnapshot
+from decision_engine import Recommendation, compute_priority_scores
+
+
+# Prerequisite mastery required before a concept is eligible, as in DecisionEngine
+PREREQUISITE_THRESHOLD = 60.0
+
+# Simulated mastery at which a studied concept is considered done and dropped
+COMPLETION_MASTERY = float(os.environ.get("PLAN_SIMULATOR_COMPLETION_MASTERY", "80"))
+
+# Fraction of the remaining mastery gap closed by studying a concept for its
+# estimated hours; shorter sessions close proportionally less (compounded)
+MASTERY_GAIN_RATE = float(os.environ.get("PLAN_SIMULATOR_GAIN_RATE", "0.5"))
+
+
+class PlanSimulator:
+    """
+    Simulated mastery, eligibility and ranking for one student over many days.
+
+    Before any study is applied, top_n returns the same topics and scores as
+    DecisionEngine.get_top_n_recommendations for the same inputs, except that
+    concepts already at COMPLETION_MASTERY are left out. Concepts the
+    simulation brings to COMPLETION_MASTERY are not recommended again.
+
+    Attributes:
+        catalog: Catalog snapshot the simulation runs over
+        importance_factor: Exam proximity factor for the student
+        available_hours_per_day: Student's daily study hours
+        gain_rate: Fraction of the mastery gap closed per estimated hours studied
+        day: Number of simulated days applied so far
+    """
+
+    def __init__(
+        self,
+        catalog: CatalogSnapshot,
+        mastery_lookup: Mapping[str, float],
+        importance_factor: float = 1.0,
+        available_hours_per_day: float = 4.0,
+        gain_rate: float = MASTERY_GAIN_RATE
+    ):
+        """
+        Build the simulation state with one pass over the catalog.
+
+        Args:
+            catalog: Catalog snapshot with concepts and dependency index
+            mastery_lookup: Dictionary mapping concept ID to mastery score
+            importance_factor: Exam proximity factor (see DecisionEngine)
+            available_hours_per_day: Daily study hours from the profile
+            gain_rate: Fraction of the mastery gap closed per estimated hours studied
+        """
+        self.catalog = catalog
+        self.importance_factor = importance_factor
+        self.available_hours_per_day = available_hours_per_day
+        self.gain_rate = gain_rate
+        self.day = 0
+
+        self.concepts = [concept for concept in catalog.concepts if concept.get("concept_id")]
+        self.concept_ids = [concept["concept_id"] for concept in self.concepts]
+        self._position_of: Dict[str, int] = {}
+        for position, concept_id in enumerate(self.concept_ids):
+            self._position_of.setdefault(concept_id, position)
+
+        self.exam_weightage = np.array(
+            [float(concept.get("exam_weight", 5)) for concept in self.concepts], dtype=np.float64
+        )
+        self.estimated_hours = np.array(
+            [float(concept.get("estimated_hours", 2.0)) for concept in self.concepts], dtype=np.float64
+        )
+        unlock_counts = catalog.dependency_index.direct_counts
+        self.unlocks = np.array(
+            [unlock_counts.get(concept_id, 0) for concept_id in self.concept_ids], dtype=np.float64
+        )
+        self.mastery = np.array(
+            [float(mastery_lookup.get(concept_id, 0.0)) for concept_id in self.concept_ids],
+            dtype=np.float64
+        )
+
+        # Unmet-prerequisite counters; prerequisites outside the catalog can
+        # never be studied here, so they stay unmet or met for the whole plan
+        self.unmet = np.zeros(len(self.concepts), dtype=np.int32)
+        edge_child: List[int] = []
+        edge_parent: List[int] = []
+        for position, concept in enumerate(self.concepts):
+            for prereq_id in concept.get("prerequisites", []):
+                parent = self._position_of.get(prereq_id)
+                if parent is None:
+                    if float(mastery_lookup.get(prereq_id, 0.0)) < PREREQUISITE_THRESHOLD:
+                        self.unmet[position] += 1
+                    continue
+                edge_child.append(position)
+                edge_parent.append(parent)
+                if self.mastery[parent] < PREREQUISITE_THRESHOLD:
+                    self.unmet[position] += 1
+
+        # Dependents of each concept in CSR form, for threshold crossings
+        parents = np.array(edge_parent, dtype=np.int64)
+        order = np.argsort(parents, kind="stable")
+        self._dependent_indices = np.array(edge_child, dtype=np.int64)[order]
+        self._dependent_offsets = np.zeros(len(self.concepts) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(parents, minlength=len(self.concepts)), out=self._dependent_offsets[1:])
+
+        # Concepts that start mastered are done too; left rankable, an allocator
+        # that gives them no time would keep them at the top for the whole plan
+        self.completed = self.mastery >= COMPLETION_MASTERY
+        self.scores = compute_priority_scores(
+            self.exam_weightage, self.estimated_hours, self.mastery, self.unlocks,
+            importance_factor, available_hours_per_day
+        )
+
+    def get_mastery(self, topic_id: str) -> float:
+        """Simulated mastery of a concept (0 if it is not in the catalog)."""
+        position = self._position_of.get(topic_id)
+        return float(self.mastery[position]) if position is not None else 0.0
+
+    def get_exam_weightage(self, topic_id: str) -> float:
+        """Exam weightage of a concept, defaulting to 5 as in DecisionEngine."""
+        position = self._position_of.get(topic_id)
+        return float(self.exam_weightage[position]) if position is not None else 5.0
+
+    def _rankable(self) -> np.ndarray:
+        """Mask of concepts that can be recommended in the current state."""
+        return (self.unmet == 0) & ~self.completed
+
+    def top_n(self, n: int) -> List[Recommendation]:
+        """
+        Rank the current simulated state.
+
+        Args:
+            n: Number of recommendations to return
+
+        Returns:
+            List of Recommendation objects (without explanations) sorted by
+            priority; ties keep catalog order
+        """
+        k = min(n, len(self.concepts))
+        if k <= 0:
+            return []
+
+        rankable = self._rankable()
+        scores = np.where(rankable, self.scores, -np.inf)
+
+        # Only concepts that can survive rounding into the top N need exact ranking
+        kth_score = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth_score - 0.01)
+        return self._ranked(candidates[rankable[candidates]])[:n]
+
+    def recommendations_for(self, topic_ids: Iterable[str]) -> List[Recommendation]:
+        """
+        Rank a fixed set of concepts in the current simulated state.
+
+        Concepts that are not eligible, are completed or score zero are left out.
+
+        Args:
+            topic_ids: Concept identifiers to rank
+
+        Returns:
+            List of Recommendation objects sorted by priority
+        """
+        positions = sorted({
+            self._position_of[topic_id] for topic_id in topic_ids if topic_id in self._position_of
+        })
+        positions = np.array(positions, dtype=np.int64)
+        return self._ranked(positions[self._rankable()[positions]])
+
+    def _ranked(self, positions: np.ndarray) -> List[Recommendation]:
+        """Build recommendations for positions in catalog order, sorted by rounded score."""
+        ranked: List[Tuple[int, float]] = []
+        for position, score in zip(positions.tolist(), self.scores[positions].tolist()):
+            # Python round() keeps parity with the decision engine
+            priority_score = round(score, 2)
+            if priority_score > 0:
+                ranked.append((position, priority_score))
+        ranked.sort(key=lambda x: x[1], reverse=True)
+        return [self._recommendation(position, priority_score) for position, priority_score in ranked]
+
+    def _recommendation(self, position: int, priority_score: float) -> Recommendation:
+        """Build a Recommendation the way DecisionEngine does, without explanation."""
+        concept = self.concepts[position]
+        mastery_score = float(self.mastery[position])
+        improvement_potential = (100 - mastery_score) * 0.1
+        expected_marks_gain = (self.exam_weightage[position] / 100.0) * improvement_potential
+        return Recommendation(
+            topic_id=self.concept_ids[position],
+            topic_name=concept.get("topic", self.concept_ids[position]),
+            priority_score=priority_score,
+            expected_marks_gain=round(float(expected_marks_gain), 2),
+            estimated_study_hours=float(self.estimated_hours[position]),
+            explanation={}
+        )
+
+    def study(self, hours_by_topic: Mapping[str, float]) -> None:
+        """
+        Apply one simulated day of study and advance to the next day.
+
+        Each studied concept closes gain_rate of its remaining mastery gap per
+        estimated hours studied. Dependents of concepts that cross the
+        prerequisite threshold have their unmet counters lowered, and only the
+        studied concepts are rescored.
+
+        Args:
+            hours_by_topic: Dictionary mapping concept ID to hours studied that day
+        """
+        self.day += 1
+        studied = [
+            (self._position_of[topic_id], float(hours))
+            for topic_id, hours in hours_by_topic.items()
+            if topic_id in self._position_of and hours > 0
+        ]
+        if not studied:
+            return
+
+        positions = np.array([position for position, _ in studied], dtype=np.int64)
+        hours = np.array([hours for _, hours in studied], dtype=np.float64)
+
+        old_mastery = self.mastery[positions]
+        retained = (1.0 - self.gain_rate) ** (hours / np.maximum(0.1, self.estimated_hours[positions]))
+        new_mastery = np.minimum(100.0, 100.0 - (100.0 - old_mastery) * retained)
+        self.mastery[positions] = new_mastery
+        self.completed[positions] |= new_mastery >= COMPLETION_MASTERY
+
+        crossed = positions[(old_mastery < PREREQUISITE_THRESHOLD) & (new_mastery >= PREREQUISITE_THRESHOLD)]
+        if len(crossed):
+            dependents = np.concatenate([
+                self._dependent_indices[self._dependent_offsets[position]:self._dependent_offsets[position + 1]]
+                for position in crossed.tolist()
+            ])
+            np.subtract.at(self.unmet, dependents, 1)
+
+        self.scores[positions] = compute_priority_scores(
+            self.exam_weightage[positions], self.estimated_hours[positions], new_mastery,
+            self.unlocks[positions], self.importance_factor, self.available_hours_per_day
+        )
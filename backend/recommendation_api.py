@@ -11,6 +11,7 @@ from typing import Optional
 
 import boto3
 
+from concept_catalog import CATALOG_VERSION_TABLE, get_shared_catalog
 from decision_engine import DecisionEngine, Recommendation
 from explanation_generator import ExplanationGenerator
 
@@ -24,6 +25,7 @@ STUDENT_PROFILES_TABLE = os.environ.get("STUDENT_PROFILES_TABLE", "StudentProfil
 
 concepts_table = dynamodb.Table(CONCEPTS_TABLE)
 progress_table = dynamodb.Table(PROGRESS_TABLE)
+catalog_version_table = dynamodb.Table(CATALOG_VERSION_TABLE)
 
 # Try to get student profiles table if it exists
 try:
@@ -35,7 +37,8 @@ except Exception:
 decision_engine = DecisionEngine(
     concepts_table=concepts_table,
     progress_table=progress_table,
-    student_profiles_table=student_profiles_table
+    student_profiles_table=student_profiles_table,
+    catalog=get_shared_catalog(concepts_table, catalog_version_table)
 )
 explanation_generator = ExplanationGenerator(decision_engine=decision_engine)
 
@@ -89,13 +92,15 @@ def get_next_recommendation(event: dict, context: dict) -> dict:
         return json_response(400, {"error": "student_id is required"})
     
     try:
-        # Get next recommendation
-        recommendation = decision_engine.get_next_recommendation(student_id)
+        # Get next recommendation within the latency budget
+        result = decision_engine.get_top_n_recommendations_within_budget(student_id, n=1)
+        recommendation = result.recommendations[0] if result.recommendations else None
         
         if not recommendation:
             return json_response(200, {
                 "message": "No eligible topics found. Complete prerequisites first.",
-                "recommendation": None
+                "recommendation": None,
+                "partial": result.partial
             })
         
         # Convert recommendation to dict
@@ -108,7 +113,11 @@ def get_next_recommendation(event: dict, context: dict) -> dict:
             "explanation": recommendation.explanation
         }
         
-        return json_response(200, {"recommendation": response_data})
+        return json_response(200, {
+            "recommendation": response_data,
+            "partial": result.partial,
+            "degraded_stages": result.degraded_stages
+        })
     
     except Exception as e:
         return json_response(500, {
@@ -151,13 +160,15 @@ def get_top_recommendations(event: dict, context: dict) -> dict:
         return json_response(400, {"error": "n must be between 1 and 20"})
     
     try:
-        # Get top N recommendations
-        recommendations = decision_engine.get_top_n_recommendations(student_id, n=n)
+        # Get top N recommendations within the latency budget
+        result = decision_engine.get_top_n_recommendations_within_budget(student_id, n=n)
+        recommendations = result.recommendations
         
         if not recommendations:
             return json_response(200, {
                 "message": "No eligible topics found. Complete prerequisites first.",
-                "recommendations": []
+                "recommendations": [],
+                "partial": result.partial
             })
         
         # Convert recommendations to list of dicts
@@ -175,7 +186,9 @@ def get_top_recommendations(event: dict, context: dict) -> dict:
         
         return json_response(200, {
             "count": len(response_data),
-            "recommendations": response_data
+            "recommendations": response_data,
+            "partial": result.partial,
+            "degraded_stages": result.degraded_stages
         })
     
     except Exception as e:
@@ -259,6 +272,26 @@ def get_recommendation_explanation(event: dict, context: dict) -> dict:
         })
 
 
+def get_cache_stats(event: dict, context: dict) -> dict:
+    """
+    GET /api/recommendations/cache-stats
+    
+    Get decision engine cache counters for monitoring.
+    
+    Args:
+        event: API Gateway event
+        context: Lambda context
+        
+    Returns:
+        API Gateway response with cache statistics
+    """
+    method = event.get("requestContext", {}).get("http", {}).get("method", "")
+    if method == "OPTIONS":
+        return json_response(200, {"ok": True})
+    
+    return json_response(200, {"cache": decision_engine.get_cache_stats()})
+
+
 def lambda_handler(event: dict, context: dict) -> dict:
     """
     Main Lambda handler that routes requests to appropriate functions.
@@ -280,5 +313,7 @@ def lambda_handler(event: dict, context: dict) -> dict:
         return get_top_recommendations(event, context)
     elif "/recommendations/explain/" in path:
         return get_recommendation_explanation(event, context)
+    elif path.endswith("/recommendations/cache-stats"):
+        return get_cache_stats(event, context)
     else:
         return json_response(404, {"error": "Endpoint not found"})
@@ -0,0 +1,415 @@
+"""
+Spaced-repetition revision calendar for study plans.
+
+A studied topic is due for revision at fixed day offsets after it was last
+studied. Checking those offsets against the day being planned misses a topic
+for good when its review day is skipped. RevisionCalendar instead keeps one
+heap of (next due date, topic) per student: popping what is due on a date
+returns overdue topics too and reschedules each to its next interval, and a
+whole range of days is built in one pass over the heap.
+
+Plans pop from copies of a student's calendar, so the calendar itself records
+which revisions a daily plan served (mark_served); they are shown again in a
+refreshed plan for the same day and advanced to their next interval after it.
+A calendar rebuilt from study history starts each topic at its latest missed
+interval, unless that was missed more than REVISION_CATCH_UP_DAYS ago or was
+already served.
+"""
+
+import heapq
+import os
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+
+DEFAULT_REVISION_INTERVALS = (1, 3, 7, 14)
+
+# Topics at or above this mastery are considered mastered and not revised
+REVISION_MASTERY_CUTOFF = 80.0
+
+# Days a missed revision is still carried when a calendar is rebuilt; older
+# misses move on to the next interval
+REVISION_CATCH_UP_DAYS = int(os.environ.get("REVISION_CATCH_UP_DAYS", "1"))
+
+
+def _to_day(value: Union[date, datetime, str]) -> int:
+    """Convert a date, datetime or ISO string to a day ordinal."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.toordinal()
+
+
+class RevisionCalendar:
+    """
+    Revision due dates for one student.
+
+    Each topic has at most one live heap entry; recording new progress
+    replaces it and the old entry is skipped when it reaches the top.
+
+    Attributes:
+        intervals: Days after studying at which a topic is due for revision
+        mastery_cutoff: Mastery at or above which a topic is not revised
+    """
+
+    def __init__(
+        self,
+        intervals: Sequence[int] = DEFAULT_REVISION_INTERVALS,
+        mastery_cutoff: float = REVISION_MASTERY_CUTOFF
+    ):
+        """
+        Initialize an empty calendar.
+
+        Args:
+            intervals: Revision offsets in days, ascending
+            mastery_cutoff: Mastery at or above which a topic is not revised
+        """
+        self.intervals = tuple(sorted(intervals))
+        self.mastery_cutoff = mastery_cutoff
+        self.created_at = time.time()
+        self._heap: List[Tuple[int, int, str]] = []
+        # topic_id -> (sequence of its live heap entry, day it was last studied)
+        self._live: Dict[str, Tuple[int, int]] = {}
+        # topic_id -> (day it was last studied, last day a plan served its revision)
+        self._served: Dict[str, Tuple[int, int]] = {}
+        self._sequence = 0
+
+    @classmethod
+    def from_history(
+        cls,
+        studied_topics: Iterable[Mapping[str, Any]],
+        intervals: Sequence[int] = DEFAULT_REVISION_INTERVALS,
+        mastery_cutoff: float = REVISION_MASTERY_CUTOFF,
+        today: Optional[Union[date, datetime, str]] = None,
+        served: Optional[Mapping[str, Tuple[int, int]]] = None,
+        catch_up_days: int = REVISION_CATCH_UP_DAYS
+    ) -> "RevisionCalendar":
+        """
+        Build a calendar from study history.
+
+        Each topic is due at its latest interval on or before today if that
+        is at most catch_up_days old, otherwise at its next interval.
+
+        Args:
+            studied_topics: Dicts with topic_id, last_studied_date and mastery_score
+            intervals: Revision offsets in days, ascending
+            mastery_cutoff: Mastery at or above which a topic is not revised
+            today: Day the calendar is built for (defaults to today)
+            served: Served marks of the calendar being replaced (see served_marks)
+            catch_up_days: Days a missed revision is still carried
+
+        Returns:
+            RevisionCalendar instance
+        """
+        calendar = cls(intervals, mastery_cutoff)
+        today_day = _to_day(today if today is not None else date.today())
+        for topic_info in studied_topics:
+            topic_id = topic_info.get("topic_id")
+            last_studied = topic_info.get("last_studied_date")
+            if not topic_id or not last_studied:
+                continue
+            try:
+                studied_day = _to_day(last_studied)
+                mastery_score = float(topic_info.get("mastery_score", 0))
+            except (ValueError, TypeError, AttributeError):
+                continue
+            calendar._restore(topic_id, studied_day, mastery_score, today_day, catch_up_days)
+
+        # Served marks only apply while the topic has not been studied again
+        for topic_id, mark in (served or {}).items():
+            live = calendar._live.get(topic_id)
+            if live is not None and live[1] == mark[0]:
+                calendar._served[topic_id] = mark
+        return calendar
+
+    def _restore(
+        self,
+        topic_id: str,
+        studied_day: int,
+        mastery_score: float,
+        today_day: int,
+        catch_up_days: int
+    ) -> None:
+        """Schedule a topic from its last study day as seen on today_day."""
+        current = self._live.get(topic_id)
+        if current is not None and current[1] > studied_day:
+            return
+        if mastery_score >= self.mastery_cutoff or not self.intervals:
+            self._live.pop(topic_id, None)
+            return
+
+        missed = [studied_day + interval for interval in self.intervals if studied_day + interval <= today_day]
+        if missed and today_day - missed[-1] <= catch_up_days:
+            self._schedule(topic_id, studied_day, missed[-1])
+            return
+        next_day = self._next_due(studied_day, today_day)
+        if next_day is None:
+            self._live.pop(topic_id, None)
+        else:
+            self._schedule(topic_id, studied_day, next_day)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def copy(self) -> "RevisionCalendar":
+        """Copy the calendar so a plan can pop from it without changing the original."""
+        clone = RevisionCalendar(self.intervals, self.mastery_cutoff)
+        clone.created_at = self.created_at
+        clone._heap = list(self._heap)
+        clone._live = dict(self._live)
+        clone._served = dict(self._served)
+        clone._sequence = self._sequence
+        return clone
+
+    def record_progress(
+        self,
+        topic_id: str,
+        studied_on: Union[date, datetime, str],
+        mastery_score: float
+    ) -> None:
+        """
+        Reschedule a topic after it was studied.
+
+        A mastered topic is removed from the calendar; otherwise its revisions
+        restart from the first interval after studied_on.
+
+        Args:
+            topic_id: Topic identifier
+            studied_on: Date the topic was studied
+            mastery_score: Mastery after studying (0-100)
+        """
+        studied_day = _to_day(studied_on)
+        current = self._live.get(topic_id)
+        if current is not None and current[1] > studied_day:
+            # An older record must not override a newer one
+            return
+
+        self._served.pop(topic_id, None)
+        if float(mastery_score) >= self.mastery_cutoff or not self.intervals:
+            self._live.pop(topic_id, None)
+            return
+        self._schedule(topic_id, studied_day, studied_day + self.intervals[0])
+
+    def mark_served(self, topic_ids: Iterable[str], on: Union[date, datetime, str]) -> None:
+        """
+        Record that a daily plan for a date included these revisions.
+
+        Popping a later date advances them instead of returning them again;
+        popping the same date still returns them.
+
+        Args:
+            topic_ids: Revision topic IDs the plan included
+            on: Date of the plan
+        """
+        day = _to_day(on)
+        for topic_id in topic_ids:
+            live = self._live.get(topic_id)
+            if live is None:
+                continue
+            mark = self._served.get(topic_id)
+            if mark is None or mark[0] != live[1] or mark[1] < day:
+                self._served[topic_id] = (live[1], day)
+
+    def served_marks(self) -> Dict[str, Tuple[int, int]]:
+        """Get the served marks, to carry into a rebuilt calendar (see from_history)."""
+        return dict(self._served)
+
+    def _schedule(self, topic_id: str, studied_day: int, due_day: int) -> None:
+        """Push a topic's next due date, superseding its previous entry."""
+        self._sequence += 1
+        self._live[topic_id] = (self._sequence, studied_day)
+        heapq.heappush(self._heap, (due_day, self._sequence, topic_id))
+
+    def _next_due(self, studied_day: int, after_day: int) -> Optional[int]:
+        """First revision day strictly after after_day, or None if none are left."""
+        for interval in self.intervals:
+            if studied_day + interval > after_day:
+                return studied_day + interval
+        return None
+
+    def pop_due(self, on: Union[date, datetime, str]) -> List[str]:
+        """
+        Pop every topic due on or before a date.
+
+        Overdue topics are returned once and rescheduled to their next
+        interval after the date; topics past their last interval leave the
+        calendar. Revisions served by a plan for an earlier date are advanced
+        without being returned. Dates must be popped in increasing order.
+
+        Args:
+            on: Date being planned
+
+        Returns:
+            Topic IDs due for revision, earliest due first
+        """
+        day = _to_day(on)
+        heap = self._heap
+        due: List[str] = []
+        while heap and heap[0][0] <= day:
+            due_day, sequence, topic_id = heapq.heappop(heap)
+            live = self._live.get(topic_id)
+            if live is None or live[0] != sequence:
+                continue
+
+            mark = self._served.get(topic_id)
+            if mark is not None and mark[0] == live[1] and due_day <= mark[1] < day:
+                # Already in the plan for an earlier day
+                next_day = self._next_due(live[1], mark[1])
+                if next_day is None:
+                    del self._live[topic_id]
+                else:
+                    self._schedule(topic_id, live[1], next_day)
+                continue
+            due.append(topic_id)
+
+            next_day = self._next_due(live[1], day)
+            if next_day is None:
+                del self._live[topic_id]
+            else:
+                self._schedule(topic_id, live[1], next_day)
+        return due
+
+    def pop_range(self, start: Union[date, datetime, str], days: int) -> List[List[str]]:
+        """
+        Pop the revision topics for consecutive days in one pass.
+
+        Args:
+            start: First date of the range
+            days: Number of days
+
+        Returns:
+            One list of topic IDs per day, as pop_due would return for each
+        """
+        first_day = date.fromordinal(_to_day(start))
+        return [self.pop_due(first_day + timedelta(days=offset)) for offset in range(days)]
+
+    def due_dates(self) -> Dict[str, date]:
+        """Get each scheduled topic's next due date."""
+        live_due: Dict[str, date] = {}
+        for due_day, sequence, topic_id in self._heap:
+            live = self._live.get(topic_id)
+            if live is not None and live[0] == sequence:
+                live_due[topic_id] = date.fromordinal(due_day)
+        return live_due
+
+
+class RevisionCalendarStore:
+    """
+    Bounded store of revision calendars keyed by student.
+
+    Calendars expire after a TTL so progress recorded by other processes is
+    picked up by rebuilding from the progress table. An expired calendar is
+    kept until its replacement is stored, so its served marks carry over.
+    """
+
+    def __init__(self, max_students: int = 1000, ttl_seconds: float = 300.0):
+        """
+        Initialize the store.
+
+        Args:
+            max_students: Maximum number of calendars kept (LRU eviction)
+            ttl_seconds: Maximum age of a calendar in seconds
+        """
+        self.max_students = max_students
+        self.ttl_seconds = ttl_seconds
+        self._calendars: "OrderedDict[str, RevisionCalendar]" = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, student_id: str) -> Optional[RevisionCalendar]:
+        """
+        Get a fresh calendar for a student.
+
+        Args:
+            student_id: Student identifier
+
+        Returns:
+            The calendar, or None if missing or expired
+        """
+        with self.lock:
+            calendar = self._calendars.get(student_id)
+            if calendar is None or time.time() - calendar.created_at >= self.ttl_seconds:
+                return None
+            self._calendars.move_to_end(student_id)
+            return calendar
+
+    def served_marks(self, student_id: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Get the served marks of the calendar held for a student, even if expired.
+
+        Args:
+            student_id: Student identifier
+
+        Returns:
+            Served marks to pass to RevisionCalendar.from_history (empty if none)
+        """
+        with self.lock:
+            calendar = self._calendars.get(student_id)
+            return calendar.served_marks() if calendar is not None else {}
+
+    def put(self, student_id: str, calendar: RevisionCalendar) -> None:
+        """
+        Store a calendar, evicting the least recently used one if full.
+
+        Args:
+            student_id: Student identifier
+            calendar: Calendar to store
+        """
+        with self.lock:
+            self._calendars[student_id] = calendar
+            self._calendars.move_to_end(student_id)
+            while len(self._calendars) > self.max_students:
+                self._calendars.popitem(last=False)
+
+    def record_progress(
+        self,
+        student_id: str,
+        topic_id: str,
+        mastery_score: float,
+        studied_on: Optional[Union[date, datetime, str]] = None
+    ) -> None:
+        """
+        Reschedule a topic in the student's calendar after a progress write.
+
+        Only a calendar already held is updated; otherwise the next plan
+        builds one from the progress table, which includes the write.
+
+        Args:
+            student_id: Student identifier
+            topic_id: Topic identifier
+            mastery_score: Mastery after studying (0-100)
+            studied_on: Date the topic was studied (defaults to today)
+        """
+        with self.lock:
+            calendar = self._calendars.get(student_id)
+            if calendar is not None:
+                calendar.record_progress(topic_id, studied_on or date.today(), mastery_score)
+
+    def discard(self, student_id: str) -> None:
+        """Drop a student's calendar."""
+        with self.lock:
+            self._calendars.pop(student_id, None)
+
+
+_shared_calendars: Optional[RevisionCalendarStore] = None
+_shared_calendars_lock = Lock()
+
+
+def get_shared_revision_calendars() -> RevisionCalendarStore:
+    """
+    Get the process-wide revision calendar store.
+
+    Study plan generators and the progress write path share it, so progress
+    written in the same process reschedules revisions immediately.
+
+    Returns:
+        RevisionCalendarStore shared by the process
+    """
+    global _shared_calendars
+    with _shared_calendars_lock:
+        if _shared_calendars is None:
+            _shared_calendars = RevisionCalendarStore()
+        return _shared_calendars
@@ -0,0 +1,127 @@
+"""
+Background builder for the shared knowledge graph snapshot.
+
+Workers map the snapshot at startup (KnowledgeGraphManager.load_snapshot)
+and only accept it when its recorded storage graph version matches the
+backend's, so the file must be produced by exactly one process whose graph
+is current with storage - the knowledge graph service that applies the
+edits. SnapshotBuilder runs in that process: request handlers call
+request() after a change, and a daemon thread rewrites the snapshot once
+the changes settle, keyed to the storage graph version so an unchanged
+graph is not rewritten. The build never runs on the request path.
+
+Enable it with KNOWLEDGE_GRAPH_SNAPSHOT_BUILDER=1 on that one process only;
+other workers just load the snapshot.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Optional
+
+from graph_snapshot import save_snapshot
+from knowledge_graph_manager import KnowledgeGraphManager
+
+
+# Seconds to wait after the last change before rewriting the snapshot
+KNOWLEDGE_GRAPH_SNAPSHOT_DELAY = float(os.environ.get("KNOWLEDGE_GRAPH_SNAPSHOT_DELAY", "5"))
+
+
+def _log_event(level: str, event_name: str, **context: Any) -> None:
+    payload = {
+        "ts": datetime.utcnow().isoformat() + "Z",
+        "level": level,
+        "event": event_name,
+        **context,
+    }
+    print(json.dumps(payload, default=str))
+
+
+class SnapshotBuilder:
+    """
+    Debounced, single-process snapshot writer for a KnowledgeGraphManager.
+
+    Request handlers hold `lock` while they change the graph; the builder
+    takes it only to flush and compact the graph, then writes the file
+    outside it. The snapshot is written to a temporary file and renamed into
+    place, so workers never map a partial file.
+
+    Attributes:
+        manager: Manager whose graph is snapshotted
+        path: Snapshot file path
+        delay: Seconds to wait after the last request() before building
+        built_version: Storage graph version of the last snapshot written
+    """
+
+    def __init__(
+        self,
+        manager: KnowledgeGraphManager,
+        path: str,
+        delay: float = KNOWLEDGE_GRAPH_SNAPSHOT_DELAY
+    ):
+        """
+        Initialize the builder.
+
+        Args:
+            manager: Manager whose graph is snapshotted
+            path: Snapshot file path
+            delay: Seconds to wait after the last change before building
+        """
+        self.manager = manager
+        self.path = path
+        self.delay = delay
+        self.built_version: Optional[Any] = None
+
+        self.lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_lock = threading.Lock()
+
+    def request(self) -> None:
+        """Schedule a rebuild, postponing any rebuild already scheduled."""
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self._run)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run(self) -> None:
+        with self._timer_lock:
+            self._timer = None
+        try:
+            self.build()
+        except Exception as e:
+            _log_event("ERROR", "graph_snapshot_failed", path=self.path, error=str(e))
+
+    def build(self) -> bool:
+        """
+        Write the snapshot if the storage graph version has changed.
+
+        Returns:
+            True if a snapshot was written
+
+        Raises:
+            ValueError: If the storage backend does not report a graph version
+        """
+        with self.lock:
+            self.manager.flush()
+            storage_version = self.manager._storage_graph_version()
+            if storage_version is None:
+                raise ValueError("Storage backend does not report a graph version")
+            if storage_version == self.built_version:
+                return False
+            graph = self.manager.compact_graph()
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            save_snapshot(graph, temp_path, storage_version=storage_version)
+            os.replace(temp_path, self.path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.built_version = storage_version
+        _log_event("INFO", "graph_snapshot_written", path=self.path,
+                   storage_version=storage_version, graph_version=graph.version)
+        return True
@@ -12,13 +12,16 @@ from datetime import datetime
 
 import boto3
 
+from concept_catalog import CATALOG_VERSION_TABLE, get_shared_catalog
 from decision_engine import DecisionEngine
 from study_plan_generator import (
     StudyPlanGenerator,
     DailyPlan,
     WeeklyPlan,
     ExamPlan,
-    TopicAllocation
+    TopicAllocation,
+    daily_plan_to_dict,
+    precomputed_plan_id
 )
 
 
@@ -32,6 +35,7 @@ STUDY_PLANS_TABLE = os.environ.get("STUDY_PLANS_TABLE", "StudyPlans")
 
 concepts_table = dynamodb.Table(CONCEPTS_TABLE)
 progress_table = dynamodb.Table(PROGRESS_TABLE)
+catalog_version_table = dynamodb.Table(CATALOG_VERSION_TABLE)
 
 # Try to get optional tables
 try:
@@ -48,7 +52,8 @@ except Exception:
 decision_engine = DecisionEngine(
     concepts_table=concepts_table,
     progress_table=progress_table,
-    student_profiles_table=student_profiles_table
+    student_profiles_table=student_profiles_table,
+    catalog=get_shared_catalog(concepts_table, catalog_version_table)
 )
 
 study_plan_generator = StudyPlanGenerator(
@@ -81,31 +86,23 @@ def json_response(status_code: int, body: dict) -> dict:
     }
 
 
-def _topic_allocation_to_dict(allocation: TopicAllocation) -> Dict[str, Any]:
-    """Convert TopicAllocation to dictionary."""
-    return {
-        "topic_id": allocation.topic_id,
-        "topic_name": allocation.topic_name,
-        "allocated_hours": allocation.allocated_hours,
-        "priority_score": allocation.priority_score,
-        "goals": allocation.goals
-    }
-
-
-def _daily_plan_to_dict(plan: DailyPlan) -> Dict[str, Any]:
-    """Convert DailyPlan to dictionary."""
-    return {
-        "date": plan.date.isoformat(),
-        "topics": [_topic_allocation_to_dict(t) for t in plan.topics],
-        "total_hours": plan.total_hours,
-        "revision_topics": plan.revision_topics
-    }
-
-
-def _save_plan_to_db(student_id: str, plan_type: str, plan_data: Dict[str, Any]) -> Optional[str]:
+def _save_plan_to_db(
+    student_id: str,
+    plan_type: str,
+    plan_data: Dict[str, Any],
+    plan_date: Optional[datetime] = None
+) -> Optional[str]:
     """
     Save a study plan to the database.
     
+    Args:
+        student_id: Student identifier
+        plan_type: "daily", "weekly" or "exam_countdown"
+        plan_data: Plan dictionary
+        plan_date: Day a daily plan is for. The plan is then stored under the
+            same deterministic ID the nightly job uses, replacing that day's
+            precomputed plan so later requests serve this one
+    
     Returns:
         Plan ID if successful, None otherwise
     """
@@ -113,7 +110,10 @@ def _save_plan_to_db(student_id: str, plan_type: str, plan_data: Dict[str, Any])
         return None
     
     try:
-        plan_id = f"{student_id}_{plan_type}_{datetime.now().isoformat()}"
+        if plan_date is not None:
+            plan_id = precomputed_plan_id(student_id, plan_date)
+        else:
+            plan_id = f"{student_id}_{plan_type}_{datetime.now().isoformat()}"
         
         item = {
             "plan_id": plan_id,
@@ -123,6 +123,8 @@ def _save_plan_to_db(student_id: str, plan_type: str, plan_data: Dict[str, Any])
             "created_at": datetime.now().isoformat(),
             "is_active": True
         }
+        if plan_date is not None:
+            item["plan_date"] = f"{plan_date:%Y-%m-%d}"
         
         study_plans_table.put_item(Item=item)
         return plan_id
@@ -130,15 +132,45 @@ def _save_plan_to_db(student_id: str, plan_type: str, plan_data: Dict[str, Any])
         return None
 
 
+def _get_precomputed_plan(student_id: str, plan_date: datetime) -> Optional[Dict[str, Any]]:
+    """
+    Get the stored daily plan for a day.
+    
+    This is the plan precomputed by nightly_plan_job, or the last plan
+    generated on request for that day, which replaces it.
+    
+    Returns:
+        Stored plan item if one exists and is active, None otherwise
+    """
+    if not study_plans_table:
+        return None
+    
+    try:
+        response = study_plans_table.get_item(
+            Key={"plan_id": precomputed_plan_id(student_id, plan_date)}
+        )
+        item = response.get("Item")
+        if item and item.get("is_active", True):
+            return item
+        return None
+    except Exception:
+        return None
+
+
 def generate_daily_plan(event: dict, context: dict) -> dict:
     """
     POST /api/plans/daily/{student_id}
     
     Generate a daily study plan for a student.
     
+    The stored plan for the same day (precomputed by the nightly job, or
+    generated by an earlier request) is returned without regenerating it,
+    unless "refresh" is set. A generated plan replaces the stored one.
+    
     Request body (optional):
         {
-            "date": "2024-01-15T00:00:00Z"  # Optional, defaults to today
+            "date": "2024-01-15T00:00:00Z",  # Optional, defaults to today
+            "refresh": false                 # Optional, regenerate the stored plan
         }
     
     Args:
@@ -178,15 +210,25 @@ def generate_daily_plan(event: dict, context: dict) -> dict:
     else:
         plan_date = datetime.now()
     
+    # Serve the day's stored plan when there is one
+    if not body.get("refresh"):
+        precomputed = _get_precomputed_plan(student_id, plan_date)
+        if precomputed:
+            return json_response(200, {
+                "plan_id": precomputed.get("plan_id"),
+                "plan": json.loads(precomputed.get("plan_data", "{}")),
+                "precomputed": bool(precomputed.get("precomputed", False))
+            })
+    
     try:
         # Generate daily plan
         daily_plan = study_plan_generator.generate_daily_plan(student_id, plan_date)
         
         # Convert to dict
-        plan_dict = _daily_plan_to_dict(daily_plan)
+        plan_dict = daily_plan_to_dict(daily_plan)
         
         # Save to database
-        plan_id = _save_plan_to_db(student_id, "daily", plan_dict)
+        plan_id = _save_plan_to_db(student_id, "daily", plan_dict, plan_date)
         
         response_data = {
             "plan_id": plan_id,
@@ -258,7 +300,7 @@ def generate_weekly_plan(event: dict, context: dict) -> dict:
         plan_dict = {
             "start_date": weekly_plan.start_date.isoformat(),
             "end_date": weekly_plan.end_date.isoformat(),
-            "daily_plans": [_daily_plan_to_dict(dp) for dp in weekly_plan.daily_plans],
+            "daily_plans": [daily_plan_to_dict(dp) for dp in weekly_plan.daily_plans],
             "total_hours": weekly_plan.total_hours
         }
         
@@ -340,7 +382,7 @@ def generate_exam_plan(event: dict, context: dict) -> dict:
         plan_dict = {
             "exam_date": exam_plan.exam_date.isoformat(),
             "start_date": exam_plan.start_date.isoformat(),
-            "daily_plans": [_daily_plan_to_dict(dp) for dp in exam_plan.daily_plans],
+            "daily_plans": [daily_plan_to_dict(dp) for dp in exam_plan.daily_plans],
             "total_hours": exam_plan.total_hours,
             "high_priority_topics": exam_plan.high_priority_topics
         }
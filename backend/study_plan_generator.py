@@ -6,9 +6,18 @@ based on student performance, available time, and exam proximity.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Dict, Any, Union
+from datetime import date, datetime, timedelta
+from concept_catalog import CatalogSnapshot
 from decision_engine import DecisionEngine, Recommendation
+from plan_simulator import PlanSimulator
+from revision_calendar import RevisionCalendar, RevisionCalendarStore, get_shared_revision_calendars
+from time_allocation import TimeAllocator, get_allocator
+
+
+# Extra ranked candidates first fetched for gain-based allocators, so topics
+# they would give no time can be replaced from further down the ranking
+CANDIDATE_POOL_EXTRA = 20
 
 
 @dataclass
@@ -83,6 +92,137 @@ class ExamPlan:
     high_priority_topics: List[str] = field(default_factory=list)
 
 
+def topic_allocation_to_dict(allocation: TopicAllocation) -> Dict[str, Any]:
+    """Convert TopicAllocation to dictionary."""
+    return {
+        "topic_id": allocation.topic_id,
+        "topic_name": allocation.topic_name,
+        "allocated_hours": allocation.allocated_hours,
+        "priority_score": allocation.priority_score,
+        "goals": allocation.goals
+    }
+
+
+def daily_plan_to_dict(plan: DailyPlan) -> Dict[str, Any]:
+    """Convert DailyPlan to dictionary."""
+    return {
+        "date": plan.date.isoformat(),
+        "topics": [topic_allocation_to_dict(t) for t in plan.topics],
+        "total_hours": plan.total_hours,
+        "revision_topics": plan.revision_topics
+    }
+
+
+def precomputed_plan_id(student_id: str, plan_date: Union[date, datetime]) -> str:
+    """Get the plan ID a student's daily plan for plan_date is stored under (one per day)."""
+    return f"{student_id}_daily_{plan_date:%Y-%m-%d}"
+
+
+class PlanningSession:
+    """
+    Student data shared by every day of a multi-day plan.
+    
+    The profile, revision calendar and recommendations are each loaded at
+    most once, on first use, so a 60-day exam plan costs the same handful of
+    storage reads as a single daily plan. Recommendations are fetched once
+    for the largest N any day asks for; smaller requests reuse the leading
+    entries, which is what a fresh top-N call would return. The session pops
+    revision topics from its own copy of the student's calendar, so plan
+    days must be requested in date order.
+    
+    Attributes:
+        generator: StudyPlanGenerator the session reads through
+        student_id: Student identifier
+    """
+    
+    def __init__(self, generator: "StudyPlanGenerator", student_id: str):
+        """
+        Initialize an empty session; nothing is loaded until first use.
+        
+        Args:
+            generator: StudyPlanGenerator whose tables and engine are used
+            student_id: Student identifier
+        """
+        self.generator = generator
+        self.student_id = student_id
+        self._profile: Optional[Dict[str, Any]] = None
+        self._revision_calendar: Optional[RevisionCalendar] = None
+        self._recommendations: Optional[List[Recommendation]] = None
+        self._recommendations_n = 0
+        self._recommendations_explained = False
+    
+    @property
+    def profile(self) -> Dict[str, Any]:
+        """Student profile, loaded on first access."""
+        if self._profile is None:
+            self._profile = self.generator._get_student_profile(self.student_id)
+        return self._profile
+    
+    @property
+    def available_hours(self) -> float:
+        """Study hours per day from the profile."""
+        return float(self.profile.get("available_hours_per_day", 4.0))
+    
+    @property
+    def revision_calendar(self) -> RevisionCalendar:
+        """The session's copy of the student's revision calendar."""
+        if self._revision_calendar is None:
+            self._revision_calendar = self.generator.get_revision_calendar(self.student_id).copy()
+        return self._revision_calendar
+    
+    def get_recommendations(self, n: int,
+                            include_explanations: bool = False) -> List[Recommendation]:
+        """
+        Get the top N recommendations, computing them only when needed.
+        
+        The catalog and the student's mastery are read by the decision engine
+        in the one call that fills the cache.
+        
+        Args:
+            n: Number of recommendations
+            include_explanations: Whether explanations are required
+        
+        Returns:
+            List of Recommendation objects sorted by priority (descending)
+        """
+        if (
+            self._recommendations is None
+            or n > self._recommendations_n
+            or (include_explanations and not self._recommendations_explained)
+        ):
+            fetch_n = max(n, self._recommendations_n)
+            self._recommendations = self.generator.decision_engine.get_top_n_recommendations(
+                self.student_id, n=fetch_n, include_explanations=include_explanations
+            )
+            self._recommendations_n = fetch_n
+            self._recommendations_explained = include_explanations
+        return self._recommendations[:n]
+    
+    def create_simulator(self) -> PlanSimulator:
+        """
+        Start a forward simulation from the student's current mastery.
+        
+        Returns:
+            PlanSimulator over the engine's catalog (empty if the catalog
+            cannot be loaded, which yields no recommendations)
+        """
+        engine = self.generator.decision_engine
+        try:
+            catalog = engine._get_catalog()
+        except Exception:
+            catalog = CatalogSnapshot.from_items([], "")
+        return PlanSimulator(
+            catalog,
+            engine._get_mastery_snapshot(self.student_id),
+            importance_factor=engine._get_importance_factor(self.student_id),
+            available_hours_per_day=self.available_hours
+        )
+    
+    def get_revision_topics(self, current_date: datetime) -> List[str]:
+        """Topics due for revision on a date, including ones overdue since the last plan day."""
+        return self.revision_calendar.pop_due(current_date)
+
+
 class StudyPlanGenerator:
     """
     Generates personalized study plans based on student performance and constraints.
@@ -92,7 +232,8 @@ class StudyPlanGenerator:
     """
     
     def __init__(self, decision_engine: DecisionEngine, progress_table=None, 
-                 student_profiles_table=None):
+                 student_profiles_table=None, allocator: Optional[TimeAllocator] = None,
+                 revision_calendars: Optional[RevisionCalendarStore] = None):
         """
         Initialize the study plan generator.
         
@@ -100,16 +241,26 @@ class StudyPlanGenerator:
             decision_engine: DecisionEngine instance for recommendations
             progress_table: DynamoDB table for student progress
             student_profiles_table: DynamoDB table for student profiles
+            allocator: Daily time allocation strategy (defaults to the one
+                named by STUDY_PLAN_ALLOCATOR, see time_allocation)
+            revision_calendars: Revision calendar store (defaults to the
+                process-wide one the progress write path updates)
         """
         self.decision_engine = decision_engine
         self.progress_table = progress_table
         self.student_profiles_table = student_profiles_table
+        self.allocator = allocator or get_allocator()
         
         # Spaced repetition intervals (in days)
         self.revision_intervals = [1, 3, 7, 14]
         
         # Revision session duration (minutes)
         self.revision_duration_minutes = 15
+        
+        # Per-student revision due dates, rebuilt from the progress table on expiry
+        self.revision_calendars = (
+            revision_calendars if revision_calendars is not None else get_shared_revision_calendars()
+        )
     
     def _get_student_profile(self, student_id: str) -> Dict[str, Any]:
         """Get student profile data."""
@@ -158,41 +309,91 @@ class StudyPlanGenerator:
         except Exception:
             return []
     
-    def _get_topics_for_revision(self, student_id: str, 
-                                 current_date: datetime) -> List[str]:
+    def get_revision_calendar(self, student_id: str) -> RevisionCalendar:
+        """
+        Get the student's revision calendar, building it from study history if needed.
+        
+        Args:
+            student_id: Student identifier
+        
+        Returns:
+            Shared RevisionCalendar for the student (copy it before popping)
+        """
+        calendar = self.revision_calendars.get(student_id)
+        if calendar is None:
+            calendar = RevisionCalendar.from_history(
+                self._get_previously_studied_topics(student_id),
+                intervals=self.revision_intervals,
+                served=self.revision_calendars.served_marks(student_id)
+            )
+            self.revision_calendars.put(student_id, calendar)
+        return calendar
+    
+    def record_progress(self, student_id: str, topic_id: str, mastery_score: float,
+                        studied_at: Optional[datetime] = None) -> None:
         """
-        Get topics that need revision based on spaced repetition schedule.
+        Reschedule a topic's revisions after the student studied it.
+        
+        Only a calendar already held for the student is updated; otherwise the
+        next plan builds one from the progress table, which includes this write.
         
-        Returns list of topic IDs that should be revised.
+        Args:
+            student_id: Student identifier
+            topic_id: Topic that was studied
+            mastery_score: Mastery after studying (0-100)
+            studied_at: When it was studied (defaults to now)
         """
-        studied_topics = self._get_previously_studied_topics(student_id)
-        revision_topics = []
+        self.revision_calendars.record_progress(
+            student_id, topic_id, mastery_score, studied_at or datetime.now()
+        )
+    
+    def _pick_topics(self, rank: Callable[[int], List[Recommendation]], num_topics: int,
+                     available_hours: float,
+                     reserve_revision: bool = True) -> List[Recommendation]:
+        """
+        Pick the topics to allocate a day's time to.
+        
+        Gain-based allocators give no time to topics without expected marks
+        gain, so those are skipped and further candidates taken until the
+        topics can absorb the day's study hours.
+        
+        Args:
+            rank: Function returning the top N ranked recommendations
+            num_topics: Topics per day
+            available_hours: Total hours available
+            reserve_revision: Whether 20% is reserved for revision
         
-        for topic_info in studied_topics:
-            last_studied_str = topic_info.get("last_studied_date")
-            if not last_studied_str:
-                continue
+        Returns:
+            Recommendations to pass to _allocate_time
+        """
+        if not self.allocator.needs_marks_gain:
+            return rank(num_topics)
+        
+        study_hours = available_hours * 0.8 if reserve_revision else available_hours
+        max_allocation = available_hours * 0.5
+        pool_size = num_topics + CANDIDATE_POOL_EXTRA
+        while True:
+            candidates = rank(pool_size)
+            selected = []
+            capacity = 0.0
+            for rec in candidates:
+                if len(selected) >= num_topics and capacity >= study_hours:
+                    break
+                if rec.expected_marks_gain <= 0:
+                    continue
+                selected.append(rec)
+                capacity += min(rec.estimated_study_hours, max_allocation)
             
-            try:
-                last_studied = datetime.fromisoformat(last_studied_str.replace("Z", "+00:00"))
-                days_since = (current_date - last_studied).days
-                
-                # Check if it matches any revision interval
-                if days_since in self.revision_intervals:
-                    # Prioritize topics with declining mastery
-                    mastery = topic_info.get("mastery_score", 0)
-                    if mastery < 80:  # Only revise if not fully mastered
-                        revision_topics.append(topic_info["topic_id"])
-            except (ValueError, AttributeError):
-                continue
-        
-        return revision_topics
+            enough = len(selected) >= num_topics and capacity >= study_hours
+            if enough or len(candidates) < pool_size:
+                return selected
+            pool_size *= 4
     
-    def _allocate_time_proportionally(self, recommendations: List[Recommendation],
-                                     available_hours: float,
-                                     reserve_revision: bool = True) -> List[TopicAllocation]:
+    def _allocate_time(self, recommendations: List[Recommendation],
+                       available_hours: float,
+                       reserve_revision: bool = True) -> List[TopicAllocation]:
         """
-        Allocate time to topics proportionally based on priority scores.
+        Allocate time to topics with the configured allocator.
         
         Args:
             recommendations: List of recommendations from decision engine
@@ -200,7 +401,7 @@ class StudyPlanGenerator:
             reserve_revision: Whether to reserve 20% for revision
         
         Returns:
-            List of TopicAllocation objects
+            List of TopicAllocation objects for topics given any time
         """
         if not recommendations:
             return []
@@ -208,35 +409,13 @@ class StudyPlanGenerator:
         # Reserve 20% for revision if requested
         study_hours = available_hours * 0.8 if reserve_revision else available_hours
         
-        # Calculate total priority score
-        total_priority = sum(rec.priority_score for rec in recommendations)
-        
-        if total_priority == 0:
-            return []
-        
-        allocations = []
-        
-        # Calculate max allocation per topic (50% of daily time)
+        # No single topic gets > 50% of daily time
         max_allocation = available_hours * 0.5
         
-        for rec in recommendations:
-            # Allocate time proportional to priority score
-            proportion = rec.priority_score / total_priority
-            allocated = study_hours * proportion
-            
-            # Ensure no single topic gets > 50% of daily time
-            # Use floor to ensure we never exceed the limit due to rounding
-            allocated = min(allocated, max_allocation)
-            
-            # Round down to 2 decimal places to ensure constraint adherence
-            # Use a small epsilon to handle floating point precision
-            allocated = round(allocated, 2)
-            
-            # Final check: if rounding caused us to exceed, reduce slightly
-            if allocated > max_allocation:
-                allocated = max_allocation
-            
-            allocation = TopicAllocation(
+        hours = self.allocator.allocate(recommendations, study_hours, max_allocation)
+        
+        return [
+            TopicAllocation(
                 topic_id=rec.topic_id,
                 topic_name=rec.topic_name,
                 allocated_hours=allocated,
@@ -246,39 +425,66 @@ class StudyPlanGenerator:
                     f"Complete in {rec.estimated_study_hours} hours"
                 ]
             )
-            allocations.append(allocation)
+            for rec, allocated in zip(recommendations, hours)
+            if allocated > 0
+        ]
+    
+    def start_session(self, student_id: str) -> PlanningSession:
+        """
+        Start a planning session that shares loaded data across plan days.
         
-        return allocations
+        Args:
+            student_id: Student identifier
+        
+        Returns:
+            PlanningSession for the student
+        """
+        return PlanningSession(self, student_id)
     
-    def generate_daily_plan(self, student_id: str, date: datetime) -> DailyPlan:
+    def generate_daily_plan(self, student_id: str, date: datetime,
+                            session: Optional[PlanningSession] = None) -> DailyPlan:
         """
         Generate a daily study plan for a student.
         
         Args:
             student_id: Student identifier
             date: Date for the plan
+            session: Planning session to reuse (a new one is started if omitted)
         
         Returns:
             DailyPlan object with topic allocations
         """
-        # Get student profile
-        profile = self._get_student_profile(student_id)
-        available_hours = float(profile.get("available_hours_per_day", 4.0))
+        if session is None:
+            session = self.start_session(student_id)
         
-        # Get top recommendations
-        avg_topic_time = 2.0  # Average hours per topic
-        num_topics = max(1, int(available_hours / avg_topic_time))
-        recommendations = self.decision_engine.get_top_n_recommendations(
-            student_id, n=num_topics
+        recommendations = self._pick_topics(
+            session.get_recommendations, self._topics_per_day(session), session.available_hours
         )
+        daily_plan = self._build_daily_plan(date, recommendations, session)
         
-        # Allocate time proportionally
-        allocations = self._allocate_time_proportionally(
+        # Plans for later days move on from the revisions this plan shows
+        self.get_revision_calendar(student_id).mark_served(daily_plan.revision_topics, date)
+        return daily_plan
+    
+    def _topics_per_day(self, session: PlanningSession) -> int:
+        """Number of topics recommended per day from the student's daily hours."""
+        avg_topic_time = 2.0  # Average hours per topic
+        return max(1, int(session.available_hours / avg_topic_time))
+    
+    def _build_daily_plan(self, date: datetime, recommendations: List[Recommendation],
+                          session: PlanningSession,
+                          revision_topics: Optional[List[str]] = None) -> DailyPlan:
+        """Allocate the day's recommendations and add revision time."""
+        available_hours = session.available_hours
+        
+        # Allocate time across the day's topics
+        allocations = self._allocate_time(
             recommendations, available_hours, reserve_revision=True
         )
         
         # Get revision topics
-        revision_topics = self._get_topics_for_revision(student_id, date)
+        if revision_topics is None:
+            revision_topics = session.get_revision_topics(date)
         
         # Calculate total hours
         total_hours = sum(alloc.allocated_hours for alloc in allocations)
@@ -314,11 +520,20 @@ class StudyPlanGenerator:
         """
         daily_plans = []
         total_hours = 0.0
+        session = self.start_session(student_id)
+        recommendations = self._pick_topics(
+            session.get_recommendations, self._topics_per_day(session), session.available_hours
+        )
+        
+        # Revision topics for the whole week in one pass over the calendar
+        weekly_revisions = session.revision_calendar.pop_range(start_date, 7)
         
         # Generate daily plans for 7 days
         for day_offset in range(7):
             current_date = start_date + timedelta(days=day_offset)
-            daily_plan = self.generate_daily_plan(student_id, current_date)
+            daily_plan = self._build_daily_plan(
+                current_date, recommendations, session, weekly_revisions[day_offset]
+            )
             daily_plans.append(daily_plan)
             total_hours += daily_plan.total_hours
         
@@ -336,6 +551,10 @@ class StudyPlanGenerator:
         """
         Generate an exam countdown plan prioritizing high-weightage topics.
         
+        Each day is ranked from a forward simulation in which the topics
+        allocated on earlier days have gained mastery, so the plan moves on
+        to newly unlocked topics instead of repeating the first day.
+        
         Args:
             student_id: Student identifier
             exam_date: Date of the exam
@@ -353,17 +572,21 @@ class StudyPlanGenerator:
             # Exam is today or in the past
             days_until_exam = 1
         
+        # Load the student's data once and simulate every day of the plan from it
+        session = self.start_session(student_id)
+        simulator = session.create_simulator()
+        daily_topics = self._topics_per_day(session)
+        available_hours = session.available_hours
+        
         # Get all recommendations (sorted by priority)
-        all_recommendations = self.decision_engine.get_top_n_recommendations(
-            student_id, n=20
-        )
+        all_recommendations = simulator.top_n(20)
         
         # Identify high-priority topics (top 30% by weightage)
         high_priority_topics = []
         if all_recommendations:
             sorted_by_weightage = sorted(
                 all_recommendations,
-                key=lambda r: r.explanation.get("exam_weightage", 0),
+                key=lambda r: simulator.get_exam_weightage(r.topic_id),
                 reverse=True
             )
             top_count = max(1, len(sorted_by_weightage) // 3)
@@ -381,20 +604,34 @@ class StudyPlanGenerator:
             # As exam approaches, focus more on high-priority topics
             days_remaining = days_until_exam - day_offset
             if days_remaining <= 7:
-                # Last week: focus on high-priority topics
-                priority_recs = [
-                    rec for rec in all_recommendations
-                    if rec.topic_id in high_priority_topics
-                ]
+                # Last week: focus on high-priority topics not yet completed
+                ranked_priority = simulator.recommendations_for(high_priority_topics)
+                priority_recs = self._pick_topics(
+                    lambda n: ranked_priority[:n], len(ranked_priority), available_hours,
+                    reserve_revision=False
+                )
                 if priority_recs:
                     daily_plan = self._generate_focused_daily_plan(
-                        student_id, current_date, priority_recs
+                        student_id, current_date, priority_recs, session
                     )
                 else:
-                    daily_plan = self.generate_daily_plan(student_id, current_date)
+                    daily_plan = self._build_daily_plan(
+                        current_date,
+                        self._pick_topics(simulator.top_n, daily_topics, available_hours),
+                        session
+                    )
             else:
                 # Regular daily plan
-                daily_plan = self.generate_daily_plan(student_id, current_date)
+                daily_plan = self._build_daily_plan(
+                    current_date,
+                    self._pick_topics(simulator.top_n, daily_topics, available_hours),
+                    session
+                )
+            
+            # Project the day's study into the next day's ranking
+            simulator.study({
+                alloc.topic_id: alloc.allocated_hours for alloc in daily_plan.topics
+            })
             
             daily_plans.append(daily_plan)
             total_hours += daily_plan.total_hours
@@ -408,18 +645,20 @@ class StudyPlanGenerator:
         )
     
     def _generate_focused_daily_plan(self, student_id: str, date: datetime,
-                                    priority_recommendations: List[Recommendation]) -> DailyPlan:
+                                    priority_recommendations: List[Recommendation],
+                                    session: Optional[PlanningSession] = None) -> DailyPlan:
         """Generate a daily plan focused on specific high-priority topics."""
-        profile = self._get_student_profile(student_id)
-        available_hours = float(profile.get("available_hours_per_day", 4.0))
+        if session is None:
+            session = self.start_session(student_id)
+        available_hours = session.available_hours
         
         # Allocate time to priority topics
-        allocations = self._allocate_time_proportionally(
+        allocations = self._allocate_time(
             priority_recommendations, available_hours, reserve_revision=False
         )
         
         # Get revision topics
-        revision_topics = self._get_topics_for_revision(student_id, date)
+        revision_topics = session.get_revision_topics(date)
         
         # Calculate total hours
         total_hours = sum(alloc.allocated_hours for alloc in allocations)
@@ -449,7 +688,7 @@ class StudyPlanGenerator:
         # Get current recommendations
         num_topics = max(1, len(original_plan.topics))
         current_recs = self.decision_engine.get_top_n_recommendations(
-            student_id, n=num_topics
+            student_id, n=num_topics, include_explanations=False
         )
         
         # Check if priority scores have changed significantly
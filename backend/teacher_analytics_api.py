@@ -11,6 +11,7 @@ from typing import Optional, Dict, Any
 
 import boto3
 
+from concept_catalog import CATALOG_VERSION_TABLE, get_shared_catalog
 from teacher_analytics_service import (
     TeacherAnalyticsService,
     ClassPerformance,
@@ -31,6 +32,7 @@ USERS_TABLE = os.environ.get("USERS_TABLE", "Users")
 
 concepts_table = dynamodb.Table(CONCEPTS_TABLE)
 progress_table = dynamodb.Table(PROGRESS_TABLE)
+catalog_version_table = dynamodb.Table(CATALOG_VERSION_TABLE)
 
 # Try to get optional tables
 try:
@@ -48,7 +50,8 @@ analytics_service = TeacherAnalyticsService(
     progress_table=progress_table,
     student_profiles_table=student_profiles_table,
     concepts_table=concepts_table,
-    users_table=users_table
+    users_table=users_table,
+    catalog=get_shared_catalog(concepts_table, catalog_version_table)
 )
 
 
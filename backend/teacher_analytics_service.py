@@ -9,6 +9,9 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 
+from concept_catalog import ConceptCatalog, get_shared_catalog
+from dynamo_scan import scan_all
+
 
 @dataclass
 class ClassPerformance:
@@ -114,7 +117,8 @@ class TeacherAnalyticsService:
     """
     
     def __init__(self, progress_table=None, student_profiles_table=None, 
-                 concepts_table=None, users_table=None):
+                 concepts_table=None, users_table=None,
+                 catalog: Optional[ConceptCatalog] = None):
         """
         Initialize the teacher analytics service.
         
@@ -123,11 +127,16 @@ class TeacherAnalyticsService:
             student_profiles_table: DynamoDB table for student profiles
             concepts_table: DynamoDB table for syllabus concepts
             users_table: DynamoDB table for user information
+            catalog: Optional concept catalog (defaults to the process-wide one)
         """
         self.progress_table = progress_table
         self.student_profiles_table = student_profiles_table
         self.concepts_table = concepts_table
         self.users_table = users_table
+        
+        if catalog is None and concepts_table is not None:
+            catalog = get_shared_catalog(concepts_table)
+        self.catalog = catalog
     
     def get_class_performance(self, class_id: str) -> ClassPerformance:
         """
@@ -462,9 +471,8 @@ class TeacherAnalyticsService:
         except Exception:
             # Fallback: scan all profiles and filter
             try:
-                response = self.student_profiles_table.scan()
                 return [
-                    item["user_id"] for item in response.get("Items", [])
+                    item["user_id"] for item in scan_all(self.student_profiles_table)
                     if item.get("class_id") == class_id
                 ]
             except Exception:
@@ -486,32 +494,25 @@ class TeacherAnalyticsService:
     
     def _get_topic_from_concept(self, concept_id: str) -> str:
         """Get topic_id from concept_id."""
-        if not self.concepts_table:
+        if not self.catalog:
             # Fallback: extract topic from concept_id pattern
             # Assuming concept_id format like "topic_id-concept_name"
             return concept_id.split("-")[0] if "-" in concept_id else concept_id
         
         try:
-            response = self.concepts_table.get_item(Key={"concept_id": concept_id})
-            item = response.get("Item", {})
+            item = self.catalog.get_concept(concept_id)
             return item.get("topic_id", concept_id.split("-")[0] if "-" in concept_id else concept_id)
         except Exception:
             return concept_id.split("-")[0] if "-" in concept_id else concept_id
     
     def _get_topic_name(self, topic_id: str) -> str:
         """Get topic name from topic_id."""
-        if not self.concepts_table:
+        if not self.catalog:
             return topic_id
         
         try:
-            # Query concepts by topic_id to get topic name
-            response = self.concepts_table.query(
-                IndexName="TopicIndex",
-                KeyConditionExpression="topic_id = :tid",
-                Limit=1,
-                ExpressionAttributeValues={":tid": topic_id}
-            )
-            items = response.get("Items", [])
+            # Look up concepts by topic_id to get topic name
+            items = self.catalog.snapshot().by_topic.get(topic_id, ())
             if items:
                 return items[0].get("topic_name", topic_id)
             return topic_id
@@ -544,12 +545,11 @@ class TeacherAnalyticsService:
     
     def _get_all_topics_weightages(self) -> Dict[str, float]:
         """Get all topics with their exam weightages."""
-        if not self.concepts_table:
+        if not self.catalog:
             return {}
         
         try:
-            response = self.concepts_table.scan()
-            items = response.get("Items", [])
+            items = self.catalog.snapshot().concepts
             
             # Aggregate weightages by topic
             topic_weightages: Dict[str, float] = {}
@@ -0,0 +1,308 @@
+"""
+Write-behind persistence for the knowledge graph storage backend.
+
+KnowledgeGraphManager persists each topic and prerequisite edge as it is
+created, which makes imports and admin edits wait on one storage round trip
+per row. WriteBehindStorage wraps a backend, buffers those writes (and edge
+deletes), coalesces repeated writes to the same topic or edge, and flushes them in batches when
+enough are pending or enough time has passed. The manager's in-memory graph
+stays authoritative for reads; reads not handled here go to the backend.
+
+Buffered writes are not durable until a flush returns: a crash loses them,
+and on Lambda the timer does not run while the container is frozen between
+invocations. Request handlers should flush before responding (as
+knowledge_graph_api.create_knowledge_graph_handler does), and long-running
+processes flush whatever is left at interpreter exit.
+"""
+
+import atexit
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from models import Topic
+
+
+# Every live buffer, flushed once more at interpreter exit
+_open_buffers: "weakref.WeakSet[WriteBehindStorage]" = weakref.WeakSet()
+
+
+class WriteBehindStorage:
+    """
+    Buffering wrapper around a knowledge graph storage backend.
+
+    Within a flush, topics are written before prerequisite edges, so storage
+    never holds an edge whose topic is missing. A failed flush puts the
+    unwritten rows back in the buffer (newer buffered writes win) and raises.
+
+    Attributes:
+        backend: Wrapped storage backend
+        max_pending: Buffered rows that trigger an immediate flush
+        flush_interval: Seconds after the first buffered write before a
+            background flush (0 disables the timer)
+    """
+
+    def __init__(self, backend, max_pending: int = 500, flush_interval: float = 2.0):
+        """
+        Initialize the wrapper.
+
+        Args:
+            backend: Storage backend with save_topic / save_prerequisite
+                (save_topics / save_prerequisites are used when present, and
+                delete_prerequisite / delete_prerequisites for edge deletes)
+            max_pending: Buffered rows that trigger an immediate flush
+            flush_interval: Seconds before buffered writes are flushed in the background
+        """
+        self.backend = backend
+        self.max_pending = max(1, max_pending)
+        self.flush_interval = flush_interval
+
+        self._topics: "OrderedDict[int, Topic]" = OrderedDict()
+        # A None threshold marks a pending delete of the edge
+        self._prerequisites: "OrderedDict[Tuple[int, int], Optional[float]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_coalesced = 0
+        self.last_error: Optional[Exception] = None
+
+        _open_buffers.add(self)
+
+    def __getattr__(self, name: str) -> Any:
+        # Reads such as get_student_mastery go straight to the backend
+        if name == "backend":
+            raise AttributeError(name)
+        return getattr(self.backend, name)
+
+    def save_topic(self, topic: Topic) -> None:
+        """Buffer a topic write."""
+        self.save_topics([topic])
+
+    def save_prerequisite(self, topic_id: int, prereq_id: int, threshold: float) -> None:
+        """Buffer a prerequisite edge write."""
+        self.save_prerequisites([(topic_id, prereq_id, threshold)])
+
+    def save_topics(self, topics: List[Topic]) -> None:
+        """
+        Buffer topic writes, replacing any pending write of the same topic.
+
+        Args:
+            topics: Topics to persist
+        """
+        with self.lock:
+            for topic in topics:
+                if topic.id in self._topics:
+                    self.rows_coalesced += 1
+                    del self._topics[topic.id]
+                self._topics[topic.id] = topic
+        self._after_write()
+
+    def save_prerequisites(self, rows: List[Tuple[int, int, float]]) -> None:
+        """
+        Buffer prerequisite edge writes, replacing pending writes of the same edge.
+
+        Args:
+            rows: (topic_id, prereq_id, threshold) tuples
+        """
+        with self.lock:
+            for topic_id, prereq_id, threshold in rows:
+                key = (topic_id, prereq_id)
+                if key in self._prerequisites:
+                    self.rows_coalesced += 1
+                    del self._prerequisites[key]
+                self._prerequisites[key] = threshold
+        self._after_write()
+
+    def delete_prerequisite(self, topic_id: int, prereq_id: int) -> None:
+        """Buffer a prerequisite edge delete."""
+        self.delete_prerequisites([(topic_id, prereq_id)])
+
+    def delete_prerequisites(self, edges: List[Tuple[int, int]]) -> None:
+        """
+        Buffer prerequisite edge deletes, replacing pending writes of the same edge.
+
+        Args:
+            edges: (topic_id, prereq_id) tuples
+
+        Raises:
+            NotImplementedError: If the backend cannot delete edges
+        """
+        if not (hasattr(self.backend, "delete_prerequisites") or hasattr(self.backend, "delete_prerequisite")):
+            raise NotImplementedError("Storage backend cannot delete prerequisites")
+        with self.lock:
+            for key in edges:
+                if key in self._prerequisites:
+                    self.rows_coalesced += 1
+                    del self._prerequisites[key]
+                self._prerequisites[key] = None
+        self._after_write()
+
+    def pending_count(self) -> int:
+        """Number of buffered rows not yet written."""
+        with self.lock:
+            return len(self._topics) + len(self._prerequisites)
+
+    def _after_write(self) -> None:
+        """Flush on the size trigger, otherwise make sure the timer is running."""
+        if self.pending_count() >= self.max_pending:
+            self._flush_quietly()
+        else:
+            self._ensure_timer()
+
+    def _ensure_timer(self) -> None:
+        """Start the background flush timer if it is not already running."""
+        if self.flush_interval <= 0:
+            return
+        with self.lock:
+            if self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _timed_flush(self) -> None:
+        """Timer callback."""
+        with self.lock:
+            self._timer = None
+        self._flush_quietly()
+
+    def _flush_quietly(self) -> None:
+        """
+        Flush from a trigger rather than an explicit call.
+
+        The writes are already buffered, so a backend error is not raised to
+        the caller that happened to trip the trigger; it is kept in last_error,
+        the rows stay buffered and the timer retries them. flush() raises.
+        """
+        try:
+            self.flush()
+        except Exception:
+            self._ensure_timer()
+
+    def flush(self) -> int:
+        """
+        Write all buffered rows to the backend.
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            Exception: Whatever the backend raised; unwritten rows stay buffered
+        """
+        with self._flush_lock:
+            with self.lock:
+                topics = list(self._topics.values())
+                prerequisites = [
+                    (topic_id, prereq_id, threshold)
+                    for (topic_id, prereq_id), threshold in self._prerequisites.items()
+                    if threshold is not None
+                ]
+                deletes = [key for key, threshold in self._prerequisites.items() if threshold is None]
+                self._topics.clear()
+                self._prerequisites.clear()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            if not topics and not prerequisites and not deletes:
+                return 0
+
+            written_topics = 0
+            written_deletes = 0
+            written_prerequisites = 0
+            try:
+                # Topics first so no edge is stored before both its ends
+                if hasattr(self.backend, "save_topics"):
+                    self.backend.save_topics(topics)
+                    written_topics = len(topics)
+                else:
+                    for topic in topics:
+                        self.backend.save_topic(topic)
+                        written_topics += 1
+
+                if deletes and hasattr(self.backend, "delete_prerequisites"):
+                    self.backend.delete_prerequisites(deletes)
+                    written_deletes = len(deletes)
+                else:
+                    for topic_id, prereq_id in deletes:
+                        self.backend.delete_prerequisite(topic_id, prereq_id)
+                        written_deletes += 1
+
+                if hasattr(self.backend, "save_prerequisites"):
+                    self.backend.save_prerequisites(prerequisites)
+                    written_prerequisites = len(prerequisites)
+                else:
+                    for topic_id, prereq_id, threshold in prerequisites:
+                        self.backend.save_prerequisite(topic_id, prereq_id, threshold)
+                        written_prerequisites += 1
+            except Exception as exc:
+                self.last_error = exc
+                self._requeue(
+                    topics[written_topics:],
+                    prerequisites[written_prerequisites:],
+                    deletes[written_deletes:]
+                )
+                raise
+
+            written = written_topics + written_deletes + written_prerequisites
+            self.flushes += 1
+            self.rows_written += written
+            self.last_error = None
+            return written
+
+    def _requeue(
+        self,
+        topics: List[Topic],
+        prerequisites: List[Tuple[int, int, float]],
+        deletes: List[Tuple[int, int]]
+    ) -> None:
+        """Put unwritten rows back in front of the buffer, unless newer writes replaced them."""
+        with self.lock:
+            pending_topics = self._topics
+            self._topics = OrderedDict((topic.id, topic) for topic in topics)
+            self._topics.update(pending_topics)
+
+            pending_prerequisites = self._prerequisites
+            self._prerequisites = OrderedDict(
+                ((topic_id, prereq_id), threshold) for topic_id, prereq_id, threshold in prerequisites
+            )
+            self._prerequisites.update((key, None) for key in deletes)
+            self._prerequisites.update(pending_prerequisites)
+
+    def close(self) -> None:
+        """Stop the timer and flush what is left."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get buffering counters for monitoring.
+
+        Returns:
+            Dictionary with pending, written and coalesced row counts
+        """
+        with self.lock:
+            pending = len(self._topics) + len(self._prerequisites)
+        return {
+            "pending": pending,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "rows_coalesced": self.rows_coalesced,
+            "last_error": str(self.last_error) if self.last_error else None,
+        }
+
+
+@atexit.register
+def _flush_open_buffers() -> None:
+    """Flush every live buffer at interpreter exit; failures are dropped with the process."""
+    for buffer in list(_open_buffers):
+        try:
+            buffer.close()
+        except Exception:
+            pass